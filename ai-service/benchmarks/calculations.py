@@ -0,0 +1,34 @@
+"""
+Benchmark the vectorized financial formulas on a million (SIP, rate, tenure) combinations.
+
+    cd ai-service && python -m benchmarks.calculations
+"""
+import time
+
+import numpy as np
+
+from src.services.simulation_engine import SimulationEngine
+
+COMBINATIONS = 1_000_000
+
+
+def main():
+    rng = np.random.default_rng(0)
+    sips = rng.uniform(500, 100_000, COMBINATIONS)
+    rates = rng.uniform(0, 30, COMBINATIONS)
+    tenures = rng.integers(1, 41, COMBINATIONS)
+    targets = rng.uniform(1e4, 1e8, COMBINATIONS)
+    engine = SimulationEngine()
+
+    for name, call in [
+        ("calculate_sip", lambda: engine.calculate_sip(sips, rates, tenures)),
+        ("calculate_goal_timeline", lambda: engine.calculate_goal_timeline(targets, sips, rates)),
+    ]:
+        start = time.perf_counter()
+        call()
+        elapsed = time.perf_counter() - start
+        print(f"{name:<24} {COMBINATIONS:,} combinations in {elapsed * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Measure /health latency while chats are in flight, against the local fake LLM.
+
+    cd ai-service && python -m benchmarks.chat_concurrency
+
+Before the async orchestrator, every chat blocked the event loop for the whole
+LLM call, so /health waited behind all of them.
+"""
+import asyncio
+import os
+import time
+
+import httpx
+
+CHATS = 32
+LATENCY = 0.5
+
+os.environ["LLM_PROVIDER"] = "fake"
+os.environ["FAKE_LLM_LATENCY"] = str(LATENCY)
+os.environ.setdefault("LLM_MAX_CONCURRENCY", "8")
+os.environ.setdefault("LLM_MAX_QUEUE", "16")
+
+from main import app  # noqa: E402  (settings are read at import time)
+
+
+async def run():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        chats = [asyncio.create_task(client.post("/ai/chat", json={"query": "How much should I save?"})) for _ in range(CHATS)]
+        await asyncio.sleep(0.01)
+
+        health_start = time.perf_counter()
+        await client.get("/health")
+        health_ms = (time.perf_counter() - health_start) * 1000
+
+        statuses = [response.status_code for response in await asyncio.gather(*chats)]
+        elapsed = time.perf_counter() - start
+
+    print(f"/health latency with {CHATS} chats in flight: {health_ms:.1f} ms")
+    print(f"chats: {statuses.count(200)} answered, {statuses.count(429)} rejected with 429 in {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
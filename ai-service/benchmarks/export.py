@@ -0,0 +1,66 @@
+"""
+Peak memory and throughput of the export paths at 1M transaction rows.
+
+    cd ai-service && python -m benchmarks.export
+
+Each path runs in a fresh process and consumes a generator of rows, the way
+a DB cursor would feed it. Peak memory is the growth in max RSS over the
+process baseline; the in-memory path has to materialise the rows first.
+"""
+import multiprocessing
+import resource
+import time
+
+from src.services.export_service import ExportService
+
+ROWS = 1_000_000
+CATEGORIES = ["rent", "groceries", "dining", "transport", "shopping", "utilities", "emi", "sip"]
+
+
+def transactions(n: int = ROWS):
+    for i in range(n):
+        yield {
+            "id": i,
+            "date": f"20{18 + i % 8}-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+            "amount": round((i * 7919) % 100_000 / 10, 2),
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "type": "debit" if i % 5 else "credit",
+        }
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024   # Linux reports KiB
+
+
+def run(path: str, results):
+    service = ExportService(max_workers=0)
+    if path != "csv (in-memory)":
+        import pyarrow  # noqa: F401  (import cost is not part of the measurement)
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if path == "csv (in-memory)":
+        size = len(service.export_to_csv(list(transactions())))
+    elif path == "csv (streamed)":
+        size = sum(len(chunk) for chunk in service.iter_csv(transactions()))
+    else:
+        size = sum(len(chunk) for chunk in service.iter_columnar(transactions(), path.split()[0]))
+    results[path] = (time.perf_counter() - start, peak_rss_mb() - baseline, size)
+
+
+def main():
+    manager = multiprocessing.Manager()
+    results = manager.dict()
+    paths = ["csv (in-memory)", "csv (streamed)", "parquet (streamed)", "arrow (streamed)"]
+    for path in paths:
+        process = multiprocessing.get_context("spawn").Process(target=run, args=(path, results))
+        process.start()
+        process.join()
+
+    print(f"{'path':<20} {'rows/s':>10} {'peak MB':>9} {'output MB':>10}")
+    for path in paths:
+        elapsed, peak, size = results[path]
+        print(f"{path:<20} {ROWS / elapsed:>10,.0f} {peak:>9.0f} {size / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
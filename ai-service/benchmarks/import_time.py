@@ -0,0 +1,69 @@
+"""
+Import-time budget for the service entry point.
+
+    cd ai-service && python -m benchmarks.import_time [--budget-ms 1500] [--top 15]
+
+Runs `python -X importtime -c "import main"` in a fresh interpreter, prints
+the slowest modules (self and cumulative time) and exits with status 1 when
+the total is over budget or a heavy dependency that should only load on
+first use (pandas, matplotlib, langchain, ...) was imported at startup.
+The budget can also be set with IMPORT_TIME_BUDGET_MS, e.g. in CI.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+DEFAULT_BUDGET_MS = 1500
+
+# Top-level packages that must stay out of `import main`
+DEFERRED = ("pandas", "matplotlib", "langchain", "langchain_google_genai", "pyarrow", "aiohttp")
+
+
+def measure(module: str = "main"):
+    """Return [(module, self_us, cumulative_us)] in import order."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{result.stderr}")
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings.append((name.rstrip()[1:], int(self_us), int(cumulative_us)))   # Keep the nesting indent
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float,
+                        default=float(os.environ.get("IMPORT_TIME_BUDGET_MS", DEFAULT_BUDGET_MS)))
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--module", default="main")
+    args = parser.parse_args()
+
+    timings = measure(args.module)
+    # Top-level entries (no leading spaces) add up to the whole import
+    total_ms = sum(cumulative for name, _, cumulative in timings if name == name.lstrip()) / 1000
+
+    print(f"{'module':<50} {'self ms':>9} {'cumul ms':>9}")
+    for name, self_us, cumulative_us in sorted(timings, key=lambda t: -t[1])[:args.top]:
+        print(f"{name.strip():<50} {self_us / 1000:>9.1f} {cumulative_us / 1000:>9.1f}")
+    print(f"\ntotal: {total_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+
+    failures = []
+    if total_ms > args.budget_ms:
+        failures.append(f"import took {total_ms:.0f} ms, over the {args.budget_ms:.0f} ms budget")
+    loaded = sorted({name.strip().split(".")[0] for name, _, _ in timings} & set(DEFERRED))
+    if loaded:
+        failures.append(f"imported at startup (should load on first use): {', '.join(loaded)}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Exercise AsyncMCPConnector against a local stub MCP server.
+
+    cd ai-service && python -m benchmarks.mcp_connector
+
+The stub serves /users/{id}/financials with an ETag, a configurable latency,
+and a switch that makes it fail, so the scenarios below check single-flight,
+ETag revalidation, retries and the circuit breaker.
+"""
+import asyncio
+import hashlib
+import json
+import time
+
+from aiohttp import web
+
+from src.services.mcp_connector import AsyncMCPConnector, CircuitBreaker, MCPError
+
+LATENCY = 0.05
+CONCURRENT_CALLERS = 100
+
+
+class StubMCP:
+    def __init__(self):
+        self.requests = 0
+        self.failing = False
+        self.payload = {"bank_accounts": [{"balance": 250000}], "investments": [], "credit_cards": []}
+
+    async def financials(self, request):
+        self.requests += 1
+        await asyncio.sleep(LATENCY)
+        if self.failing:
+            return web.Response(status=503)
+        body = json.dumps(self.payload)
+        etag = '"' + hashlib.sha256(body.encode()).hexdigest()[:16] + '"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(text=body, content_type="application/json", headers={"ETag": etag})
+
+
+async def run():
+    stub = StubMCP()
+    app = web.Application()
+    app.router.add_get("/users/{user_id}/financials", stub.financials)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+
+    connector = AsyncMCPConnector(
+        "test-key", f"http://127.0.0.1:{port}", cache_ttl=0.2,
+        max_retries=2, backoff_base=0.01, circuit_breaker=CircuitBreaker(failure_threshold=3, reset_timeout=0.5),
+    )
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*[connector.fetch_account_balances("u1") for _ in range(CONCURRENT_CALLERS)])
+        print(f"single-flight: {CONCURRENT_CALLERS} concurrent callers → {stub.requests} upstream request "
+              f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        await connector.fetch_user_financial_data("u1")
+        print(f"cache hit: upstream requests still {stub.requests}")
+
+        await asyncio.sleep(0.25)
+        await connector.fetch_user_financial_data("u1")
+        print(f"after TTL: revalidated with If-None-Match → {connector.revalidations} × 304")
+
+        stub.failing = True
+        connector.invalidate("u1")
+        for _ in range(2):
+            try:
+                await connector.fetch_user_financial_data("u1")
+            except MCPError as e:
+                print(f"failing upstream: {e}")
+        print(f"circuit: {connector.breaker.state}, upstream requests {stub.requests}")
+
+        stub.failing = False
+        await asyncio.sleep(0.5)
+        await connector.fetch_user_financial_data("u1")
+        print(f"after reset timeout: circuit {connector.breaker.state}")
+        print(connector.stats())
+    finally:
+        await connector.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,60 @@
+"""
+Reopening a saved portfolio scenario vs. simulating it again, and the store's size bound.
+
+    cd ai-service && python -m benchmarks.scenario_store
+
+1. First run (simulate + save), reopen with the same inputs, and a raw
+   store.get() (header parse + memory map, no result building).
+2. Saving more scenarios than the byte budget holds: the store stays bounded
+   and the most recently opened scenarios survive.
+"""
+import tempfile
+import time
+
+from benchmarks.portfolio_projection import build_input
+from src.services.portfolio_projection import PortfolioProjectionEngine
+from src.services.scenario_store import ScenarioStore
+
+
+def best_ms(fn, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    engine = PortfolioProjectionEngine()
+    projection = build_input().copy(update={"scenario_id": "retirement", "seed": None})
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = ScenarioStore(directory)
+        start = time.perf_counter()
+        scenario, recomputed = engine.project_saved(projection, store)
+        first = (time.perf_counter() - start) * 1000
+        assert recomputed
+        reopen = best_ms(lambda: engine.project_saved(projection, store))
+        raw = best_ms(lambda: store.get(projection.user_id, projection.scenario_id), repeat=100)
+        reopened, recomputed = engine.project_saved(projection, store)
+        assert not recomputed and (reopened.bands == scenario.bands).all()
+
+        print(f"1. {len(scenario.series)} series × {scenario.bands.shape[1]} months, {store.bytes / 1024:.0f} KB on disk")
+        print(f"  simulate + save      {first:>9.1f} ms")
+        print(f"  reopen (same inputs) {reopen:>9.1f} ms   (same seed {scenario.seed}, identical bands)")
+        print(f"  store.get only       {raw:>9.3f} ms")
+
+    with tempfile.TemporaryDirectory() as directory:
+        small = build_input().copy(update={"simulations": 500, "seed": 1})
+        store = ScenarioStore(directory, max_bytes=10 * 200 * 1024)
+        for i in range(50):
+            engine.project_saved(small.copy(update={"scenario_id": f"s{i}"}), store)
+            store.get(small.user_id, "s0")      # Keep one scenario hot
+        survivors = sum(store.get(small.user_id, f"s{i}") is not None for i in range(50))
+        print(f"2. 50 scenarios into a {store.max_bytes / 1024:.0f} KB budget: {store.bytes / 1024:.0f} KB kept, "
+              f"{survivors} scenarios, {store.evictions} evicted, hot scenario kept: {store.get(small.user_id, 's0') is not None}")
+
+
+if __name__ == "__main__":
+    main()
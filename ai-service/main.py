@@ -1,28 +1,188 @@
-from fastapi import FastAPI, HTTPException   # Import FastAPI (framework to build APIs) and HTTPException (to send custom HTTP errors to clients)
-from pydantic import BaseModel               # Import BaseModel from Pydantic (used for defining data validation schemas)
-from typing import Optional                  # Import Optional (to declare fields that may or may not be provided in request schemas)
-from src.services.ai_orchestrator import AIOrchestrator  # Import AIOrchestrator (custom service that handles AI/LLM queries(LANGCHAIN))
+from fastapi import FastAPI, HTTPException, Query, Request   # Import FastAPI (framework to build APIs), HTTPException (to send custom HTTP errors to clients), Query (query parameter validation) and Request (raw, streamed request bodies)
+from fastapi.responses import StreamingResponse   # Import StreamingResponse (sends chunks as they are produced, used for SSE)
+from fastapi.responses import JSONResponse   # Import JSONResponse (readiness answers 503 with a body while warming up)
+from fastapi.responses import Response       # Import Response (plain-text Prometheus metrics)
+from fastapi.concurrency import run_in_threadpool   # Import run_in_threadpool (CPU-bound simulations run off the event loop)
+from pydantic import BaseModel, Field        # Import BaseModel and Field from Pydantic (used for defining data validation schemas)
+import asyncio                               # Import asyncio (warm heavy services in a thread after startup)
+import json                                  # Import json (serialize streamed tokens into SSE data lines)
+import os                                    # Import os (profiler switches read from the environment)
+from typing import Optional, Dict, Literal, List, Any   # Import Optional (to declare fields that may or may not be provided in request schemas), Dict, Literal, List and Any
+from src.services.ai_orchestrator import AIOrchestrator, OrchestratorBusy  # Import AIOrchestrator (custom service that handles AI/LLM queries(LANGCHAIN)) and its overload error
+from src.services.fake_llm import FakeLLM    # Import FakeLLM (local stand-in model with configurable latency)
+from src.services.response_cache import ResponseCache  # Import ResponseCache (reuses answers to repeated questions)
+from src.services.mcp_connector import AsyncMCPConnector  # Import AsyncMCPConnector (pooled, cached MCP client)
+from src.services.context_builder import UserContextBuilder  # Import UserContextBuilder (compact per-user financial context)
+from src.services.export_service import COLUMNAR_FORMATS, ExportService, parse_schema  # Import ExportService (CSV/Parquet/Arrow export and chart rendering) and parse_schema (export column spec)
 from src.services.simulation_engine import SimulationEngine  # Import SimulationEngine (custom service for financial calculations like SIP, Goal)
+from src.services.portfolio_projection import PortfolioProjectionEngine  # Import PortfolioProjectionEngine (correlated multi-asset Monte Carlo)
+from src.services.scenario_store import ScenarioStore, StoredScenario  # Import ScenarioStore (saved scenarios: inputs, seed, float32 bands on disk)
+from src.services.what_if_engine import WhatIfEngine  # Import WhatIfEngine (broadcasted what-if sensitivity grids)
 from src.models.financial_models import SIPInput, GoalInput  # Import Pydantic models (schemas) related to SIP and Goal inputs
-from src.config.settings import Settings     # Import Settings (loads config/env variables like API keys)
+from src.models.simulation_models import PortfolioProjectionInput, SimulationResult  # Import portfolio projection input/output schemas
+from src.models.simulation_models import SavedScenario  # Import saved scenario output schema
+from src.models.simulation_models import WhatIfGridInput, WhatIfGridResult  # Import what-if grid input/output schemas
+from src.utils.charts import shape_chart_data  # Import chart payload helper (LTTB downsampling + columnar formats)
+from src.config.settings import get_settings  # Import get_settings (loads config/env variables like API keys, on first use)
+from src.utils.lazy import Lazy              # Import Lazy (builds heavy services on first use)
+from src.utils.metrics import CONTENT_TYPE, MetricsMiddleware, SlowRequestProfiler, collect, registry  # Import metrics (GET /metrics, per-route latency, slow-request profiler, scrape-time collectors)
+from prometheus_client import generate_latest   # Import generate_latest (renders the registry in the Prometheus text format)
 
 # Create the FastAPI application instance
 app = FastAPI(title="FinSage AI Service", version="1.0.0")  # "title" and "version" are metadata for documentation (Swagger UI)
 
-# Load configuration (like API keys) from settings
-settings = Settings()
+# ------------------------------------------------------------
+# Services
+# ------------------------------------------------------------
+# Heavy services (LLM client, MCP session, export workers) are built on first use, so the
+# process answers /health within its import time; a background warm-up builds them right
+# after startup and /ready reports when that is done. The NumPy engines are cheap → eager.
 
-# Initialize AI orchestrator with API key (used to connect to external AI model, e.g., Gemini/LLM)()
-ai_orchestrator = AIOrchestrator(api_key=settings.gemini_api_key)
+def build_mcp_connector():
+    settings = get_settings()
+    return AsyncMCPConnector(settings.mcp_api_key, settings.mcp_base_url)
+
+def build_context_builder():
+    # Turns each user's MCP financials into a short prompt summary
+    settings = get_settings()
+    return UserContextBuilder(
+        connector=mcp_connector.get(),
+        token_budget=settings.context_token_budget,
+        max_users=settings.context_cache_max_users,
+        ttl_seconds=settings.context_cache_ttl_seconds,
+    )
+
+def build_ai_orchestrator():
+    # Initialize AI orchestrator with API key (used to connect to external AI model, e.g., Gemini/LLM)
+    # - LLM_PROVIDER=fake swaps Gemini for a local fake model (load tests without network or quota)
+    # - LLM_MAX_CONCURRENCY / LLM_MAX_QUEUE bound how many chats run and wait at once
+    settings = get_settings()
+    return AIOrchestrator(
+        api_key=settings.gemini_api_key,
+        llm=FakeLLM(latency=settings.fake_llm_latency) if settings.llm_provider == "fake" else None,
+        max_concurrency=settings.llm_max_concurrency,
+        max_queue=settings.llm_max_queue,
+        cache=ResponseCache(
+            max_entries=settings.response_cache_max_entries,
+            ttl_seconds=settings.response_cache_ttl_seconds,
+            similarity_threshold=settings.response_cache_similarity,
+        ) if settings.response_cache_enabled else None,
+        context_builder=context_builder.get(),
+    )
+
+mcp_connector = Lazy(build_mcp_connector)
+context_builder = Lazy(build_context_builder)
+ai_orchestrator = Lazy(build_ai_orchestrator)
+
+# Initialize export service (charts render in worker processes, started on first use)
+export_service = Lazy(ExportService)
 
 # Initialize simulation engine (used for financial simulations)
 simulation_engine = SimulationEngine()
 
+# Initialize portfolio projection engine (used for multi-asset portfolio projections)
+portfolio_engine = PortfolioProjectionEngine()
+
+# Saved scenarios live on local disk (directory and size budget come from Settings → built on first use)
+def build_scenario_store():
+    settings = get_settings()
+    return ScenarioStore(settings.scenario_store_dir, max_bytes=settings.scenario_store_max_bytes)
+
+scenario_store = Lazy(build_scenario_store)
+
+# Initialize what-if engine (keeps each user's last grid for incremental slider updates)
+what_if_engine = WhatIfEngine()
+
+# ------------------------------------------------------------
+# Metrics
+# ------------------------------------------------------------
+# Per-route latency and in-flight requests. The slow-request profiler is configured from the
+# environment directly (PROFILE_SLOW_REQUESTS_MS), so adding middleware never loads Settings at import.
+profile_slow_requests_ms = os.environ.get("PROFILE_SLOW_REQUESTS_MS")
+app.add_middleware(
+    MetricsMiddleware,
+    profiler=SlowRequestProfiler(
+        threshold=float(profile_slow_requests_ms) / 1000,
+        directory=os.environ.get("PROFILE_DIR", "/tmp/finsage-profiles"),
+        interval=float(os.environ.get("PROFILE_INTERVAL_MS", "5")) / 1000,
+    ) if profile_slow_requests_ms else None,
+)
+
+def collect_when_ready(service: Lazy, read):
+    # Services not built yet report nothing (instead of being built by a scrape)
+    return lambda: read(service.get()) if service.ready else {}
+
+collect("llm_slots", "LLM calls running / waiting for a slot", collect_when_ready(
+    ai_orchestrator, lambda orchestrator: {(state,): count for state, count in orchestrator.stats().items() if state in ("active", "waiting")}), labels=("state",))
+collect("response_cache_hit_ratio", "LLM response cache hits (exact + similar) / lookups", collect_when_ready(
+    ai_orchestrator, lambda orchestrator: {(): orchestrator.cache.stats()["hit_rate"]} if orchestrator.cache else {}))
+collect("response_cache_lookups_total", "LLM response cache lookups by outcome", collect_when_ready(
+    ai_orchestrator, lambda orchestrator: {
+        ("hit",): orchestrator.cache.hits, ("similar_hit",): orchestrator.cache.semantic_hits, ("miss",): orchestrator.cache.misses,
+    } if orchestrator.cache else {}), labels=("outcome",), kind="counter")
+collect("mcp_requests_total", "MCP data requests by how they were served", collect_when_ready(
+    mcp_connector, lambda connector: {
+        ("cache",): connector.cache_hits, ("coalesced",): connector.coalesced, ("upstream",): connector.upstream_calls,
+    }), labels=("source",), kind="counter")
+collect("mcp_circuit_open", "1 while the MCP circuit breaker rejects calls", collect_when_ready(
+    mcp_connector, lambda connector: {(): int(connector.breaker.state == "open")}))
+collect("chart_cache_hit_ratio", "Rendered charts served from cache / requests", collect_when_ready(
+    export_service, lambda service: {(): service.chart_cache.hits / max(1, service.chart_cache.hits + service.chart_cache.misses)}))
+collect("scenario_store_bytes", "Disk used by saved scenarios", collect_when_ready(
+    scenario_store, lambda store: {(): store.bytes}))
+collect("scenario_store_lookups_total", "Saved scenario lookups by outcome (stale → inputs or engine changed)", collect_when_ready(
+    scenario_store, lambda store: {("hit",): store.hits - store.stale, ("stale",): store.stale, ("miss",): store.misses}),
+    labels=("outcome",), kind="counter")
+collect("what_if_cache_bytes", "Memory held by users' last what-if grids", lambda: {(): what_if_engine.cached_bytes})
+collect("chart_cache_bytes", "Memory held by cached chart images", collect_when_ready(
+    export_service, lambda service: {(): service.chart_cache.bytes}))
+
+# Services /ready waits for
+READINESS = {"ai_orchestrator": ai_orchestrator, "export_service": export_service}
+
+# Build heavy services in a worker thread once the server is up (imports included)
+@app.on_event("startup")
+async def warm_up():
+    async def build_all():
+        for service in READINESS.values():
+            try:
+                await asyncio.to_thread(service.get)
+            except Exception:
+                pass   # Error is kept on the Lazy and reported by /ready; requests retry construction
+    asyncio.create_task(build_all())
+
+# Close pooled MCP connections and export workers on shutdown (only if they were ever built)
+@app.on_event("shutdown")
+async def close_connections():
+    if mcp_connector.ready:
+        await mcp_connector.get().close()
+    if export_service.ready:
+        export_service.get().close()
+
 # Define input schema for chat requests
 class ChatRequest(BaseModel):   # Inherits from BaseModel → validates incoming JSON
     query: str                  # User's question/query (required string)
     user_id: Optional[str] = None   # Optional user_id to track which user asked
 
+# Define input schema for chart exports
+class ChartRequest(BaseModel):
+    data: List[Dict[str, Any]]      # Rows to plot, e.g. [{"month": 1, "value": 1000}, ...]
+    x_key: str                      # Key for x-axis values
+    y_key: str                      # Key for y-axis values
+    title: str = ""                 # Chart title
+    format: Literal["png", "svg", "spec"] = "png"   # png → data URI, svg → markup, spec → JSON for the frontend to draw
+    width: float = Field(10, gt=0, le=40)    # Inches (40 in → 4000 px at CHART_DPI)
+    height: float = Field(6, gt=0, le=40)    # Inches
+
+# Streaming response whose content reads the request body as it goes
+class BodyStreamingResponse(StreamingResponse):
+    # StreamingResponse normally listens on `receive` for a disconnect while streaming; that would
+    # race the content for the request body. Here reading the body reports the disconnect instead.
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
 # Define response schema for chat
 class ChatResponse(BaseModel):  # Inherits from BaseModel → ensures response follows structure
     response: str               # AI’s response as a string
@@ -32,18 +192,120 @@ class ChatResponse(BaseModel):  # Inherits from BaseModel → ensures response f
 async def health_check():       # Async function (non-blocking)
     return {"status": "healthy"}  # Returns JSON response confirming service is healthy
 
+# Prometheus scrape endpoint
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE)
+
+# Readiness endpoint (liveness stays /health → a warming pod is alive but shouldn't get traffic yet)
+@app.get("/ready")              # GET endpoint at /ready → 200 once heavy services are built, 503 before
+async def readiness_check():
+    services = {
+        name: "ready" if service.ready else ("failed" if service.error else "starting")
+        for name, service in READINESS.items()
+    }
+    errors = {name: service.error for name, service in READINESS.items() if service.error}
+    ready = all(state == "ready" for state in services.values())
+    body = {"status": "ready" if ready else "not_ready", "services": services}
+    if errors:
+        body["errors"] = errors
+    return JSONResponse(body, status_code=200 if ready else 503)
+
 # AI Chat endpoint
 @app.post("/ai/chat", response_model=ChatResponse)   # POST endpoint at /ai/chat, response validated against ChatResponse schema
 async def chat(request: ChatRequest):   # Accepts request body validated as ChatRequest
     try:
-        # Pass user query to AI orchestrator (LLM) and get response
-        response = ai_orchestrator.process_query(request.query, request.user_id)
+        # Pass user query to AI orchestrator (LLM) and await the response without blocking other requests
+        response = await ai_orchestrator.get().aprocess_query(request.query, request.user_id)
         # Return structured response following ChatResponse schema
         return ChatResponse(response=response)
+    except OrchestratorBusy as e:
+        # Too many chats running and queued → HTTP 429 so clients back off and retry
+        raise HTTPException(status_code=429, detail=f"AI service busy: {str(e)}", headers={"Retry-After": "1"})
     except Exception as e:
         # If AI processing fails, raise HTTP 500 error with detail
         raise HTTPException(status_code=500, detail=f"AI processing error: {str(e)}")
 
+# AI Chat streaming endpoint (Server-Sent Events)
+@app.post("/ai/chat/stream")   # POST endpoint at /ai/chat/stream → "token" events as the LLM produces them, then "done"
+async def chat_stream(request: ChatRequest):   # Accepts request body validated as ChatRequest
+    stats = ai_orchestrator.get().stats()
+    if stats["active"] >= stats["max_concurrency"] and stats["waiting"] >= stats["max_queue"]:
+        # Reject before the stream starts so the client gets a real 429 status instead of an error event
+        raise HTTPException(status_code=429, detail="AI service busy", headers={"Retry-After": "1"})
+
+    async def events():
+        try:
+            async for token in ai_orchestrator.get().astream_query(request.query, request.user_id):
+                yield f"event: token\ndata: {json.dumps({'token': token})}\n\n"
+            yield "event: done\ndata: {}\n\n"
+        except Exception as e:
+            # Headers are already sent → report failures (including late OrchestratorBusy) as an SSE event
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+# Chat cache statistics endpoint
+@app.get("/ai/chat/cache/stats")   # GET endpoint at /ai/chat/cache/stats → hit rate, evictions, invalidations
+async def chat_cache_stats():
+    if ai_orchestrator.get().cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **ai_orchestrator.get().cache.stats()}
+
+# Chat cache invalidation endpoint (call when a user's financial data changes)
+@app.post("/ai/chat/cache/invalidate/{user_id}")   # POST endpoint at /ai/chat/cache/invalidate/{user_id}
+async def invalidate_chat_cache(user_id: str):
+    removed = ai_orchestrator.get().cache.invalidate_user(user_id) if ai_orchestrator.get().cache is not None else 0
+    return {"user_id": user_id, "invalidated": removed}
+
+# Transaction ingestion endpoint (keeps the chat context summary current without refetching MCP)
+@app.post("/ai/context/{user_id}/transactions")   # POST endpoint at /ai/context/{user_id}/transactions
+async def add_transactions(user_id: str, transactions: List[Dict[str, Any]]):   # Body: list of {date, amount, category, type}
+    # Fold new transactions into the user's running spend totals; users not loaded yet pick them up on first fetch
+    updated = context_builder.get().add_transactions(user_id, transactions)
+    # Answers cached for the old context can't be hit again → free them now rather than at their TTL
+    if ai_orchestrator.ready and ai_orchestrator.get().cache is not None:
+        ai_orchestrator.get().cache.invalidate_user(user_id)
+    return {"user_id": user_id, "updated": updated}
+
+# Data export endpoint (request body read and response written as they stream → constant memory per request)
+@app.post("/ai/export/data")   # POST endpoint at /ai/export/data?format=csv|parquet|arrow
+async def export_data(
+    request: Request,   # Body: JSON array of row objects, or one object per line (application/x-ndjson)
+    format: Literal["csv", "parquet", "arrow"] = "csv",
+    schema: Optional[str] = Query(None, description='Columns in order, with Arrow types for columnar formats: "date:date32,amount:float64"'),
+):
+    chunks = export_service.get().aiter_export(request.stream(), format, parse_schema(schema) if schema else None)
+    try:
+        first = await chunks.__anext__()   # Fails here (→ 400) if the schema or the leading rows are invalid
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if format == "csv":
+        media_type, filename = "text/csv", "financial_data.csv"
+    else:
+        media_type, extension = COLUMNAR_FORMATS[format]
+        filename = f"financial_data.{extension}"
+
+    async def content():
+        yield first
+        async for chunk in chunks:
+            yield chunk
+    return BodyStreamingResponse(content(), media_type=media_type,
+                                 headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+# Chart export endpoint
+@app.post("/ai/export/chart")   # POST endpoint at /ai/export/chart
+async def export_chart(request: ChartRequest):   # Accepts ChartRequest schema as request body
+    try:
+        chart = await export_service.get().agenerate_chart(
+            request.data, request.x_key, request.y_key, request.title,
+            image_format=request.format, size=(request.width, request.height)
+        )
+        return {"format": request.format, "chart": chart}
+    except Exception as e:
+        # Missing keys or bad data → HTTP 400 (bad request)
+        raise HTTPException(status_code=400, detail=str(e))
+
 # SIP Simulation endpoint
 @app.post("/ai/simulate/sip")   # POST endpoint at /ai/simulate/sip
 async def simulate_sip(sip_input: SIPInput):  # Accepts SIPInput schema as request body
@@ -69,10 +331,107 @@ async def simulate_goal(goal_input: GoalInput):  # Accepts GoalInput schema as r
         result = simulation_engine.calculate_goal_timeline(
             target_amount=goal_input.target_amount,
             monthly_investment=goal_input.monthly_investment,
-            annual_rate=goal_input.annual_rate
+            annual_rate=goal_input.annual_rate,
+            compounding_frequency=goal_input.compounding_frequency or 12   # Optional in GoalInput → default to monthly
         )
         # Return result as JSON
         return {"months_needed": result}
     except Exception as e:
         # If calculation fails, raise HTTP 400 (bad request) with detail
         raise HTTPException(status_code=400, detail=f"Goal calculation error: {str(e)}")
+
+# Portfolio Projection endpoint
+@app.post("/ai/simulate/portfolio", response_model=Dict[str, SimulationResult])   # POST endpoint at /ai/simulate/portfolio
+async def simulate_portfolio(
+    projection: PortfolioProjectionInput,   # Accepts PortfolioProjectionInput schema as request body
+    chart_points: Optional[int] = Query(None, ge=3, description="Downsample chart_data to this many points (LTTB)"),
+    chart_format: Literal["rows", "columnar", "columnar_f32"] = Query("rows", description="Chart payload format"),
+):
+    try:
+        # The projection takes up to seconds of CPU → worker thread, so the event loop keeps serving other requests
+        return await run_in_threadpool(portfolio_projection, projection, chart_points, chart_format)
+    except ValueError as e:
+        # Missing rates or an invalid correlation matrix → HTTP 400 (bad request)
+        raise HTTPException(status_code=400, detail=f"Portfolio projection error: {str(e)}")
+
+def portfolio_projection(projection: PortfolioProjectionInput, chart_points: Optional[int], chart_format: str) -> Dict[str, SimulationResult]:
+    if projection.scenario_id:
+        # Saved scenario → stored numbers unless the inputs or the engine changed
+        scenario, _ = portfolio_engine.project_saved(projection, scenario_store.get())
+        results = scenario_results(scenario)
+    else:
+        # Simulate all asset classes together → one result per asset plus "total", with p10/p50/p90 bands
+        results = portfolio_engine.project(projection)
+    return shape_results(results, chart_points, chart_format)
+
+def scenario_results(scenario: StoredScenario) -> Dict[str, SimulationResult]:
+    # Per-series results straight from the memory-mapped float32 bands
+    return portfolio_engine.results(scenario.scenario_id, scenario.series, scenario.bands)
+
+def shape_results(results: Dict[str, SimulationResult], chart_points: Optional[int], chart_format: str) -> Dict[str, SimulationResult]:
+    if chart_points is None and chart_format == "rows":
+        return results                  # Default: full monthly rows, unchanged shape
+    # Opt-in: keep the visual shape of the bands with fewer points and/or a compact columnar payload
+    return {
+        name: result.model_copy(update=shape_chart_data(result.chart_data, chart_points, chart_format))
+        for name, result in results.items()
+    }
+
+def saved_scenario(scenario: StoredScenario, recomputed: bool, chart_points: Optional[int], chart_format: str) -> SavedScenario:
+    return SavedScenario(
+        scenario_id=scenario.scenario_id,
+        seed=scenario.seed,
+        engine_version=scenario.engine_version,
+        recomputed=recomputed,
+        inputs=scenario.inputs,
+        summary=scenario.summary,
+        results=shape_results(scenario_results(scenario), chart_points, chart_format),
+    )
+
+# Saved scenario endpoints: run-or-reopen, reopen by id, delete
+# Plain `def` → FastAPI runs them in the threadpool: simulations, file reads and the per-month
+# result rows built from the mapped bands all stay off the event loop
+@app.post("/ai/scenarios", response_model=SavedScenario)   # POST endpoint at /ai/scenarios
+def save_scenario(
+    projection: PortfolioProjectionInput,   # Same body as /ai/simulate/portfolio; scenario_id is required here
+    chart_points: Optional[int] = Query(None, ge=3, description="Downsample chart_data to this many points (LTTB)"),
+    chart_format: Literal["rows", "columnar", "columnar_f32"] = Query("rows", description="Chart payload format"),
+):
+    if not projection.scenario_id:
+        raise HTTPException(status_code=400, detail="scenario_id is required to save a scenario")
+    try:
+        scenario, recomputed = portfolio_engine.project_saved(projection, scenario_store.get())
+        return saved_scenario(scenario, recomputed, chart_points, chart_format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Portfolio projection error: {str(e)}")
+
+@app.get("/ai/scenarios/{user_id}/{scenario_id}", response_model=SavedScenario)   # GET endpoint at /ai/scenarios/{user_id}/{scenario_id}
+def get_scenario(
+    user_id: str,
+    scenario_id: str,
+    chart_points: Optional[int] = Query(None, ge=3, description="Downsample chart_data to this many points (LTTB)"),
+    chart_format: Literal["rows", "columnar", "columnar_f32"] = Query("rows", description="Chart payload format"),
+):
+    # Reopen exactly what was saved (even if ENGINE_VERSION has moved on since; engine_version tells the client)
+    scenario = scenario_store.get().get(user_id, scenario_id)
+    if scenario is None:
+        raise HTTPException(status_code=404, detail="Scenario not found")
+    return saved_scenario(scenario, False, chart_points, chart_format)
+
+@app.delete("/ai/scenarios/{user_id}/{scenario_id}")   # DELETE endpoint at /ai/scenarios/{user_id}/{scenario_id}
+def delete_scenario(user_id: str, scenario_id: str):
+    if not scenario_store.get().delete(user_id, scenario_id):
+        raise HTTPException(status_code=404, detail="Scenario not found")
+    return {"deleted": scenario_id}
+
+# What-If sensitivity grid endpoint
+# Plain `def` → FastAPI runs it in the threadpool: the grid, its .tolist() and the response validation
+# (up to a million points) all stay off the event loop
+@app.post("/ai/simulate/what-if", response_model=WhatIfGridResult)   # POST endpoint at /ai/simulate/what-if
+def simulate_what_if(scenario: WhatIfGridInput):  # Accepts WhatIfGridInput schema as request body
+    try:
+        # Evaluate the whole adjustment grid in one broadcasted computation (or only the changed slice)
+        return what_if_engine.run(scenario)
+    except ValueError as e:
+        # Unknown adjustments or oversized grids → HTTP 400 (bad request)
+        raise HTTPException(status_code=400, detail=f"What-if simulation error: {str(e)}")
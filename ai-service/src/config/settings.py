@@ -2,6 +2,8 @@ from pydantic_settings import BaseSettings   # Pydantic: allows defining config
 from pathlib import Path                     # For building OS-independent file paths
 from dotenv import load_dotenv               # To load .env variables into system environment
 import os                                    # Standard library, used implicitly by dotenv/pydantic
+from functools import lru_cache              # lru_cache → build Settings once, on first use
+from typing import Optional                  # Optional → config fields that may be left unset
 
 # ------------------------------------------------------------
 # STEP 1: Build absolute path to your .env file
@@ -28,14 +30,38 @@ class Settings(BaseSettings):
     api_port: int             # Port number where FastAPI will run
     database_url: str         # PostgreSQL connection string
 
+    # OPTIONAL CONFIGS → sensible defaults when missing from .env
+    llm_provider: str = "gemini"         # "gemini" → Google Gemini, "fake" → local FakeLLM (no network, for load tests)
+    fake_llm_latency: float = 0.5        # Seconds the fake LLM waits before answering
+    llm_max_concurrency: int = 4         # LLM calls allowed in flight at once
+    llm_max_queue: int = 16              # Calls allowed to wait for a slot before chats get HTTP 429
+    response_cache_enabled: bool = True           # Reuse LLM answers for repeated questions with the same context
+    response_cache_max_entries: int = 2048        # Answers kept (least recently used are evicted first)
+    response_cache_ttl_seconds: float = 3600      # Seconds an answer stays valid
+    response_cache_similarity: Optional[float] = None   # Cosine similarity for near-duplicate questions (0.95 recommended); unset → exact matches only
+    context_token_budget: int = 300               # Max (estimated) tokens of user financial context per prompt
+    context_cache_max_users: int = 10_000         # User summaries kept (least recently used are dropped first)
+    context_cache_ttl_seconds: float = 900        # Seconds before a user's summary is reloaded from MCP
+    scenario_store_dir: str = "/tmp/finsage-scenarios"       # Where saved portfolio scenarios are kept
+    scenario_store_max_bytes: int = 256 * 1024 * 1024        # Disk budget; least recently opened scenarios are evicted first
+
     class Config:
         # Tell Pydantic explicitly where to look for env vars
         env_file = env_path
         env_file_encoding = 'utf-8'
 
 # ------------------------------------------------------------
-# STEP 4: Instantiate global settings object
+# STEP 4: Lazily instantiate the global settings object
 # ------------------------------------------------------------
-# This makes `settings` importable everywhere in the app.
-settings = Settings()
+# Validation runs on first use instead of at import, so importing the app
+# (and answering /health) never depends on the .env being complete.
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    return Settings()
+
+# `from src.config.settings import settings` keeps working → resolved through get_settings()
+def __getattr__(name: str):
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
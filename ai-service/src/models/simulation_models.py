@@ -1,5 +1,9 @@
 from pydantic import BaseModel, Field, validator   # BaseModel = schema base class, Field = validation & docs, validator = custom rules
-from typing import List, Dict, Optional            # Typing helpers for lists, dicts, and optional fields
+from typing import Any, List, Dict, Optional       # Typing helpers for lists, dicts, and optional fields
+import math                                        # math.isfinite → reject NaN/inf what-if values
+
+# Longest what-if tenure; the future value of a longer SIP overflows float64 at high rates
+MAX_TENURE_YEARS = 100
 
 
 # -----------------------------
@@ -15,8 +19,8 @@ class WhatIfScenarioInput(BaseModel):
     annual_rate: float = Field(..., ge=0, le=100, description="Annual interest rate in percentage")
     # Required float → between 0% and 100%
 
-    tenure_years: int = Field(..., gt=0, description="Investment duration in years")
-    # Required int → must be positive (at least 1 year)
+    tenure_years: int = Field(..., gt=0, le=MAX_TENURE_YEARS, description="Investment duration in years")
+    # Required int → must be positive (at least 1 year), at most MAX_TENURE_YEARS
 
     adjustments: Dict[str, float] = Field(
         default_factory=dict,
@@ -44,6 +48,116 @@ class SimulationResult(BaseModel):
     )
     # Optional list of dicts → stores month/value pairs for graphs or dashboards
 
+    chart_columns: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Columnar chart data (e.g., {'month': [1, 2], 'value': [1000, 2010]}), when requested instead of chart_data"
+    )
+    # Optional dict → one list (or base64 string, see chart_encoding) per series; set only for columnar formats
+
+    chart_encoding: Optional[str] = Field(None, description="Encoding of chart_columns values, e.g. 'float32-base64'")
+    # Optional string → absent means chart_columns holds plain JSON lists
+
+
+# -----------------------------
+# Output schema for saved scenarios
+# -----------------------------
+class SavedScenario(BaseModel):
+    scenario_id: str = Field(..., description="Id the scenario was saved under")
+    # Required → chosen by the client when the projection was first run
+
+    seed: int = Field(..., description="Random seed the saved numbers were simulated with")
+    # Required int → rerunning the same inputs with this seed reproduces them
+
+    engine_version: str = Field(..., description="Projection engine version that produced the numbers")
+    # Required string → a different version means the next projection request recomputes them
+
+    recomputed: bool = Field(..., description="Whether this request ran the simulation (false → served from the store)")
+    # Required bool → lets clients tell a reopened scenario from a fresh run
+
+    inputs: Dict[str, Any] = Field(..., description="Projection inputs the scenario was saved with")
+    # Required dict → what the UI needs to show (and edit) the saved scenario
+
+    summary: Dict[str, Dict[str, float]] = Field(..., description="Terminal p10/p50/p90 per asset and total")
+    # Required nested dict → {'total': {'p10': ..., 'p50': ..., 'p90': ...}, ...}
+
+    results: Dict[str, SimulationResult] = Field(..., description="One result per asset plus 'total', with monthly bands")
+    # Required dict → same shape as /ai/simulate/portfolio
+
+
+# -----------------------------
+# Output schema for What-If sensitivity grids
+# -----------------------------
+class WhatIfGridResult(BaseModel):
+    axes: Dict[str, List[float]] = Field(..., description="Grid axes in tensor order")
+    # Required → axis name → swept values; tensor dimension i follows the i-th axis
+
+    future_values: List[Any] = Field(..., description="Dense tensor of future values, nested lists in axis order")
+    # Required nested list → future_values[i][j]... is the grid point at axes[0][i], axes[1][j], ...
+
+    timeline_months: Optional[List[Any]] = Field(None, description="Dense tensor of months to goal (when target_amount is set)")
+    # Optional nested list → same shape as future_values
+
+    points: Optional[List[SimulationResult]] = Field(None, description="Per-point summaries")
+    # Optional list → one SimulationResult per grid point, in row-major order
+
+    recomputed_points: int = Field(..., ge=0, description="Grid points evaluated for this request")
+    # Required int → equals the grid size unless incremental mode could reuse previous slices
+
+
+# -----------------------------
+# Input schema for What-If sensitivity grids
+# -----------------------------
+WHAT_IF_ADJUSTMENTS = ("rate_increase", "extra_investment", "tenure_increase")
+# rate_increase → percentage points added to annual_rate
+# extra_investment → amount added to monthly_investment
+# tenure_increase → years added to tenure_years
+
+
+class WhatIfGridInput(WhatIfScenarioInput):
+    ranges: Dict[str, List[float]] = Field(
+        ...,
+        description="Values to sweep per adjustment (e.g., {'rate_increase': [0, 1, 2], 'extra_investment': [0, 500, 1000]})"
+    )
+    # Required dictionary → each key is one axis of the grid, evaluated as a full Cartesian product
+
+    target_amount: Optional[float] = Field(None, gt=0, description="Goal amount; adds months-to-goal to every grid point")
+    # Optional float → when given, timeline_months is filled in for every point
+
+    include_points: bool = Field(True, description="Return a SimulationResult summary per grid point")
+    # Optional bool → switch off for large grids when only the dense tensor is needed
+
+    incremental: bool = Field(False, description="Reuse this user's previous grid and recompute only the slices that changed")
+    # Optional bool → meant for slider drags, where one axis changes per request
+
+    @validator("ranges")
+    def validate_ranges(cls, v: Dict[str, List[float]], values: Dict[str, Any]):
+        if not v:                                       # A grid needs at least one axis
+            raise ValueError("At least one adjustment range is required")
+        for adjustment, swept in v.items():
+            if adjustment not in WHAT_IF_ADJUSTMENTS:   # Only adjustments the engine knows how to apply
+                raise ValueError(f"Unknown adjustment '{adjustment}', expected one of {', '.join(WHAT_IF_ADJUSTMENTS)}")
+            if not swept:
+                raise ValueError(f"Range for '{adjustment}' is empty")
+
+        # Every grid point must stay within the base field limits: swept values replace the fixed
+        # adjustment of the same name, and each adjustment moves exactly one of the three inputs
+        if not {"monthly_investment", "annual_rate", "tenure_years", "adjustments"} <= values.keys():
+            return v                                    # A base field already failed validation
+        limits = {
+            "extra_investment": ("monthly_investment", values["monthly_investment"], lambda x: x > 0, "be > 0"),
+            "rate_increase": ("annual_rate", values["annual_rate"], lambda x: 0 <= x <= 100, "be between 0 and 100"),
+            "tenure_increase": ("tenure_years", values["tenure_years"], lambda x: 0 < x <= MAX_TENURE_YEARS,
+                                f"be > 0 and <= {MAX_TENURE_YEARS}"),
+        }
+        for adjustment, (field, base, within, rule) in limits.items():
+            checked = v.get(adjustment, [values["adjustments"].get(adjustment, 0.0)])
+            for value in checked:
+                if not math.isfinite(base + value):     # NaN, inf, or large enough to overflow
+                    raise ValueError(f"'{adjustment}' values must be finite, got {value}")
+                if not within(base + value):
+                    raise ValueError(f"'{adjustment}' of {value} makes {field} {base + value}; it must {rule}")
+        return v
+
 
 # -----------------------------
 # Input schema for portfolio projections
@@ -70,6 +184,30 @@ class PortfolioProjectionInput(BaseModel):
     tenure_years: int = Field(..., gt=0, description="Projection duration in years")
     # Required int → simulation period in years
 
+    annual_volatilities: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Annual volatility per asset class in percentage (e.g., {'equity': 18, 'bonds': 5})"
+    )
+    # Optional dictionary → assets left out fall back to a typical volatility for their class
+
+    correlations: Dict[str, Dict[str, float]] = Field(
+        default_factory=dict,
+        description="Pairwise return correlations (e.g., {'equity': {'bonds': -0.2}}); unspecified pairs are 0"
+    )
+    # Optional nested dictionary → only one direction of each pair is needed, the matrix is symmetrised
+
+    rebalance_every_months: int = Field(12, ge=0, description="Rebalance to the target allocation every N months (0 = never)")
+    # Optional int → yearly rebalancing by default
+
+    simulations: int = Field(10000, ge=100, le=100000, description="Number of Monte Carlo paths")
+    # Optional int → more paths give smoother percentile bands
+
+    seed: Optional[int] = Field(None, description="Random seed for reproducible projections")
+    # Optional int → same seed + same inputs = same projection
+
+    scenario_id: Optional[str] = Field(None, min_length=1, max_length=128, description="Save the projection under this id")
+    # Optional string → reopening the scenario with the same inputs returns the saved numbers instead of a new draw
+
     # -----------------------------
     # Validators: enforce extra rules
     # -----------------------------
@@ -90,3 +228,25 @@ class PortfolioProjectionInput(BaseModel):
         return v
         # Prevents unrealistic values like negative returns or >100% growth
 
+    @validator("annual_volatilities")
+    def validate_annual_volatilities(cls, v: Dict[str, float], values):
+        allocation = values.get("allocation", {})
+        for asset, volatility in v.items():
+            if asset not in allocation:       # Volatility for an asset we don't hold is almost certainly a typo
+                raise ValueError(f"Volatility given for '{asset}', which is not in the allocation")
+            if volatility < 0 or volatility > 200:
+                raise ValueError(f"Annual volatility for {asset} must be between 0 and 200, got {volatility}")
+        return v
+
+    @validator("correlations")
+    def validate_correlations(cls, v: Dict[str, Dict[str, float]], values):
+        allocation = values.get("allocation", {})
+        for asset, row in v.items():
+            for other, rho in row.items():
+                if asset not in allocation or other not in allocation:
+                    raise ValueError(f"Correlation given for '{asset}'/'{other}', which is not in the allocation")
+                if not -1 <= rho <= 1:        # Correlations live in [-1, 1]
+                    raise ValueError(f"Correlation between {asset} and {other} must be between -1 and 1, got {rho}")
+        return v
+        # Whether the full matrix is positive definite is checked when it is factorised
+
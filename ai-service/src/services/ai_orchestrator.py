@@ -1,18 +1,55 @@
-from langchain.prompts import PromptTemplate   # Build reusable prompts with placeholders
-from langchain_google_genai import ChatGoogleGenerativeAI  # Correct Gemini wrapper for LangChain
+import asyncio                                 # asyncio → semaphore that caps concurrent LLM calls
+import time                                    # time → LLM call latency for /metrics
+from contextlib import asynccontextmanager     # Build the "admission slot" async context manager
+from typing import AsyncIterator, Optional     # Typing helpers
 from src.config.settings import Settings       # Load API keys & configs from .env/settings
+from src.services.response_cache import ResponseCache   # Cache of LLM answers keyed on query + context
+from src.services.context_builder import UserContextBuilder, estimate_tokens   # Compact, token-budgeted user financial context
+from src.utils.metrics import record_llm_call  # LLM latency / token metrics
+
+# Default limits: LLM calls running at once, and extra calls allowed to wait for a slot
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_MAX_QUEUE = 16
+
+
+class OrchestratorBusy(Exception):   # Raised when every LLM slot is taken and the wait queue is full
+    pass
 
 
 class AIOrchestrator:   # This class orchestrates interaction between your app and the LLM
-    def __init__(self, api_key: str):   # Constructor → needs API key to authenticate Gemini usage
-        # Initialize Gemini LLM with provided API key
-        # - model="gemini-1.5-pro" → choose the advanced Gemini model
-        # - google_api_key=api_key → authentication key from settings
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-1.5-pro",
-            google_api_key=api_key
-        )
-        
+    def __init__(self, api_key: str, llm=None,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY, max_queue: int = DEFAULT_MAX_QUEUE,
+                 cache: Optional[ResponseCache] = None, context_builder: Optional[UserContextBuilder] = None):
+        # Constructor → needs API key to authenticate Gemini usage
+        # - llm → optional model override (e.g. FakeLLM for local load tests); Gemini is used otherwise
+        # - max_concurrency → LLM calls allowed in flight at once
+        # - max_queue → calls allowed to wait for a free slot before new ones are rejected
+        # - cache → optional ResponseCache; repeated questions with the same context skip the LLM
+        # - context_builder → optional UserContextBuilder; supplies each user's financial summary as context
+        # LangChain is imported here rather than at module level → it only costs startup time once an orchestrator is built
+        from langchain_core.prompts import PromptTemplate   # Build reusable prompts with placeholders (langchain.prompts re-exported it; gone in langchain 1.x)
+
+        if llm is None:
+            from langchain_google_genai import ChatGoogleGenerativeAI  # Correct Gemini wrapper for LangChain
+
+            # Initialize Gemini LLM with provided API key
+            # - model="gemini-1.5-pro" → choose the advanced Gemini model
+            # - google_api_key=api_key → authentication key from settings
+            llm = ChatGoogleGenerativeAI(
+                model="gemini-1.5-pro",
+                google_api_key=api_key
+            )
+        self.llm = llm
+        self.cache = cache
+        self.context_builder = context_builder
+
+        # Concurrency limits for the async path (the sync process_query is not limited)
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._waiting = 0   # Calls currently queued for a slot
+        self._active = 0    # Calls currently holding a slot
+
         # Define a reusable prompt template with placeholders {query}, {context}
         self.prompt_template = PromptTemplate(
             input_variables=["query", "context"],   # Declares required fields to fill into the template
@@ -20,7 +57,7 @@ class AIOrchestrator:   # This class orchestrates interaction between your app a
             You are FinSage, a financial AI coach. Provide accurate and concise financial advice.
             User query: {query}
             Context (user financial data): {context}
-            Answer in a friendly, professional tone. 
+            Answer in a friendly, professional tone.
             If the query requires calculations, indicate they will be handled separately.
             """
             # ↑ The prompt instructs the AI about:
@@ -30,19 +67,139 @@ class AIOrchestrator:   # This class orchestrates interaction between your app a
             #   - Extra rule → if query requires math, tell user it will be handled separately
         )
 
+    def build_context(self, user_id: str = None) -> str:   # Context text rendered into the prompt (and hashed for the cache)
+        # Precomputed summary if the user's financials are already loaded (sync path never fetches)
+        if self.context_builder is not None:
+            context = self.context_builder.cached_context(user_id)
+            if context is not None:
+                return context
+        # Decide context: either dummy text or "fetching" message based on user_id
+        return "No user financial data available." if user_id is None else f"Fetching data for user {user_id}."
+
+    async def abuild_context(self, user_id: str = None) -> str:   # Async path → may load the user's financials on first use
+        if self.context_builder is not None:
+            return await self.context_builder.get_context(user_id)
+        return self.build_context(user_id)
+
+    def build_prompt(self, query: str, context: str) -> str:   # Shared by the sync, async and streaming paths
+        # Fill in the prompt template with actual query + context
+        return self.prompt_template.format(query=query, context=context)
+
+    def cached_response(self, query: str, context: str) -> Optional[str]:
+        return self.cache.get(query, context) if self.cache is not None else None
+
+    def store_response(self, query: str, context: str, response: str, user_id: str = None):
+        if self.cache is not None and response:
+            self.cache.set(query, context, response, user_id=user_id)
+
     def process_query(self, query: str, user_id: str = None):   # Function to process user queries
         try:
-            # Decide context: either dummy text or "fetching" message based on user_id
-            context = "No user financial data available." if user_id is None else f"Fetching data for user {user_id}."
-            
-            # Fill in the prompt template with actual query + context
-            prompt = self.prompt_template.format(query=query, context=context)
-            
+            context = self.build_context(user_id)
+            cached = self.cached_response(query, context)
+            if cached is not None:
+                return cached                     # Same (or very similar) question with the same context → no LLM call
+
+            prompt = self.build_prompt(query, context)
+
             # Send prompt to Gemini model → returns structured object with responses
-            response = self.llm.invoke(prompt)   # NOTE: .invoke() is correct for ChatGoogleGenerativeAI
-            
+            start = time.perf_counter()
+            try:
+                response = self.llm.invoke(prompt)   # NOTE: .invoke() is correct for ChatGoogleGenerativeAI
+            except Exception:
+                record_llm_call("invoke", "error", time.perf_counter() - start)
+                raise
+
             # Extract the plain text response (strip to clean whitespace/newlines)
-            return response.content.strip()
+            answer = response.content.strip()
+            self.record_usage("invoke", start, prompt, answer, response)
+            self.store_response(query, context, answer, user_id)
+            return answer
         except Exception as e:
             # Wrap any error in a custom exception message
             raise Exception(f"Failed to process query: {str(e)}")
+
+    @staticmethod
+    def record_usage(mode: str, start: float, prompt: str, answer: str, response=None):
+        # Token counts from the provider's usage metadata when it reports them, else estimated from the text
+        usage = getattr(response, "usage_metadata", None) or {}
+        record_llm_call(
+            mode, "ok", time.perf_counter() - start,
+            input_tokens=usage.get("input_tokens") or estimate_tokens(prompt),
+            output_tokens=usage.get("output_tokens") or estimate_tokens(answer),
+        )
+
+    # ---------------- Async path ----------------
+    def stats(self):   # Current load → useful for health checks and tuning the limits
+        return {
+            "active": self._active,
+            "waiting": self._waiting,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+        }
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        Hold one of `max_concurrency` LLM slots for the duration of the block.
+        Waits if all slots are busy; raises OrchestratorBusy right away if `max_queue`
+        calls are already waiting, so overload turns into fast rejections instead of
+        an ever-growing backlog.
+        """
+        if self._semaphore.locked() and self._waiting >= self.max_queue:
+            raise OrchestratorBusy(f"{self.max_concurrency} chats in progress and {self._waiting} waiting")
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        self._active += 1
+        try:
+            yield
+        finally:
+            self._active -= 1
+            self._semaphore.release()
+
+    async def aprocess_query(self, query: str, user_id: str = None) -> str:   # Non-blocking version of process_query
+        context = await self.abuild_context(user_id)
+        cached = self.cached_response(query, context)
+        if cached is not None:
+            return cached                         # Cache hits don't need an LLM slot
+
+        prompt = self.build_prompt(query, context)
+        async with self.slot():   # OrchestratorBusy propagates unwrapped so callers can answer 429
+            start = time.perf_counter()
+            try:
+                # .ainvoke() awaits the model without blocking the event loop
+                response = await self.llm.ainvoke(prompt)
+                answer = response.content.strip()
+                self.record_usage("invoke", start, prompt, answer, response)
+                self.store_response(query, context, answer, user_id)
+                return answer
+            except Exception as e:
+                record_llm_call("invoke", "error", time.perf_counter() - start)
+                raise Exception(f"Failed to process query: {str(e)}")
+
+    async def astream_query(self, query: str, user_id: str = None) -> AsyncIterator[str]:   # Yields text chunks as they arrive
+        context = await self.abuild_context(user_id)
+        cached = self.cached_response(query, context)
+        if cached is not None:
+            yield cached                          # Whole cached answer as a single chunk
+            return
+
+        prompt = self.build_prompt(query, context)
+        async with self.slot():
+            start = time.perf_counter()
+            try:
+                # .astream() yields message chunks as the model generates them
+                chunks = []
+                async for chunk in self.llm.astream(prompt):
+                    if chunk.content:
+                        chunks.append(chunk.content)
+                        yield chunk.content
+                answer = "".join(chunks).strip()
+                self.record_usage("stream", start, prompt, answer)
+                # Only complete answers are cached (an abandoned stream never gets here)
+                self.store_response(query, context, answer, user_id)
+            except Exception as e:
+                record_llm_call("stream", "error", time.perf_counter() - start)
+                raise Exception(f"Failed to process query: {str(e)}")
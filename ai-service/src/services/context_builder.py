@@ -0,0 +1,201 @@
+import math                                         # math → token estimate rounding
+import re                                           # re → "YYYY-MM" month check on transaction dates
+import time                                         # time → TTL bookkeeping
+from collections import OrderedDict, defaultdict    # Ordered dict → LRU order of users; defaultdict → running aggregates
+from typing import Any, Dict, List, Optional, Set, Tuple   # Typing helpers
+
+# Default size of the context block handed to the LLM, in (estimated) tokens
+DEFAULT_TOKEN_BUDGET = 300
+
+# Spend history kept per user (older months are dropped as new ones arrive)
+MONTHS_KEPT = 12
+
+# Users whose summaries are kept (least recently used are dropped first), and seconds before a
+# summary is reloaded from MCP so balances and goals changed outside this service show up
+DEFAULT_MAX_USERS = 10_000
+DEFAULT_TTL_SECONDS = 900
+
+MONTH = re.compile(r"\d{4}-\d{2}")
+
+# Placeholder used when no financial data is available for a user
+NO_DATA_CONTEXT = "No user financial data available."
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English/numbers); avoids a tokenizer dependency."""
+    return math.ceil(len(text) / 4)
+
+
+def _amount(value: Any) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _money(value: float) -> str:
+    return f"{value:,.0f}"
+
+
+def _transaction_id(transaction: Dict[str, Any]) -> Optional[str]:
+    for key in ("transaction_id", "transactionId", "id"):
+        if transaction.get(key) is not None:
+            return str(transaction[key])
+    return None
+
+
+class UserFinancialSummary:   # Running aggregates for one user; cheap to update, cheap to render
+    def __init__(self):
+        self.balances: Dict[str, float] = defaultdict(float)       # account type → total balance
+        self.investments: Dict[str, float] = defaultdict(float)    # investment type → current value
+        self.card_outstanding = 0.0                                # credit card dues
+        self.monthly_sip = 0.0                                     # total SIP per month
+        self.spend: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))   # "YYYY-MM" → category → spend
+        self.seen: Dict[str, Set[str]] = defaultdict(set)          # "YYYY-MM" → ids of transactions already counted
+        self.goals: List[Dict[str, Any]] = []
+        self.rendered: Optional[str] = None                        # Cached context text; None → re-render on next read
+
+    def load(self, financials: Dict[str, Any]):
+        """Build every aggregate from a full MCP /financials payload."""
+        for account in financials.get("bank_accounts", []):
+            self.balances[account.get("type", "bank")] += _amount(account.get("balance"))
+        for investment in financials.get("investments", []):
+            self.investments[investment.get("type", "other")] += _amount(investment.get("current_value", investment.get("value")))
+            self.monthly_sip += _amount(investment.get("monthly_sip"))
+        for card in financials.get("credit_cards", []):
+            self.card_outstanding += _amount(card.get("outstanding", card.get("balance")))
+        self.set_goals(financials.get("goals", []))
+        self.add_transactions(financials.get("transactions", []))
+
+    def add_transactions(self, transactions: List[Dict[str, Any]]):
+        """
+        Fold new transactions into the monthly spend aggregates (debits only). Transactions
+        already counted (same id) are skipped, and so are undated ones: with no month they
+        can't be placed in the history.
+        """
+        for transaction in transactions:
+            amount = _amount(transaction.get("amount"))
+            month = str(transaction.get("date") or "")[:7]
+            if transaction.get("type") == "credit" or amount == 0 or not MONTH.fullmatch(month):
+                continue
+            transaction_id = _transaction_id(transaction)
+            if transaction_id is not None:
+                if transaction_id in self.seen[month]:
+                    continue
+                self.seen[month].add(transaction_id)
+            self.spend[month][transaction.get("category") or "other"] += abs(amount)
+        for month in sorted(self.spend)[:-MONTHS_KEPT]:
+            del self.spend[month]
+            self.seen.pop(month, None)
+        self.rendered = None
+
+    def set_goals(self, goals: List[Dict[str, Any]]):
+        self.goals = [
+            {
+                "name": goal.get("name", "goal"),
+                "target": _amount(goal.get("target_amount")),
+                "current": _amount(goal.get("current_amount")),
+                "deadline": goal.get("target_date"),
+            }
+            for goal in goals
+        ]
+        self.rendered = None
+
+    def sections(self) -> List[str]:
+        """Context lines, most important first; trimming drops lines from the end."""
+        lines = []
+        if self.balances or self.card_outstanding:
+            parts = [f"{kind} {_money(total)}" for kind, total in sorted(self.balances.items(), key=lambda item: -item[1])]
+            if self.card_outstanding:
+                parts.append(f"credit card dues {_money(self.card_outstanding)}")
+            lines.append("Balances: " + "; ".join(parts))
+        if self.investments or self.monthly_sip:
+            parts = [f"{kind} {_money(total)}" for kind, total in sorted(self.investments.items(), key=lambda item: -item[1])]
+            lines.append(f"Investments: {'; '.join(parts) or 'none'}; SIP total {_money(self.monthly_sip)}/month")
+        for goal in self.goals:
+            progress = goal["current"] / goal["target"] * 100 if goal["target"] else 0.0
+            deadline = f" by {goal['deadline']}" if goal["deadline"] else ""
+            lines.append(f"Goal {goal['name']}: {_money(goal['current'])} of {_money(goal['target'])} ({progress:.0f}%){deadline}")
+        if self.spend:
+            month = max(self.spend)
+            categories = sorted(self.spend[month].items(), key=lambda item: -item[1])
+            lines.append(f"Spend {month}: total {_money(sum(self.spend[month].values()))}")
+            lines.extend(f"- {category} {_money(total)}" for category, total in categories)   # Smallest categories trim first
+        return lines
+
+    def render(self, token_budget: int) -> str:
+        if self.rendered is None:
+            lines = self.sections() or [NO_DATA_CONTEXT]
+            while len(lines) > 1 and estimate_tokens("\n".join(lines)) > token_budget:
+                lines.pop()
+            text = "\n".join(lines)
+            if estimate_tokens(text) > token_budget:
+                text = text[:token_budget * 4]     # Single oversized line → hard cut
+            self.rendered = text
+        return self.rendered
+
+
+class UserContextBuilder:   # Per-user cache of compact, token-budgeted financial context for LLM prompts
+    def __init__(self, connector=None, token_budget: int = DEFAULT_TOKEN_BUDGET,
+                 max_users: int = DEFAULT_MAX_USERS, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        # - connector → optional AsyncMCPConnector used to load users on first use
+        # - token_budget → upper bound on the estimated tokens of each user's context
+        # - max_users / ttl_seconds → summaries kept, and how long before one is reloaded from MCP
+        self.connector = connector
+        self.token_budget = token_budget
+        self.max_users = max_users
+        self.ttl_seconds = ttl_seconds
+        # user_id → (summary, expires_at), least recently used first
+        self._summaries: "OrderedDict[str, Tuple[UserFinancialSummary, float]]" = OrderedDict()
+        self.evictions = 0
+        self.expirations = 0
+
+    def load(self, user_id: str, financials: Dict[str, Any]):
+        """(Re)build a user's summary from a full MCP payload."""
+        summary = UserFinancialSummary()
+        summary.load(financials)
+        self._summaries.pop(user_id, None)
+        self._summaries[user_id] = (summary, time.monotonic() + self.ttl_seconds)
+        while len(self._summaries) > self.max_users:
+            self._summaries.popitem(last=False)   # Least recently used
+            self.evictions += 1
+
+    def _summary(self, user_id: Optional[str]) -> Optional[UserFinancialSummary]:
+        entry = self._summaries.get(user_id) if user_id is not None else None
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            del self._summaries[user_id]
+            self.expirations += 1
+            return None
+        self._summaries.move_to_end(user_id)   # Mark as most recently used
+        return entry[0]
+
+    def add_transactions(self, user_id: str, transactions: List[Dict[str, Any]]) -> bool:
+        """Update a loaded user's spend aggregates in place; returns False if the user isn't loaded (or has expired)."""
+        summary = self._summary(user_id)
+        if summary is None:
+            return False
+        summary.add_transactions(transactions)
+        return True
+
+    def invalidate(self, user_id: str):
+        self._summaries.pop(user_id, None)
+
+    def cached_context(self, user_id: Optional[str]) -> Optional[str]:
+        """Context for an already-loaded user (dictionary lookup + cached string), or None."""
+        summary = self._summary(user_id)
+        return summary.render(self.token_budget) if summary is not None else None
+
+    async def get_context(self, user_id: Optional[str]) -> str:
+        """Context for a user, loading their financials through the connector on first use."""
+        context = self.cached_context(user_id)
+        if context is not None:
+            return context
+        if user_id is None or self.connector is None:
+            return NO_DATA_CONTEXT
+        try:
+            self.load(user_id, await self.connector.fetch_user_financial_data(user_id))
+        except Exception:
+            return NO_DATA_CONTEXT          # MCP down → answer without personal data rather than fail the chat
+        return self.cached_context(user_id)
@@ -1,10 +1,343 @@
-import pandas as pd              # Pandas → for handling tabular data
-import matplotlib.pyplot as plt  # Matplotlib → for plotting charts
 import io                        # io → for in-memory buffers (StringIO, BytesIO)
 import base64                    # base64 → for encoding binary chart images into text
-from typing import Dict, List    # Typing → type hints (List of Dicts, etc.)
+import codecs                    # codecs → incremental UTF-8 decoding of streamed request bodies
+import csv                       # csv → row-by-row CSV encoding for streamed exports
+import asyncio                   # asyncio → await renders without blocking the event loop
+import hashlib                   # hashlib → content hash used as the chart cache key
+import json                      # json → canonical serialization of chart inputs for hashing
+import multiprocessing           # multiprocessing → spawn context for the rendering processes
+from collections import OrderedDict                  # Ordered dict → LRU order of cached charts
+from concurrent.futures import ProcessPoolExecutor   # Worker processes → rendering never runs in the request thread
+from itertools import islice                         # islice → pull fixed-size chunks from a row iterator
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple  # Typing → type hints (List of Dicts, etc.)
+
+# Chart output formats
+# png → Base64 data URI rendered with matplotlib's Agg backend
+# svg → vector image (no rasterization), also rendered by matplotlib
+# spec → JSON plot spec for the frontend to draw itself (no matplotlib at all)
+CHART_FORMATS = ("png", "svg", "spec")
+
+# Rendered charts kept in memory, by total size
+CHART_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# Rows encoded per chunk by the streaming exports (bounds memory regardless of total rows)
+EXPORT_CHUNK_ROWS = 10_000
+
+# Largest single row accepted by streamed exports (a row split across body chunks is buffered up to this)
+MAX_ROW_BYTES = 1024 * 1024
+
+# Columnar export formats → (media type, file extension)
+COLUMNAR_FORMATS = {
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+# Default chart size in inches (at DPI dots per inch)
+CHART_SIZE = (10, 6)
+CHART_DPI = 100
+
+
+def render_chart(x: List[Any], y: List[Any], x_key: str, y_key: str, title: str,
+                 size: Tuple[float, float], image_format: str) -> bytes:
+    """
+    Render one line chart with an object-oriented Agg Figure (no pyplot global state,
+    safe to run in any thread or process). Runs inside the worker pool, so matplotlib
+    is imported there and never at service startup.
+    """
+    from matplotlib.figure import Figure                        # Lazy import → ~0.5 s only paid by workers
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    figure = Figure(figsize=size, dpi=CHART_DPI)
+    FigureCanvasAgg(figure)                       # Attach the Agg canvas used by savefig
+    axes = figure.add_subplot()
+    axes.plot(x, y, marker='o')                   # Line chart with markers
+    axes.set_title(title)                         # Add chart title
+    axes.set_xlabel(x_key)                        # Label x-axis
+    axes.set_ylabel(y_key)                        # Label y-axis
+    axes.grid(True)                               # Add grid for readability
+
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+class _ChunkSink:   # Write-only file object that hands out whatever was written since the last drain()
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self.closed = False
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _encode_chunks(encoder, rows: Iterable[Dict], chunk_rows: int) -> Iterator[Any]:
+    """Feed rows to an encoder `chunk_rows` at a time, yielding whatever it has ready."""
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_rows))
+        encoded = encoder.write(chunk)
+        if encoded:
+            yield encoded
+        if len(chunk) < chunk_rows:
+            break
+    encoded = encoder.close()
+    if encoded:
+        yield encoded
+
+
+class _CSVEncoder:   # Rows → CSV text, header first; columns declared by the caller or taken from the first chunk
+    def __init__(self, columns: Optional[List[str]] = None, chunk_rows: int = EXPORT_CHUNK_ROWS):
+        self.columns = columns
+        self.chunk_rows = chunk_rows
+        self._pending: List[Dict] = []       # Rows held back until the header is known
+        self._buffer = io.StringIO()
+        self._writer = None
+
+    def _start(self):
+        # Declared columns pick fields out of each row; inferred ones (every key of the first chunk)
+        # refuse later rows with keys they would drop
+        columns = self.columns or list(dict.fromkeys(name for row in self._pending for name in row))
+        self._writer = csv.DictWriter(self._buffer, fieldnames=columns, extrasaction="ignore" if self.columns else "raise",
+                                      lineterminator="\n")   # Same line endings as export_to_csv
+        self._writer.writeheader()
+        self._writer.writerows(self._pending)
+        self._pending = []
+
+    def _drain(self) -> str:
+        text = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return text
+
+    def write(self, rows: List[Dict]) -> str:
+        if self._writer is not None:
+            self._writer.writerows(rows)
+        else:
+            self._pending.extend(rows)
+            if self.columns or len(self._pending) >= self.chunk_rows:
+                self._start()
+        return self._drain()
+
+    def close(self) -> str:
+        if self._writer is None and (self._pending or self.columns):
+            self._start()                    # Short export (or no rows → header only)
+        return self._drain()
+
+
+class _ColumnarEncoder:   # Rows → Parquet (one row group per `chunk_rows` rows) or Arrow IPC stream bytes
+    def __init__(self, export_format: str, schema: Optional[Dict[str, str]] = None,
+                 chunk_rows: int = EXPORT_CHUNK_ROWS, compression: str = "zstd"):
+        if export_format not in COLUMNAR_FORMATS:
+            raise ValueError(f"Unknown export format '{export_format}', expected one of {', '.join(COLUMNAR_FORMATS)}")
+        import pyarrow as pa                        # Lazy import → only columnar exports pay for pyarrow
+
+        self.export_format = export_format
+        self.chunk_rows = chunk_rows
+        self.compression = compression
+        self.declared = schema is not None
+        try:
+            self.schema = pa.schema([(name, pa.type_for_alias(kind)) for name, kind in schema.items()]) if schema else None
+        except ValueError as e:
+            raise ValueError(f"Invalid export schema: {e}")
+        self._pending: List[Dict] = []
+        self._sink = _ChunkSink()
+        self._writer = None
+
+    def _batch(self, rows: List[Dict]):
+        import pyarrow as pa
+
+        if self.schema is None:
+            # First batch: one column per key seen in any row, typed over all of its values
+            names = list(dict.fromkeys(name for row in rows for name in row))
+            try:
+                columns = [pa.array([row.get(name) for row in rows]) for name in names]
+            except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+                raise ValueError(f"Rows can't be exported as one column per key: {e}")
+            self.schema = pa.schema([(name, column.type) for name, column in zip(names, columns)])
+            return pa.RecordBatch.from_arrays(columns, schema=self.schema)
+
+        if not self.declared:
+            extra = [name for name in dict.fromkeys(name for row in rows for name in row) if name not in self.schema.names]
+            if extra:
+                raise ValueError(f"Columns {extra} first appear after the first {self.chunk_rows} rows; declare the export schema")
+        columns = []
+        for field in self.schema:
+            try:
+                columns.append(pa.array([row.get(field.name) for row in rows], type=field.type))
+            except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+                raise ValueError(f"Column '{field.name}' doesn't fit the export schema ({field.type}): {e}"
+                                 + ("" if self.declared else "; declare the export schema to set column types"))
+        return pa.RecordBatch.from_arrays(columns, schema=self.schema)
+
+    def _write_batch(self, batch):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self._writer is None:
+            if self.export_format == "parquet":
+                self._writer = pq.ParquetWriter(self._sink, self.schema, compression=self.compression)
+            else:
+                self._writer = pa.ipc.new_stream(self._sink, self.schema,
+                                                 options=pa.ipc.IpcWriteOptions(compression=self.compression))
+        if batch.num_rows and self.export_format == "parquet":
+            self._writer.write_table(pa.Table.from_batches([batch]))   # One row group per chunk
+        elif batch.num_rows:
+            self._writer.write_batch(batch)
+
+    def write(self, rows: List[Dict]) -> bytes:
+        self._pending.extend(rows)
+        while len(self._pending) >= self.chunk_rows:
+            chunk, self._pending = self._pending[:self.chunk_rows], self._pending[self.chunk_rows:]
+            self._write_batch(self._batch(chunk))
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        import pyarrow as pa
+
+        if self._pending or self._writer is None:
+            if self.schema is None and not self._pending:
+                self.schema = pa.schema([])            # No rows, no schema → empty file
+            self._write_batch(self._batch(self._pending))
+            self._pending = []
+        self._writer.close()                           # Parquet footer / Arrow end-of-stream marker
+        return self._sink.drain()
+
+
+class _JSONRowParser:   # Incremental parser for a body of rows: a JSON array of objects, or NDJSON
+    def __init__(self, max_row_bytes: int = MAX_ROW_BYTES):
+        self.max_row_bytes = max_row_bytes
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._text = ""
+        self._array: Optional[bool] = None   # None → not decided yet (first non-blank character)
+        self._comma = False                  # Inside an array, after a row → expect "," or "]"
+        self._done = False                   # Array closed → only whitespace may follow
+
+    def feed(self, data: bytes, final: bool = False) -> List[Dict]:
+        text = self._text + self._decoder.decode(data, final)
+        rows = []
+        position = 0
+        while True:
+            while position < len(text) and text[position] in " \t\r\n":
+                position += 1
+            if position == len(text):
+                break
+            char = text[position]
+            if self._done:
+                raise ValueError("Unexpected data after the closing ']'")
+            if self._array is None:
+                self._array = char == "["
+                position += char == "["
+                continue
+            if self._array and (char == "]" or self._comma):
+                if char == "]":
+                    self._done = True
+                elif char != ",":
+                    raise ValueError(f"Expected ',' or ']' between rows, got {char!r}")
+                self._comma = False
+                position += 1
+                continue
+            try:
+                row, end = self._json.raw_decode(text, position)
+            except json.JSONDecodeError as e:
+                if final or len(text) - position > self.max_row_bytes:
+                    raise ValueError(f"Invalid JSON row: {e}")
+                break                                # Row split across body chunks → wait for the rest
+            if not isinstance(row, dict):
+                raise ValueError(f"Each row must be a JSON object, got {type(row).__name__}")
+            rows.append(row)
+            position = end
+            self._comma = self._array
+        self._text = text[position:]
+        return rows
+
+    def close(self) -> List[Dict]:
+        rows = self.feed(b"", final=True)
+        if self._array and not self._done:
+            raise ValueError("Unterminated JSON array")
+        return rows
+
+
+def parse_schema(spec: str) -> Dict[str, str]:
+    """Export schema from "name:type,name:type" (e.g. "date:date32,amount:float64"); CSV needs names only."""
+    schema = {}
+    for item in filter(None, (item.strip() for item in spec.split(","))):
+        name, _, kind = item.partition(":")
+        schema[name.strip()] = kind.strip() or "string"
+    return schema
+
+
+class ChartCache:   # Byte-budgeted LRU of rendered charts, keyed by a content hash of their inputs
+    def __init__(self, max_bytes: int = CHART_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(*parts: Any) -> str:
+        # Canonical JSON (sorted keys, no whitespace) → same inputs always hash the same
+        return hashlib.sha256(json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        image = self._entries.get(key)
+        if image is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return image
+
+    def set(self, key: str, image: bytes):
+        if len(image) > self.max_bytes:
+            return                                 # Larger than the whole budget → don't cache
+        if key in self._entries:
+            self.bytes -= len(self._entries.pop(key))
+        self._entries[key] = image
+        self.bytes += len(image)
+        while self.bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)   # Least recently used
+            self.bytes -= len(evicted)
+            self.evictions += 1
+
+    def stats(self):
+        return {"entries": len(self._entries), "bytes": self.bytes, "hits": self.hits,
+                "misses": self.misses, "evictions": self.evictions}
+
 
 class ExportService:
+    def __init__(self, max_workers: Optional[int] = 2, cache_max_bytes: int = CHART_CACHE_MAX_BYTES):
+        # - max_workers → chart rendering processes (0 → render inline, e.g. for scripts and debugging)
+        # - cache_max_bytes → memory budget for rendered charts
+        self.max_workers = max_workers
+        self.chart_cache = ChartCache(cache_max_bytes)
+        self._pool: Optional[ProcessPoolExecutor] = None   # Started on the first render, not at import
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self._pool is None and self.max_workers != 0:
+            # spawn: workers never inherit the server's threads, event loop or open sockets
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def close(self):   # Call on shutdown → stops the rendering processes
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
     # ---------------- CSV Export ----------------
     def export_to_csv(self, data: List[Dict], filename: str = "financial_data.csv") -> str:
         """
@@ -13,6 +346,8 @@ class ExportService:
         - filename: Optional (not directly used since we return the CSV string)
         """
         try:
+            import pandas as pd        # Pandas → for handling tabular data (imported on first use, not at startup)
+
             df = pd.DataFrame(data)    # Convert list of dicts into Pandas DataFrame
             buffer = io.StringIO()     # In-memory text buffer
             df.to_csv(buffer, index=False)  # Write CSV data into buffer
@@ -20,31 +355,113 @@ class ExportService:
         except Exception as e:
             raise Exception(f"Failed to export to CSV: {str(e)}")
 
+    # ---------------- Streaming Export ----------------
+    def iter_csv(self, rows: Iterable[Dict], columns: Optional[List[str]] = None,
+                 chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[str]:
+        """
+        Encode rows as CSV, yielding one string per `chunk_rows` rows (header first).
+        Rows are consumed lazily, so memory stays at one chunk whatever the row count;
+        pass a generator (e.g. a DB cursor) to avoid ever holding the full history.
+        - columns: column order; defaults to every key of the first chunk, in order of
+          appearance (missing values → empty; a later row with a new key → ValueError)
+        """
+        yield from _encode_chunks(_CSVEncoder(columns, chunk_rows), rows, chunk_rows)
+
+    def iter_columnar(self, rows: Iterable[Dict], export_format: str = "parquet",
+                      chunk_rows: int = EXPORT_CHUNK_ROWS, compression: str = "zstd",
+                      schema: Optional[Dict[str, str]] = None) -> Iterator[bytes]:
+        """
+        Encode rows as compressed Parquet or an Arrow IPC stream, yielding bytes as each
+        `chunk_rows` batch is written. Needs pyarrow (optional; only imported when a
+        columnar export is requested).
+        - schema: column → Arrow type name ("int64", "float64", "string", "date32", ...), in
+          column order. Without it, the schema is unified over every row of the first
+          batch; later batches must fit it (ValueError otherwise).
+        """
+        yield from _encode_chunks(_ColumnarEncoder(export_format, schema, chunk_rows, compression), rows, chunk_rows)
+
+    async def aiter_export(self, body: AsyncIterable[bytes], export_format: str = "csv",
+                           schema: Optional[Dict[str, str]] = None) -> AsyncIterator[Any]:
+        """
+        Export a request body of rows as it arrives: a JSON array of objects, or one
+        object per line (NDJSON). Parsing and encoding run in a worker thread, a body
+        chunk at a time, so neither the body nor the output is ever held whole.
+        - schema: as for iter_columnar; for CSV only its column order is used
+        """
+        parser = _JSONRowParser()
+        if export_format == "csv":
+            encoder = _CSVEncoder(list(schema) if schema else None)
+        else:
+            encoder = _ColumnarEncoder(export_format, schema)
+        async for data in body:
+            encoded = await asyncio.to_thread(lambda: encoder.write(parser.feed(data)))
+            if encoded:
+                yield encoded
+        yield await asyncio.to_thread(lambda: encoder.write(parser.close()) + encoder.close())
+
     # ---------------- Chart Generation ----------------
-    def generate_chart(self, data: List[Dict], x_key: str, y_key: str, title: str) -> str:
+    def chart_spec(self, data: List[Dict], x_key: str, y_key: str, title: str) -> Dict[str, Any]:
+        """Plot spec the frontend can draw directly (same content as the rendered chart, no image)."""
+        return {
+            "type": "line",
+            "title": title,
+            "x": {"key": x_key, "label": x_key, "values": [row[x_key] for row in data]},
+            "y": {"key": y_key, "label": y_key, "values": [row[y_key] for row in data]},
+            "marker": "o",
+            "grid": True,
+        }
+
+    def _prepare(self, data: List[Dict], x_key: str, y_key: str, title: str,
+                 image_format: str, size: Tuple[float, float]):
+        if image_format not in ("png", "svg"):
+            raise ValueError(f"Unknown chart format '{image_format}', expected one of {', '.join(CHART_FORMATS)}")
+        x = [row[x_key] for row in data]
+        y = [row[y_key] for row in data]
+        key = ChartCache.key(x, y, x_key, y_key, title, list(size), image_format)
+        return key, (x, y, x_key, y_key, title, tuple(size), image_format)
+
+    @staticmethod
+    def _encode(image: bytes, image_format: str) -> str:
+        if image_format == "svg":
+            return image.decode('utf-8')          # SVG is text → return the markup itself
+        image_base64 = base64.b64encode(image).decode('utf-8')
+        return f"data:image/png;base64,{image_base64}"  # Return embeddable image string
+
+    def generate_chart(self, data: List[Dict], x_key: str, y_key: str, title: str,
+                       image_format: str = "png", size: Tuple[float, float] = CHART_SIZE):
         """
-        Generate a line chart from given data and return as Base64-encoded PNG.
+        Generate a line chart from given data.
         - data: List of dicts
         - x_key: Key for x-axis values
         - y_key: Key for y-axis values
         - title: Title of the chart
+        - image_format: "png" → Base64 data URI, "svg" → SVG markup, "spec" → plot spec dict
+        Identical charts are served from the cache; others are rendered in the worker pool.
         """
         try:
-            df = pd.DataFrame(data)        # Convert list of dicts into DataFrame
-            plt.figure(figsize=(10, 6))    # Set chart size (10x6 inches)
-            plt.plot(df[x_key], df[y_key], marker='o')  # Line chart with markers
-            plt.title(title)               # Add chart title
-            plt.xlabel(x_key)              # Label x-axis
-            plt.ylabel(y_key)              # Label y-axis
-            plt.grid(True)                 # Add grid for readability
-            
-            buffer = io.BytesIO()          # Binary buffer for image
-            plt.savefig(buffer, format='png')  # Save chart into buffer as PNG
-            plt.close()                    # Close plot (frees memory)
-            buffer.seek(0)                 # Reset buffer pointer
-            image_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
-            return f"data:image/png;base64,{image_base64}"  # Return embeddable image string
+            if image_format == "spec":
+                return self.chart_spec(data, x_key, y_key, title)
+            key, arguments = self._prepare(data, x_key, y_key, title, image_format, size)
+            image = self.chart_cache.get(key)
+            if image is None:
+                pool = self._get_pool()
+                image = pool.submit(render_chart, *arguments).result() if pool else render_chart(*arguments)
+                self.chart_cache.set(key, image)
+            return self._encode(image, image_format)
         except Exception as e:
             raise Exception(f"Failed to generate chart: {str(e)}")
 
-
+    async def agenerate_chart(self, data: List[Dict], x_key: str, y_key: str, title: str,
+                              image_format: str = "png", size: Tuple[float, float] = CHART_SIZE):
+        """generate_chart for async endpoints: waits for the worker without blocking the event loop."""
+        try:
+            if image_format == "spec":
+                return self.chart_spec(data, x_key, y_key, title)
+            key, arguments = self._prepare(data, x_key, y_key, title, image_format, size)
+            image = self.chart_cache.get(key)
+            if image is None:
+                image = await asyncio.get_running_loop().run_in_executor(self._get_pool(), render_chart, *arguments)
+                self.chart_cache.set(key, image)
+            return self._encode(image, image_format)
+        except Exception as e:
+            raise Exception(f"Failed to generate chart: {str(e)}")
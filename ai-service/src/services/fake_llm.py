@@ -0,0 +1,40 @@
+import asyncio                     # asyncio → non-blocking sleeps that simulate network latency
+import time                        # time → blocking sleep for the synchronous invoke()
+from typing import AsyncIterator   # Typing helper for the token stream
+
+
+class FakeMessage:   # Mimics the message object LangChain chat models return (only .content is used)
+    def __init__(self, content: str):
+        self.content = content
+
+
+class FakeLLM:   # Local stand-in for ChatGoogleGenerativeAI with configurable latency (no network, no API key)
+    def __init__(self, response: str = "This is a placeholder answer from the fake LLM.",
+                 latency: float = 0.5, token_delay: float = 0.02):
+        # - response → text every call returns, streamed word by word
+        # - latency → seconds before the first token (simulates model "thinking" time)
+        # - token_delay → seconds between streamed tokens
+        self.response = response
+        self.latency = latency
+        self.token_delay = token_delay
+
+    def _tokens(self):
+        words = self.response.split(" ")
+        return [word if i == 0 else " " + word for i, word in enumerate(words)]   # Keep the spaces, like real token chunks
+
+    def invoke(self, prompt: str) -> FakeMessage:
+        # Blocking call → same signature as the LangChain model's .invoke()
+        time.sleep(self.latency + self.token_delay * len(self._tokens()))
+        return FakeMessage(self.response)
+
+    async def ainvoke(self, prompt: str) -> FakeMessage:
+        # Non-blocking call → same total time as invoke(), but yields the event loop while waiting
+        await asyncio.sleep(self.latency + self.token_delay * len(self._tokens()))
+        return FakeMessage(self.response)
+
+    async def astream(self, prompt: str) -> AsyncIterator[FakeMessage]:
+        # Token stream → one chunk per word, like LangChain's .astream()
+        await asyncio.sleep(self.latency)
+        for token in self._tokens():
+            yield FakeMessage(token)
+            await asyncio.sleep(self.token_delay)
@@ -1,5 +1,22 @@
-import requests                           # Import requests → used for making HTTP calls to external MCP service
+import asyncio                            # Import asyncio → single-flight futures and backoff sleeps
+import random                             # Import random → jitter for retry backoff
+import time                               # Import time → cache TTL and circuit breaker timing
+from collections import OrderedDict       # Import OrderedDict → LRU order of cached users
+from typing import TYPE_CHECKING, Any, Dict, Optional    # Import typing helpers
 from src.config.settings import Settings  # Import Settings → holds API keys, base URLs, etc. (though not directly used here)
+from src.utils.metrics import MCP_LATENCY  # Import MCP_LATENCY → upstream latency for /metrics
+
+# requests / aiohttp are imported where first used → neither costs anything at service startup
+if TYPE_CHECKING:
+    import aiohttp
+
+# Seconds to wait for an MCP response before giving up (sync and async connectors)
+REQUEST_TIMEOUT = 10
+
+# Async connector cache: users kept (least recently used are evicted first), and seconds after
+# a fetch that an entry may still be revalidated with its ETag; older entries are dropped and refetched
+DEFAULT_MAX_CACHED_USERS = 10_000
+DEFAULT_REVALIDATE_WINDOW = 600.0
 
 class MCPConnector:   # Connector class to interact with the MCP (some external financial data provider)
     def __init__(self, mcp_api_key: str, mcp_base_url: str):   # Constructor → needs API key + base URL
@@ -10,12 +27,18 @@ class MCPConnector:   # Connector class to interact with the MCP (some external
         # Define headers for authentication → Bearer token style
         self.headers = {"Authorization": f"Bearer {self.api_key}"}
 
+        # Reuse one session → keeps TCP/TLS connections alive between calls
+        import requests                   # Import requests → used for making HTTP calls to external MCP service
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+
     def fetch_user_financial_data(self, user_id: str):   # Method → fetches full financial data for a given user
+        import requests                   # Already loaded by __init__ → just a name lookup
         try:
             # Send GET request to MCP endpoint /users/{user_id}/financials
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/users/{user_id}/financials",
-                headers=self.headers
+                timeout=REQUEST_TIMEOUT
             )
             # Raise error if status code not 200 (4xx/5xx)
             response.raise_for_status()
@@ -41,3 +64,215 @@ class MCPConnector:   # Connector class to interact with the MCP (some external
             # If anything fails (fetching/parsing), raise exception with details
             raise Exception(f"Failed to fetch account balances: {str(e)}")
 
+
+
+class MCPError(Exception):   # Raised when MCP data can't be fetched (after retries, or while the circuit is open)
+    pass
+
+
+class CircuitBreaker:   # Stops calling MCP for a while after repeated failures, then lets one trial call through
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        # - failure_threshold → consecutive failures that open the circuit
+        # - reset_timeout → seconds the circuit stays open before a trial ("half-open") call is allowed
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True   # Exactly one trial call; everyone else keeps failing fast
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()   # Open (or re-open after a failed trial)
+
+
+class AsyncMCPConnector:   # Async MCP client: pooled keep-alive session, single-flight, TTL/ETag cache, retries, circuit breaker
+    def __init__(self, mcp_api_key: str, mcp_base_url: str, cache_ttl: float = 60.0,
+                 max_cached_users: int = DEFAULT_MAX_CACHED_USERS, revalidate_window: float = DEFAULT_REVALIDATE_WINDOW,
+                 max_retries: int = 3, backoff_base: float = 0.2, backoff_cap: float = 2.0,
+                 pool_size: int = 20, timeout: float = REQUEST_TIMEOUT,
+                 circuit_breaker: Optional[CircuitBreaker] = None):
+        # - cache_ttl → seconds a user's financials are served without asking MCP again;
+        #   after that they are revalidated with If-None-Match (a 304 costs no payload)
+        # - max_cached_users / revalidate_window → cache bound, and how long after its last fetch an
+        #   entry is still worth revalidating (older → dropped, the next call fetches in full)
+        # - max_retries → extra attempts on connection errors, timeouts, 429 and 5xx
+        # - backoff_base / backoff_cap → full-jitter exponential backoff between attempts
+        # - pool_size → keep-alive connections held open to MCP
+        self.base_url = mcp_base_url.rstrip("/")
+        self.headers = {"Authorization": f"Bearer {mcp_api_key}"}
+        self.cache_ttl = cache_ttl
+        self.max_cached_users = max_cached_users
+        self.revalidate_window = revalidate_window
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.breaker = circuit_breaker or CircuitBreaker()
+
+        self._session: "Optional[aiohttp.ClientSession]" = None   # Created on first use, inside the running event loop
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()   # user_id → {"data", "etag", "fetched_at"}, LRU first
+        self._in_flight: Dict[str, asyncio.Future] = {}         # user_id → upstream call other callers can await
+
+        # Counters → how much upstream traffic the cache and single-flight saved
+        self.upstream_calls = 0
+        self.cache_hits = 0
+        self.revalidations = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    # ---------------- Session ----------------
+    async def _get_session(self) -> "aiohttp.ClientSession":
+        import aiohttp                    # Import aiohttp → pooled async HTTP client with keep-alive
+
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=30),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def close(self):   # Call on shutdown → closes pooled connections
+        if self._session is not None:
+            await self._session.close()
+
+    # ---------------- Public API ----------------
+    async def fetch_user_financial_data(self, user_id: str) -> Dict[str, Any]:
+        """
+        Financial data for a user. Fresh cache entries are returned directly; concurrent
+        calls for the same user share a single upstream request.
+        """
+        cached = self._lookup(user_id)
+        if cached is not None and time.monotonic() - cached["fetched_at"] < self.cache_ttl:
+            self.cache_hits += 1
+            return cached["data"]
+
+        in_flight = self._in_flight.get(user_id)
+        if in_flight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(in_flight)   # Shield → one caller cancelling doesn't cancel the others' request
+
+        future = asyncio.ensure_future(self._fetch(user_id, cached))
+        self._in_flight[user_id] = future
+        future.add_done_callback(lambda _: self._in_flight.pop(user_id, None))
+        return await asyncio.shield(future)
+
+    async def fetch_account_balances(self, user_id: str) -> Dict[str, Any]:
+        # Same sections as MCPConnector.fetch_account_balances, served from the shared cache
+        data = await self.fetch_user_financial_data(user_id)
+        return {
+            "bank_accounts": data.get("bank_accounts", []),
+            "investments": data.get("investments", []),
+            "credit_cards": data.get("credit_cards", [])
+        }
+
+    def invalidate(self, user_id: str):   # Drop a user's cached financials (e.g. after they link a new account)
+        self._cache.pop(user_id, None)
+
+    # ---------------- Cache ----------------
+    def _lookup(self, user_id: str) -> Optional[Dict[str, Any]]:
+        cached = self._cache.get(user_id)
+        if cached is None:
+            return None
+        if time.monotonic() - cached["fetched_at"] >= self.revalidate_window:
+            del self._cache[user_id]          # Too old to revalidate → fetch in full
+            return None
+        self._cache.move_to_end(user_id)      # Mark as most recently used
+        return cached
+
+    def _store(self, user_id: str, entry: Dict[str, Any]):
+        self._cache.pop(user_id, None)
+        self._cache[user_id] = entry
+        cutoff = time.monotonic() - self.revalidate_window
+        while self._cache:                    # Drop old entries from the least recently used end
+            oldest = next(iter(self._cache.values()))
+            if len(self._cache) <= self.max_cached_users and oldest["fetched_at"] > cutoff:
+                break
+            self._cache.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "upstream_calls": self.upstream_calls,
+            "cache_hits": self.cache_hits,
+            "revalidations": self.revalidations,
+            "coalesced": self.coalesced,
+            "cached_users": len(self._cache),
+            "evictions": self.evictions,
+            "circuit": self.breaker.state,
+        }
+
+    # ---------------- Upstream call ----------------
+    async def _fetch(self, user_id: str, cached: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        import aiohttp
+
+        url = f"{self.base_url}/users/{user_id}/financials"
+        headers = {"If-None-Match": cached["etag"]} if cached and cached.get("etag") else {}
+        session = await self._get_session()
+        last_error: Optional[Exception] = None
+
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow():
+                raise MCPError(f"Failed to fetch MCP data: circuit open after {self.breaker.failures} failures")
+            if attempt:
+                # Full jitter: sleep uniformly in [0, min(cap, base * 2^attempt)]
+                await asyncio.sleep(random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt)))
+            start = time.perf_counter()
+            result = "error"                     # Metric label: ok / not_modified / client_error / error
+            try:
+                self.upstream_calls += 1
+                async with session.get(url, headers=headers) as response:
+                    if response.status == 304 and cached is not None:
+                        # Unchanged upstream → keep the cached payload, restart its TTL
+                        self.breaker.record_success()
+                        self.revalidations += 1
+                        cached["fetched_at"] = time.monotonic()
+                        self._store(user_id, cached)   # Back in the cache even if evicted while the request was out
+                        result = "not_modified"
+                        return cached["data"]
+                    if response.status == 429 or response.status >= 500:
+                        raise aiohttp.ClientResponseError(
+                            response.request_info, response.history, status=response.status, message=response.reason or ""
+                        )
+                    if response.status >= 400:
+                        # Client errors (unknown user, bad key) won't succeed on retry and say nothing about MCP health
+                        self.breaker.record_success()
+                        result = "client_error"
+                        raise MCPError(f"Failed to fetch MCP data: HTTP {response.status}")
+                    data = await response.json()
+                    self.breaker.record_success()
+                    self._store(user_id, {"data": data, "etag": response.headers.get("ETag"), "fetched_at": time.monotonic()})
+                    result = "ok"
+                    return data
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.breaker.record_failure()
+                last_error = e
+            finally:
+                MCP_LATENCY.labels(result=result).observe(time.perf_counter() - start)
+
+        raise MCPError(f"Failed to fetch MCP data after {self.max_retries + 1} attempts: {str(last_error)}")
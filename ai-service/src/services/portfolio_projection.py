@@ -0,0 +1,184 @@
+import secrets                                              # secrets → fresh seed for scenarios saved without one
+import time                                                 # time → simulation duration for /metrics
+import numpy as np                                          # NumPy → vectorized random draws and linear algebra
+from typing import Dict, List, Optional, Tuple              # Typing helpers for return values
+from src.models.simulation_models import PortfolioProjectionInput, SimulationResult  # Input/output schemas
+from src.services.scenario_store import ScenarioStore, StoredScenario, input_hash  # Saved scenarios (inputs, seed, float32 bands)
+from src.utils.metrics import record_simulation             # Paths simulated / time spent, for /metrics
+
+# Bump whenever a change alters the numbers produced for the same inputs and seed → saved scenarios are recomputed
+ENGINE_VERSION = "1"
+
+# Typical annual volatility (%) per asset class, used when the input doesn't give one
+DEFAULT_VOLATILITIES = {
+    "equity": 18.0,
+    "stocks": 18.0,
+    "mutual_funds": 15.0,
+    "bonds": 5.0,
+    "debt": 5.0,
+    "gold": 15.0,
+    "real_estate": 12.0,
+    "cash": 1.0,
+    "fd": 0.5,
+}
+FALLBACK_VOLATILITY = 10.0
+
+# Upper bound on shocks held in memory at once (paths × months × assets); ~8 MB of float64
+CHUNK_ELEMENTS = 1 << 20
+
+# Most negative eigenvalue (per asset) still treated as round-off of a positive semi-definite correlation matrix
+PSD_TOLERANCE = 1e-10
+
+# Percentile bands reported for every month
+PERCENTILES = (10, 50, 90)
+
+
+class PortfolioProjectionEngine:   # Correlated multi-asset Monte Carlo projection
+    def __init__(self, chunk_elements: int = CHUNK_ELEMENTS):
+        self.chunk_elements = chunk_elements
+
+    # ---------------- Covariance ----------------
+    def cholesky_factor(self, assets: List[str], projection: PortfolioProjectionInput) -> np.ndarray:
+        """
+        Factor L with L @ L.T equal to the monthly return covariance matrix
+        (lower-triangular Cholesky, or an eigen factorization when the matrix is singular).
+        - volatilities come from the input, else DEFAULT_VOLATILITIES by asset name
+        - correlations are symmetrised; unspecified pairs are uncorrelated
+        """
+        volatilities = np.array([
+            projection.annual_volatilities.get(asset, DEFAULT_VOLATILITIES.get(asset.lower(), FALLBACK_VOLATILITY))
+            for asset in assets
+        ]) / 100 / np.sqrt(12)                     # Annual % → monthly decimal sigma
+
+        correlation = np.eye(len(assets))          # Start from independent assets
+        index = {asset: i for i, asset in enumerate(assets)}
+        for asset, row in projection.correlations.items():
+            for other, rho in row.items():
+                if asset != other:
+                    correlation[index[asset], index[other]] = correlation[index[other], index[asset]] = rho
+
+        try:
+            # Cholesky of the correlation matrix scaled by each sigma: L Lᵀ = diag(σ) C diag(σ) = covariance
+            return volatilities[:, None] * np.linalg.cholesky(correlation)
+        except np.linalg.LinAlgError:
+            pass
+
+        # Positive semi-definite but singular (e.g. a correlation of exactly 1) → Cholesky fails on a zero
+        # pivot. Eigen factorization instead: C = V Λ Vᵀ, so F = V √Λ also gives F Fᵀ = C (not triangular,
+        # which the simulation doesn't need). Round-off can leave tiny negative eigenvalues → clipped to 0
+        eigenvalues, eigenvectors = np.linalg.eigh(correlation)
+        if eigenvalues.min() < -PSD_TOLERANCE * len(assets):
+            raise ValueError("Correlation matrix is not positive semi-definite (correlations are inconsistent or outside [-1, 1])")
+        return volatilities[:, None] * (eigenvectors * np.sqrt(np.clip(eigenvalues, 0, None)))
+
+    # ---------------- Projection ----------------
+    def project(self, projection: PortfolioProjectionInput, scenario_prefix: Optional[str] = None) -> Dict[str, SimulationResult]:
+        """
+        Simulate all asset classes together and return one SimulationResult per
+        asset plus one for the "total" portfolio, each with monthly p10/p50/p90 bands.
+        """
+        series, bands = self.simulate_bands(projection, projection.seed)
+        return self.results(scenario_prefix or projection.user_id, series, bands)
+
+    def simulate_bands(self, projection: PortfolioProjectionInput, seed: Optional[int]) -> Tuple[List[str], np.ndarray]:
+        """
+        Series names (assets + "total") and their percentile bands, shaped
+        (len(PERCENTILES) × months × series).
+
+        Paths advance in (months × assets × paths) blocks of at most `chunk_elements`
+        shocks. Within a block each asset compounds with a cumulative product; at
+        every rebalance date the total is redistributed to the target allocation.
+        """
+        assets = list(projection.allocation)
+        missing = [asset for asset in assets if asset not in projection.annual_rates]
+        if missing:
+            raise ValueError(f"No annual rate given for {', '.join(missing)}")
+
+        start = time.perf_counter()
+        paths = projection.simulations
+        months = projection.tenure_years * 12
+        n_assets = len(assets)
+        weights = np.array([projection.allocation[asset] for asset in assets]) / 100
+        drift = 1 + np.array([projection.annual_rates[asset] for asset in assets]) / 100 / 12   # Mean gross monthly return
+        factor = self.cholesky_factor(assets, projection)
+        rebalance = projection.rebalance_every_months
+        rng = np.random.Generator(np.random.SFC64(seed))
+
+        # Layout is (months × assets × paths) so every per-path operation runs over contiguous memory
+        values = np.outer(projection.initial_investment * weights, np.ones(paths))   # (assets × paths) current holdings
+        bands = np.empty((len(PERCENTILES), months, n_assets + 1))                 # percentile × month × (assets + total)
+        month_block = max(1, self.chunk_elements // (paths * n_assets))
+
+        month = 0
+        while month < months:
+            width = min(month_block, months - month)
+            if rebalance:
+                width = min(width, rebalance - month % rebalance)   # Never cross a rebalance date inside a block
+
+            # Correlated gross returns: L × independent normals, shifted by each asset's drift
+            growth = factor @ rng.standard_normal((width, n_assets, paths))
+            growth += drift[:, None]
+
+            # Holdings at every month of the block, with the portfolio total as an extra "asset"
+            block = np.empty((width, n_assets + 1, paths))
+            np.cumprod(growth, axis=0, out=block[:, :-1])
+            block[:, :-1] *= values
+            np.sum(block[:, :-1], axis=1, out=block[:, -1])
+
+            values = block[-1, :-1].copy()
+            if rebalance and (month + width) % rebalance == 0:
+                values = block[-1, -1] * weights[:, None]           # Reset every path to the target weights
+
+            bands[:, month:month + width] = self._percentiles(block)
+            month += width
+        record_simulation("portfolio", paths, time.perf_counter() - start)
+        return assets + ["total"], bands
+
+    def results(self, prefix: str, series: List[str], bands: np.ndarray) -> Dict[str, SimulationResult]:
+        return {name: self._result(f"{prefix}-{name}", bands[:, :, i]) for i, name in enumerate(series)}
+
+    # ---------------- Saved scenarios ----------------
+    def project_saved(self, projection: PortfolioProjectionInput, store: ScenarioStore) -> Tuple[StoredScenario, bool]:
+        """
+        Projection for a saved scenario (projection.scenario_id): the stored
+        result is returned as long as the inputs and ENGINE_VERSION are unchanged,
+        so reopening a scenario shows the same numbers. Otherwise it is simulated
+        (with the request's seed, or a fresh one that is then kept) and saved.
+        Returns the scenario and whether it was recomputed.
+        """
+        inputs = projection.model_dump(exclude={"user_id", "scenario_id", "seed"})   # Everything that shapes the numbers, bar the seed
+        stored = store.get(projection.user_id, projection.scenario_id)
+        if stored is not None and stored.matches(input_hash(inputs), ENGINE_VERSION, projection.seed):
+            return stored, False
+        if stored is not None:
+            store.mark_stale()
+
+        seed = projection.seed if projection.seed is not None else secrets.randbits(63)
+        series, bands = self.simulate_bands(projection, seed)
+        saved = store.put(projection.user_id, projection.scenario_id, inputs, seed, ENGINE_VERSION,
+                          series, list(PERCENTILES), bands)
+        return saved, True
+
+    def _percentiles(self, block: np.ndarray) -> np.ndarray:
+        """
+        PERCENTILES over the last (paths) axis, linearly interpolated like np.percentile.
+        Partitions `block` in place: one O(n) selection pass instead of a full sort per month.
+        """
+        positions = np.array(PERCENTILES) / 100 * (block.shape[-1] - 1)
+        lower, upper = np.floor(positions).astype(int), np.ceil(positions).astype(int)
+        block.partition(np.unique(np.concatenate([lower, upper])), axis=-1)
+        fraction = positions - lower
+        low_values = np.moveaxis(block[..., lower], -1, 0)
+        high_values = np.moveaxis(block[..., upper], -1, 0)
+        return low_values + (high_values - low_values) * fraction[:, None, None]
+
+    def _result(self, scenario_id: str, bands: np.ndarray) -> SimulationResult:
+        low, median, high = bands
+        return SimulationResult(
+            scenario_id=scenario_id,
+            future_value=max(0.0, float(median[-1])),   # Median terminal value
+            chart_data=[
+                {"month": m + 1, "p10": float(low[m]), "p50": float(median[m]), "p90": float(high[m])}
+                for m in range(len(median))
+            ],
+        )
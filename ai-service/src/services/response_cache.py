@@ -0,0 +1,213 @@
+import hashlib                                 # hashlib → stable hash of the rendered context
+import re                                      # re → query normalization and tokenization
+import time                                    # time → TTL bookkeeping
+import zlib                                    # zlib.crc32 → feature hashing that is stable across processes
+from collections import OrderedDict            # Ordered dict → LRU order of cached responses
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple   # Typing helpers
+
+import numpy as np                             # NumPy → embedding vectors and cosine similarity
+
+# Cache limits: responses kept, seconds each response stays valid, and queries held in the similarity index
+DEFAULT_MAX_ENTRIES = 2048
+DEFAULT_TTL_SECONDS = 3600
+DEFAULT_MAX_INDEX_ENTRIES = 4096
+
+# Similarity lookup: embedding width, and the cosine similarity a cached query must reach to be reused when
+# the lookup is switched on (off by default → exact matches only). Character trigrams rate opposite questions
+# as close ("should i increase" vs "decrease my sip contribution this year": 0.89), so on top of the threshold a similar query must also
+# have the same content words; the similarity then only absorbs word order, filler words and plurals
+EMBEDDING_DIMENSIONS = 512
+DEFAULT_SIMILARITY_THRESHOLD = None
+RECOMMENDED_SIMILARITY_THRESHOLD = 0.95
+
+# Filler words left out of embeddings, so "should i increase my sip" and "increase sip" embed alike
+STOPWORDS = frozenset("a an the i me my to is it of for should can do will be am on in and please".split())
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace, so trivial rewordings share a cache key."""
+    return " ".join(re.findall(r"[a-z0-9.]+", query.lower())).strip(".")
+
+
+def context_hash(context: str) -> str:
+    """SHA-256 of the rendered context; a cached answer is only reused for the same financial data."""
+    return hashlib.sha256(context.encode("utf-8")).hexdigest()
+
+
+def terms(text: str) -> List[str]:
+    """Words of a normalized query other than STOPWORDS, in order, with a plural "s" dropped ("sips" → "sip")."""
+    return [
+        word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word
+        for word in text.split() if word not in STOPWORDS
+    ]
+
+
+def content_words(text: str) -> FrozenSet[str]:
+    """
+    The set of terms of a query. Similar queries only share an answer when these are the same,
+    so "increase" / "decrease" / "stop my sip" or "50L" / "60L" never do.
+    """
+    return frozenset(terms(text))
+
+
+def embed(text: str, dimensions: int = EMBEDDING_DIMENSIONS) -> np.ndarray:
+    """
+    Local, model-free embedding: terms (weight 1) and their character
+    trigrams (weight 0.5) hashed into a signed, L2-normalized vector. Cheap enough
+    to run on every query; it matches rewordings, not synonyms.
+    """
+    words = terms(text)
+    padded = f" {' '.join(words)} "
+    features = [(word, 1.0) for word in words] + [(padded[i:i + 3], 0.5) for i in range(len(padded) - 2)]
+    vector = np.zeros(dimensions)
+    for feature, weight in features:
+        h = zlib.crc32(feature.encode("utf-8"))
+        vector[h % dimensions] += weight if (h >> 31) & 1 else -weight   # Top bit picks the sign, limiting collision bias
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class ResponseCache:   # LLM response cache: exact (query, context) lookups plus optional similarity lookups
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 similarity_threshold: Optional[float] = DEFAULT_SIMILARITY_THRESHOLD,
+                 max_index_entries: int = DEFAULT_MAX_INDEX_ENTRIES):
+        # - similarity_threshold → None (default) disables the similarity lookup (exact matches only);
+        #   RECOMMENDED_SIMILARITY_THRESHOLD when switching it on
+        # - max_index_entries → bound on queries held in the embedding index (memory: entries × 512 × 8 bytes)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+
+        # (normalized query, context hash) → (response, user_id, expires_at, index slot or -1)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[str, Optional[str], float, int]]" = OrderedDict()
+        self._by_user: Dict[Optional[str], Set[Tuple[str, str]]] = {}
+
+        # Embedding index: one row per slot; a slot's context id must match for a similarity hit
+        self._vectors = np.zeros((max_index_entries, EMBEDDING_DIMENSIONS))
+        self._slot_context = np.zeros(max_index_entries, dtype=np.uint64)
+        self._slot_used = np.zeros(max_index_entries, dtype=bool)
+        self._slot_keys: Dict[int, Tuple[str, str]] = {}
+        self._slot_words: Dict[int, FrozenSet[str]] = {}
+
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    # ---------------- Lookup ----------------
+    def get(self, query: str, context: str) -> Optional[str]:
+        """Cached response for this query and context, or None. Exact match first, then the most similar query."""
+        key = (normalize_query(query), context_hash(context))
+        response = self._lookup(key)
+        if response is not None:
+            self.hits += 1
+            return response
+
+        if self.similarity_threshold is not None and self._slot_used.any():
+            # Cosine similarity against every indexed query with the same context
+            candidates = np.flatnonzero(self._slot_used & (self._slot_context == self._context_id(key[1])))
+            if len(candidates):
+                scores = self._vectors[candidates] @ embed(key[0])
+                words = content_words(key[0])
+                for best in np.argsort(-scores):   # Most similar first; stop below the threshold
+                    if scores[best] < self.similarity_threshold:
+                        break
+                    slot = int(candidates[best])
+                    if self._slot_words[slot] != words:
+                        continue                   # A content word (or number) differs → a different question
+                    response = self._lookup(self._slot_keys[slot])
+                    if response is not None:
+                        self.semantic_hits += 1
+                        return response
+
+        self.misses += 1
+        return None
+
+    def _lookup(self, key: Tuple[str, str]) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[2] <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)   # Mark as most recently used
+        return entry[0]
+
+    # ---------------- Storage ----------------
+    def set(self, query: str, context: str, response: str, user_id: Optional[str] = None):
+        key = (normalize_query(query), context_hash(context))
+        if key in self._entries:
+            self._remove(key)
+
+        slot = -1
+        if self.similarity_threshold is not None:
+            slot = self._free_slot()
+            self._vectors[slot] = embed(key[0])
+            self._slot_context[slot] = self._context_id(key[1])
+            self._slot_used[slot] = True
+            self._slot_keys[slot] = key
+            self._slot_words[slot] = content_words(key[0])
+
+        self._entries[key] = (response, user_id, time.monotonic() + self.ttl_seconds, slot)
+        self._by_user.setdefault(user_id, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))   # Least recently used
+            self.evictions += 1
+
+    def _free_slot(self) -> int:
+        free = np.flatnonzero(~self._slot_used)
+        if len(free):
+            return int(free[0])
+        # Index full → drop the least recently used response that owns a slot
+        for key, entry in self._entries.items():
+            if entry[3] >= 0:
+                self._remove(key)
+                self.evictions += 1
+                return entry[3]
+        raise RuntimeError("Similarity index has no slots")   # Only reachable with max_index_entries == 0
+
+    def _remove(self, key: Tuple[str, str]):
+        _, user_id, _, slot = self._entries.pop(key)
+        if slot >= 0:
+            self._slot_used[slot] = False
+            del self._slot_keys[slot]
+            del self._slot_words[slot]
+        keys = self._by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[user_id]
+
+    @staticmethod
+    def _context_id(digest: str) -> int:
+        return int(digest[:16], 16)   # First 64 bits of the context hash, to compare slots in one vectorized pass
+
+    # ---------------- Invalidation & metrics ----------------
+    def invalidate_user(self, user_id: str) -> int:
+        """Drop every response cached for this user (call when their financial data changes)."""
+        keys = list(self._by_user.get(user_id, ()))
+        for key in keys:
+            self._remove(key)
+        self.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self):
+        for key in list(self._entries):
+            self._remove(key)
+
+    def stats(self):
+        lookups = self.hits + self.semantic_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "indexed": int(self._slot_used.sum()),
+            "hits": self.hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.semantic_hits) / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,262 @@
+import hashlib                                 # hashlib → file names and input fingerprints
+import json                                    # json → canonical inputs and the record header
+import os                                      # os → atomic replace, file sizes and access times
+import struct                                  # struct → fixed-size header length prefix
+import threading                               # Lock → index and byte accounting shared by request threads
+import time                                    # time → created_at of each record
+from collections import OrderedDict            # Ordered dict → LRU order of stored scenarios
+from dataclasses import dataclass              # dataclass → StoredScenario record
+from typing import Any, Dict, List, Optional   # Typing helpers
+
+import numpy as np                             # NumPy → float32 percentile arrays, memory-mapped on read
+
+# Store limits: total bytes kept on disk before the least recently used scenarios are evicted
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Other worker processes write to the same directory → writes re-read the byte total from it at least this often
+RESCAN_SECONDS = 5.0
+
+# Temporary files left by a writer that died mid-write are removed once this old
+STALE_PARTIAL_SECONDS = 600
+
+# Record layout: MAGIC, 4-byte header length, JSON header, padding, float32 array (C order, little-endian)
+MAGIC = b"FSSC"
+PREFIX = struct.Struct("<4sI")
+ALIGNMENT = 64                                 # Array data starts on a 64-byte boundary → aligned memory-mapped reads
+DTYPE = np.dtype("<f4")
+
+
+def input_hash(inputs: Dict[str, Any]) -> str:
+    """SHA-256 of the canonical JSON of a scenario's inputs (sorted keys, no whitespace)."""
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+@dataclass
+class StoredScenario:
+    scenario_id: str
+    user_id: str
+    seed: int
+    input_hash: str
+    engine_version: str
+    inputs: Dict[str, Any]
+    series: List[str]                          # Names along the last axis of `bands` (assets + "total")
+    percentiles: List[int]                     # Percentiles along the first axis of `bands`
+    summary: Dict[str, Dict[str, float]]       # Per series: terminal value at each percentile (e.g. {"p50": ...})
+    bands: np.ndarray                          # float32, percentile × month × series; read-only (memory map once read back)
+    created_at: float
+
+    def matches(self, inputs_hash: str, engine_version: str, seed: Optional[int]) -> bool:
+        # Still valid for a request when inputs and engine are unchanged (and no different seed was asked for)
+        return (self.input_hash == inputs_hash and self.engine_version == engine_version
+                and (seed is None or seed == self.seed))
+
+
+class ScenarioStore:   # Saved simulation results on local disk: one memory-mappable file per (user, scenario_id)
+    """
+    Each scenario is a single file named after a hash of (user_id, scenario_id),
+    so a lookup is one open() with no index to search. The file holds a JSON
+    header (inputs, seed, engine version, summary) followed by the percentile
+    bands as float32, which are memory-mapped on read instead of copied.
+
+    Files are written to a temporary name and renamed into place, so readers
+    (in this or another worker process) never see a partial record. A record
+    that is corrupt anyway (disk full, truncated copy, edited by hand) reads
+    as missing and is removed.
+
+    An in-memory LRU index keeps the total size under `max_bytes`. Worker
+    processes sharing the directory each keep their own index, so it is
+    rebuilt from the directory (sizes, and access times for the LRU order) on
+    startup, every RESCAN_SECONDS and before evicting: the budget covers every
+    worker's records, not just this one's.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._sizes: "OrderedDict[str, int]" = OrderedDict()   # file name → bytes, least recently used first
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+        self.corrupt = 0
+        self._scanned_at = 0.0
+        with self._lock:
+            self._scan()
+
+    def _scan(self):   # Caller holds the lock
+        """Rebuild the index from the directory: every worker's records, least recently used first."""
+        records = []
+        now = time.time()
+        for entry in os.scandir(self.directory):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:          # Evicted or replaced by another worker meanwhile
+                continue
+            if entry.name.endswith(".scn"):
+                records.append((stat.st_mtime, entry.name, stat.st_size))
+            elif entry.name.endswith(".partial") and now - stat.st_mtime > STALE_PARTIAL_SECONDS:
+                self._remove(entry.name)
+        self._sizes = OrderedDict((name, size) for _, name, size in sorted(records))
+        self.bytes = sum(self._sizes.values())
+        self._scanned_at = time.monotonic()
+
+    @staticmethod
+    def _file_name(user_id: str, scenario_id: str) -> str:
+        return hashlib.sha256(f"{user_id}\0{scenario_id}".encode()).hexdigest()[:32] + ".scn"
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    # ---------------- Read ----------------
+    def get(self, user_id: str, scenario_id: str) -> Optional[StoredScenario]:
+        name = self._file_name(user_id, scenario_id)
+        scenario = self._read(name)
+        with self._lock:
+            if scenario is None:
+                self.misses += 1
+                return None
+            if name in self._sizes:
+                self._sizes.move_to_end(name)
+            self.hits += 1
+        try:
+            os.utime(self._path(name))         # Refresh the access time → LRU order survives restarts (and is shared by workers)
+        except FileNotFoundError:
+            pass                               # Evicted by another worker meanwhile; the mapped bands stay readable
+        return scenario
+
+    def _read(self, name: str) -> Optional[StoredScenario]:
+        path = self._path(name)
+        identity = None
+        try:
+            with open(path, "rb") as f:
+                stat = os.fstat(f.fileno())
+                identity = (stat.st_dev, stat.st_ino)
+                magic, header_length = PREFIX.unpack(f.read(PREFIX.size))
+                if magic != MAGIC:
+                    raise ValueError(f"{path} is not a scenario record")
+                header = json.loads(f.read(header_length))
+            # Zero-copy: the bands stay in the page cache and are mapped, not read into a new buffer
+            # (a file shorter than the header says fails here rather than on first access)
+            bands = np.memmap(path, dtype=DTYPE, mode="r", offset=header["data_offset"], shape=tuple(header["shape"]))
+            return self._scenario(header, bands)
+        except FileNotFoundError:
+            return None
+        except (struct.error, ValueError, KeyError, TypeError):
+            # Corrupt or truncated (json and UTF-8 errors are ValueErrors) → missing; drop it unless
+            # another worker has meanwhile replaced it with a new record
+            try:
+                stat = os.stat(path)
+                if (stat.st_dev, stat.st_ino) == identity:
+                    os.remove(path)
+            except FileNotFoundError:
+                pass
+            with self._lock:
+                self.corrupt += 1
+                self.bytes -= self._sizes.pop(name, 0)
+            return None
+
+    @staticmethod
+    def _scenario(header: Dict[str, Any], bands: np.ndarray) -> StoredScenario:
+        return StoredScenario(
+            scenario_id=header["scenario_id"],
+            user_id=header["user_id"],
+            seed=header["seed"],
+            input_hash=header["input_hash"],
+            engine_version=header["engine_version"],
+            inputs=header["inputs"],
+            series=header["series"],
+            percentiles=header["percentiles"],
+            summary=header["summary"],
+            bands=bands,
+            created_at=header["created_at"],
+        )
+
+    # ---------------- Write ----------------
+    def put(self, user_id: str, scenario_id: str, inputs: Dict[str, Any], seed: int, engine_version: str,
+            series: List[str], percentiles: List[int], bands: np.ndarray) -> StoredScenario:
+        """
+        Save a scenario (replacing any previous version) and return it. The result is built
+        from the arrays in hand rather than read back, so it doesn't depend on the file
+        surviving until then (another worker may evict or replace it right away).
+        """
+        bands = np.ascontiguousarray(bands, dtype=DTYPE)
+        header = {
+            "scenario_id": scenario_id,
+            "user_id": user_id,
+            "seed": seed,
+            "input_hash": input_hash(inputs),
+            "engine_version": engine_version,
+            "inputs": inputs,
+            "series": series,
+            "percentiles": list(percentiles),
+            "summary": {
+                name: {f"p{p}": float(bands[j, -1, i]) for j, p in enumerate(percentiles)}
+                for i, name in enumerate(series)
+            },
+            "shape": list(bands.shape),
+            "created_at": time.time(),
+        }
+        # The data offset depends on the header's own length → size the header with a placeholder first
+        header["data_offset"] = 0
+        header_length = len(json.dumps(header).encode()) + 16
+        data_offset = -(-(PREFIX.size + header_length) // ALIGNMENT) * ALIGNMENT
+        header["data_offset"] = data_offset
+        encoded = json.dumps(header).encode().ljust(data_offset - PREFIX.size)
+
+        name = self._file_name(user_id, scenario_id)
+        path = self._path(name)
+        partial = f"{path}.{os.getpid()}.{threading.get_ident()}.partial"
+        with open(partial, "wb") as f:
+            f.write(PREFIX.pack(MAGIC, len(encoded)))
+            f.write(encoded)
+            f.write(bands.tobytes())
+        os.replace(partial, path)              # Atomic → readers see the old record or the new one
+        size = os.path.getsize(path)
+
+        with self._lock:
+            self.bytes += size - self._sizes.pop(name, 0)
+            self._sizes[name] = size
+            if self.bytes > self.max_bytes or time.monotonic() - self._scanned_at > RESCAN_SECONDS:
+                self._scan()                   # Count (and order) what the other workers wrote too
+                if name in self._sizes:
+                    self._sizes.move_to_end(name)
+                self._evict()
+        view = bands.view()
+        view.flags.writeable = False           # Same contract as a record read from disk
+        return self._scenario(header, view)
+
+    def mark_stale(self):
+        """Count a stored scenario found out of date (inputs or engine version changed)."""
+        with self._lock:
+            self.stale += 1
+
+    def delete(self, user_id: str, scenario_id: str) -> bool:
+        name = self._file_name(user_id, scenario_id)
+        try:
+            os.remove(self._path(name))
+        except FileNotFoundError:
+            return False
+        with self._lock:
+            self.bytes -= self._sizes.pop(name, 0)
+        return True
+
+    def _evict(self):   # Caller holds the lock
+        while self.bytes > self.max_bytes and len(self._sizes) > 1:   # Never evict the record just written
+            name, size = self._sizes.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
+            self._remove(name)                 # Readers that already mapped it keep their view (POSIX)
+
+    def _remove(self, name: str):
+        try:
+            os.remove(self._path(name))
+        except FileNotFoundError:              # Already removed by another worker
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {"scenarios": len(self._sizes), "bytes": self.bytes, "max_bytes": self.max_bytes,
+                "hits": self.hits, "misses": self.misses, "stale": self.stale, "evictions": self.evictions,
+                "corrupt": self.corrupt}
@@ -0,0 +1,175 @@
+import threading                                    # Lock → the grid cache is shared by request threads
+import numpy as np                                  # NumPy → broadcasting over the whole grid at once
+from collections import OrderedDict                 # Ordered dict → LRU of per-user grids for incremental mode
+from typing import Dict, List, Optional, Tuple      # Typing helpers
+from src.models.simulation_models import WHAT_IF_ADJUSTMENTS, SimulationResult, WhatIfGridInput, WhatIfGridResult
+from src.utils.calculations import months_to_goal, sip_future_value   # Vectorized (ufunc-style) formulas
+
+# Largest grid evaluated in one request, and largest one returned with per-point summaries
+MAX_GRID_POINTS = 1_000_000
+MAX_POINT_SUMMARIES = 10_000
+
+# Memory for users' last grids, kept for incremental re-evaluation (least recently used evicted first);
+# one maximal grid is 8 MB per tensor, so the count of users kept depends on their grid sizes
+MAX_CACHED_GRID_BYTES = 64 * 1024 * 1024
+
+
+class WhatIfEngine:   # Evaluates what-if adjustment grids, optionally reusing the previous grid
+    def __init__(self, max_cached_bytes: int = MAX_CACHED_GRID_BYTES):
+        self.max_cached_bytes = max_cached_bytes
+        # user_id → (base inputs, axes, future value tensor, timeline tensor, bytes)
+        self._grids: "OrderedDict[str, Tuple[tuple, Dict[str, np.ndarray], np.ndarray, Optional[np.ndarray], int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.cached_bytes = 0
+        self.evictions = 0
+
+    # ---------------- Grid evaluation ----------------
+    def _evaluate(self, scenario: WhatIfGridInput, axes: Dict[str, np.ndarray]):
+        """
+        Evaluate every combination of `axes` in one broadcasted call.
+        Axis i is reshaped to (1, ..., len, ..., 1) so the formulas broadcast to the full grid.
+        """
+        ndim = len(axes)
+        adjustment = {name: scenario.adjustments.get(name, 0.0) for name in WHAT_IF_ADJUSTMENTS}
+        for i, (name, values) in enumerate(axes.items()):
+            shape = [1] * ndim
+            shape[i] = len(values)
+            adjustment[name] = values.reshape(shape)        # Swept values replace the fixed adjustment
+
+        monthly = scenario.monthly_investment + adjustment["extra_investment"]
+        rate = scenario.annual_rate + adjustment["rate_increase"]
+        tenure = scenario.tenure_years + adjustment["tenure_increase"]
+        shape = tuple(len(values) for values in axes.values())
+
+        future_values = np.broadcast_to(sip_future_value(monthly, rate, tenure), shape)
+        timeline = None
+        if scenario.target_amount is not None:
+            timeline = np.broadcast_to(months_to_goal(scenario.target_amount, monthly, rate), shape)
+        return future_values, timeline
+
+    def _base_key(self, scenario: WhatIfGridInput) -> tuple:
+        """Everything except the swept ranges; the cached grid is only reusable if this is unchanged."""
+        return (
+            scenario.monthly_investment, scenario.annual_rate, scenario.tenure_years,
+            tuple(sorted(scenario.adjustments.items())), scenario.target_amount,
+        )
+
+    def _incremental(self, scenario: WhatIfGridInput, axes: Dict[str, np.ndarray]):
+        """
+        Reuse the user's previous grid when only one axis changed: slices for values that
+        were already on that axis are copied, and only the new values are evaluated.
+        Returns None when the previous grid can't be reused.
+        """
+        with self._lock:
+            cached = self._grids.get(scenario.user_id)
+        if cached is None:
+            return None
+        base, old_axes, old_values, old_timeline, _ = cached
+        if base != self._base_key(scenario) or list(old_axes) != list(axes):
+            return None
+
+        changed = [name for name in axes if not np.array_equal(axes[name], old_axes[name])]
+        if not changed:
+            return old_values, old_timeline, 0
+        if len(changed) > 1:
+            return None
+
+        name = changed[0]
+        k = list(axes).index(name)
+        old_index = {value: i for i, value in enumerate(old_axes[name].tolist())}
+        positions = [old_index.get(value, -1) for value in axes[name].tolist()]
+        fresh = [i for i, position in enumerate(positions) if position < 0]
+
+        # Evaluate only the new slice(s) along the changed axis
+        sub_axes = dict(axes)
+        sub_axes[name] = axes[name][fresh]
+        fresh_values, fresh_timeline = self._evaluate(scenario, sub_axes) if fresh else (None, None)
+
+        def assemble(old: Optional[np.ndarray], new: Optional[np.ndarray]):
+            if old is None:
+                return None
+            shape = list(old.shape)
+            shape[k] = len(positions)
+            out = np.empty(shape, dtype=old.dtype)
+            reused = [i for i, position in enumerate(positions) if position >= 0]
+            moved = np.moveaxis(out, k, 0)                   # View: slices along the changed axis come first
+            if reused:
+                moved[reused] = np.moveaxis(old, k, 0)[[positions[i] for i in reused]]
+            if fresh:
+                moved[fresh] = np.moveaxis(new, k, 0)
+            return out
+
+        recomputed = int(np.prod([len(values) for values in sub_axes.values()])) if fresh else 0
+        return assemble(old_values, fresh_values), assemble(old_timeline, fresh_timeline), recomputed
+
+    # ---------------- Public API ----------------
+    def run(self, scenario: WhatIfGridInput) -> WhatIfGridResult:
+        """
+        Evaluate the Cartesian grid of `scenario.ranges` and return the dense tensors plus
+        (optionally) one SimulationResult per point. In incremental mode the user's previous
+        grid is reused when only one axis changed since the last request.
+        """
+        unknown = set(scenario.adjustments) - set(WHAT_IF_ADJUSTMENTS)
+        if unknown:
+            raise ValueError(f"Unknown adjustment(s): {', '.join(sorted(unknown))}")
+
+        axes = {name: np.asarray(values, dtype=np.float64) for name, values in scenario.ranges.items()}
+        size = int(np.prod([len(values) for values in axes.values()]))
+        if size > MAX_GRID_POINTS:
+            raise ValueError(f"Grid has {size} points, more than the {MAX_GRID_POINTS} allowed")
+        if scenario.include_points and size > MAX_POINT_SUMMARIES:
+            raise ValueError(f"Per-point summaries are limited to {MAX_POINT_SUMMARIES} points; set include_points to false")
+
+        reused = self._incremental(scenario, axes) if scenario.incremental else None
+        if reused is None:
+            future_values, timeline = self._evaluate(scenario, axes)
+            recomputed = size
+        else:
+            future_values, timeline, recomputed = reused
+
+        self._remember(scenario, axes, future_values, timeline)
+
+        return WhatIfGridResult(
+            axes={name: values.tolist() for name, values in axes.items()},
+            future_values=future_values.tolist(),
+            timeline_months=timeline.tolist() if timeline is not None else None,
+            points=self._points(scenario.user_id, axes, future_values, timeline) if scenario.include_points else None,
+            recomputed_points=recomputed,
+        )
+
+    def _remember(self, scenario: WhatIfGridInput, axes: Dict[str, np.ndarray], future_values: np.ndarray,
+                  timeline: Optional[np.ndarray]):
+        """Keep this grid for the user's next (incremental) request, within the byte budget."""
+        size = future_values.nbytes + sum(values.nbytes for values in axes.values())
+        if timeline is not None:
+            size += timeline.nbytes
+        with self._lock:
+            previous = self._grids.pop(scenario.user_id, None)
+            if previous is not None:
+                self.cached_bytes -= previous[-1]
+            if size > self.max_cached_bytes:
+                return                                       # Larger than the whole budget → not kept
+            self._grids[scenario.user_id] = (self._base_key(scenario), axes, future_values, timeline, size)
+            self.cached_bytes += size
+            while self.cached_bytes > self.max_cached_bytes:
+                _, evicted = self._grids.popitem(last=False)   # Least recently used
+                self.cached_bytes -= evicted[-1]
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"grids": len(self._grids), "bytes": self.cached_bytes, "evictions": self.evictions}
+
+    def _points(self, user_id: str, axes: Dict[str, np.ndarray], future_values: np.ndarray,
+                timeline: Optional[np.ndarray]) -> List[SimulationResult]:
+        """One SimulationResult per grid point, in row-major order; scenario_id encodes the coordinates."""
+        points = []
+        for index in np.ndindex(future_values.shape):
+            coordinates = ",".join(f"{name}={axes[name][i]:g}" for name, i in zip(axes, index))
+            months = timeline[index] if timeline is not None else None
+            points.append(SimulationResult(
+                scenario_id=f"{user_id}:{coordinates}",
+                future_value=max(0.0, float(future_values[index])),
+                timeline_months=int(months) if months is not None and np.isfinite(months) else None,
+            ))
+        return points
@@ -1,32 +1,120 @@
 import numpy as np
 
-def compound_interest(principal: float, rate: float, time: float, n: int) -> float:
+# All functions below are ufunc-style: every argument may be a scalar or an
+# array, arguments broadcast against each other like NumPy ufuncs, and scalar
+# inputs give back a plain Python float. Scalars run through the same kernels as
+# 0-d arrays, so a scalar call and the matching element of an array call agree
+# within an ulp or two (NumPy's SIMD pow over long arrays; see tests/test_calculations.py).
+
+def _as_float_arrays(*values):
+    """Convert arguments to float64 arrays so integer inputs never hit integer power/division."""
+    return [np.asarray(value, dtype=np.float64) for value in values]
+
+def _unwrap(result: np.ndarray):
+    """Return a Python scalar for 0-d results, the array otherwise."""
+    return result.item() if np.ndim(result) == 0 else result
+
+def compound_interest(principal, rate, time, n):
     """
     Calculate compound interest.
     Formula: FV = P * (1 + r/n)^(n*t)
-    
+
     - principal (P): the initial amount
     - rate (r): annual interest rate (in decimal, e.g. 0.08 for 8%)
     - time (t): number of years
     - n: compounding periods per year (12 = monthly, 4 = quarterly, etc.)
     """
     try:
-        return principal * np.power(1 + rate / n, n * time)
+        principal, rate, time, n = _as_float_arrays(principal, rate, time, n)
+        return _unwrap(principal * np.power(1 + rate / n, n * time))
     except Exception as e:
         raise Exception(f"Compound interest calculation failed: {str(e)}")
 
-def cagr(beginning_value: float, ending_value: float, periods: float) -> float:
+def cagr(beginning_value, ending_value, periods):
     """
     Calculate Compound Annual Growth Rate (CAGR).
     Formula: CAGR = (Ending / Beginning)^(1 / periods) - 1
-    
+
     - beginning_value: starting investment value
     - ending_value: final investment value
     - periods: number of years
     - returns % CAGR (multiplied by 100 for readability)
     """
     try:
-        return (np.power(ending_value / beginning_value, 1 / periods) - 1) * 100
+        beginning_value, ending_value, periods = _as_float_arrays(beginning_value, ending_value, periods)
+        return _unwrap((np.power(ending_value / beginning_value, 1 / periods) - 1) * 100)
     except Exception as e:
         raise Exception(f"CAGR calculation failed: {str(e)}")
 
+def monthly_rate(annual_rate, compounding_frequency=12):
+    """
+    Effective monthly rate for a nominal annual rate compounded `compounding_frequency` times a year.
+    Formula: i = (1 + r/k)^(k/12) - 1, which is exactly r/12 for monthly compounding.
+
+    - annual_rate: annual interest rate in percentage (e.g. 12 for 12%)
+    - compounding_frequency (k): compounding periods per year
+    """
+    annual_rate, compounding_frequency = _as_float_arrays(annual_rate, compounding_frequency)
+    rate = annual_rate / 100
+    return np.where(
+        compounding_frequency == 12,
+        rate / 12,
+        np.power(1 + rate / compounding_frequency, compounding_frequency / 12) - 1,
+    )
+
+def _annuity_due(monthly_investment, i, months):
+    """
+    P * ((1 + i)^n - 1) / i * (1 + i), with the i = 0 limit P * n; all arguments are arrays.
+    Operations run in the same order as the scalar formula; the only difference left is
+    NumPy's vectorized pow, which is not bit-identical to libm's (relative error below 1e-13).
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = monthly_investment * (np.power(1 + i, months) - 1) / i * (1 + i)
+    return np.where(i == 0, monthly_investment * months, growth)
+
+def sip_future_value(monthly_investment, annual_rate, tenure_years, compounding_frequency=12):
+    """
+    Future value of a monthly SIP (instalments invested at the start of each month).
+    Formula: FV = P * ((1 + i)^n - 1) / i * (1 + i), or P * n when i = 0
+
+    - monthly_investment (P): amount invested every month
+    - annual_rate: annual interest rate in percentage
+    - tenure_years: investment duration in years (n = 12 * tenure_years months)
+    - compounding_frequency: compounding periods per year
+    """
+    try:
+        monthly_investment, tenure_years = _as_float_arrays(monthly_investment, tenure_years)
+        i = monthly_rate(annual_rate, compounding_frequency)
+        return _unwrap(_annuity_due(monthly_investment, i, tenure_years * 12))
+    except Exception as e:
+        raise Exception(f"SIP calculation failed: {str(e)}")
+
+def months_to_goal(target_amount, monthly_investment, annual_rate, compounding_frequency=12):
+    """
+    Smallest whole number of months after which a monthly SIP reaches the target.
+
+    Solves P * ((1 + i)^n - 1) / i * (1 + i) >= T in closed form:
+        n = ceil( log(1 + T * i / (P * (1 + i))) / log(1 + i) ),   or ceil(T / P) when i = 0
+    then nudges by one month wherever floating-point rounding landed on the wrong
+    side, so the month count is the one a month-by-month scalar loop would return.
+    Unreachable goals (possible only with negative rates) give NaN.
+    """
+    try:
+        target_amount, monthly_investment = _as_float_arrays(target_amount, monthly_investment)
+        i = monthly_rate(annual_rate, compounding_frequency)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            exact = np.where(
+                i == 0,
+                target_amount / monthly_investment,
+                np.log1p(target_amount * i / (monthly_investment * (1 + i))) / np.log1p(i),
+            )
+            months = np.maximum(np.ceil(exact), 0)
+
+            # Rounding guards: step forward if this month falls short, back if the previous one suffices
+            months = np.where(_annuity_due(monthly_investment, i, months) < target_amount, months + 1, months)
+            previous = np.maximum(months - 1, 0)
+            reached_early = (_annuity_due(monthly_investment, i, previous) >= target_amount) & (months > 0)
+            months = np.where(reached_early, previous, months)
+        return _unwrap(months)
+    except Exception as e:
+        raise Exception(f"Goal timeline calculation failed: {str(e)}")
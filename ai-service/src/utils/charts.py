@@ -0,0 +1,87 @@
+import base64
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Chart payload formats accepted by the simulation endpoints
+# rows → list of dicts, one per point (the default, unchanged shape)
+# columnar → one list per series, {"month": [...], "p50": [...], ...}
+# columnar_f32 → one base64 string per series holding little-endian float32 values
+CHART_FORMATS = ("rows", "columnar", "columnar_f32")
+
+def lttb(x, y, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling; returns the indices of the points to keep.
+
+    - x: (n,) increasing x values
+    - y: (n,) one series, or (n, k) several series sharing x; with several series the
+      triangle areas are summed, so one set of points preserves the shape of every band
+    - threshold: number of points to keep (first and last are always kept)
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if y.ndim == 1:
+        y = y[:, None]
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # Bucket i (1..threshold-2) covers [edges[i-1], edges[i]); first and last points are buckets of their own
+    every = (n - 2) / (threshold - 2)
+    edges = np.floor(np.arange(threshold - 1) * every).astype(int) + 1
+    edges[-1] = n - 1
+    # Average of every bucket (and of the final point) is the third triangle vertex for the bucket before it
+    starts = np.append(edges[:-1], n - 1)
+    counts = np.diff(np.append(starts, n))
+    mean_x = np.add.reduceat(x, starts) / counts
+    mean_y = np.add.reduceat(y, starts, axis=0) / counts[:, None]
+
+    keep = np.empty(threshold, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Twice the area of the triangle (a, candidate, next bucket average), summed over series
+        area = np.abs(
+            (x[a] - mean_x[i + 1]) * (y[lo:hi] - y[a])
+            - (x[a] - x[lo:hi, None]) * (mean_y[i + 1] - y[a])
+        ).sum(axis=1)
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+def _encode_float32(values: np.ndarray) -> str:
+    """Base64 of the values as little-endian float32 (decode with `new Float32Array(buffer)`)."""
+    return base64.b64encode(np.asarray(values, dtype="<f4").tobytes()).decode("ascii")
+
+def shape_chart_data(
+    chart_data: Optional[List[Dict[str, float]]],
+    points: Optional[int] = None,
+    chart_format: str = "rows",
+    x_key: str = "month",
+) -> Dict[str, Any]:
+    """
+    Downsample and/or re-encode chart rows. Returns the fields to set on a SimulationResult:
+    {"chart_data": rows} for the rows format, {"chart_data": None, "chart_columns": columns} otherwise.
+    """
+    if not chart_data:
+        return {"chart_data": chart_data}
+    if chart_format not in CHART_FORMATS:
+        raise ValueError(f"Unknown chart format '{chart_format}', expected one of {', '.join(CHART_FORMATS)}")
+
+    keys = list(chart_data[0])
+    columns = np.array([[row[key] for key in keys] for row in chart_data], dtype=np.float64)
+    if points is not None and points < len(columns):
+        series = [i for i, key in enumerate(keys) if key != x_key]
+        x = columns[:, keys.index(x_key)] if x_key in keys else np.arange(len(columns))
+        columns = columns[lttb(x, columns[:, series], points)]
+
+    if chart_format == "rows":
+        return {"chart_data": [dict(zip(keys, map(float, row))) for row in columns]}
+    if chart_format == "columnar":
+        return {"chart_data": None, "chart_columns": {key: columns[:, i].tolist() for i, key in enumerate(keys)}}
+    return {
+        "chart_data": None,
+        "chart_columns": {key: _encode_float32(columns[:, i]) for i, key in enumerate(keys)},
+        "chart_encoding": "float32-base64",
+    }
@@ -0,0 +1,28 @@
+import threading                          # threading → one construction even when warm-up and a request race
+from typing import Callable, Generic, Optional, TypeVar   # Typing helpers
+
+T = TypeVar("T")
+
+
+class Lazy(Generic[T]):   # Builds a (heavy) service on first use; the app can start answering before it exists
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+        self._value: Optional[T] = None
+        self._lock = threading.Lock()
+        self.error: Optional[str] = None   # Last construction failure, reported by /ready
+
+    @property
+    def ready(self) -> bool:
+        return self._value is not None
+
+    def get(self) -> T:
+        if self._value is None:            # Fast path without the lock once built
+            with self._lock:
+                if self._value is None:
+                    try:
+                        self._value = self._factory()
+                        self.error = None
+                    except Exception as e:
+                        self.error = str(e)
+                        raise
+        return self._value
@@ -0,0 +1,71 @@
+# ------------------------------------------------------------
+# The AI service's Prometheus metrics, rendered by GET /metrics
+# ------------------------------------------------------------
+# Metric types, the registry and the exposition format come from prometheus_client; the route
+# middleware, scrape-time collectors and slow-request profiler from the shared finsage_metrics
+# package (packages/finsage-metrics). Only this service's metric declarations live here.
+from typing import Callable, Dict, Sequence, Tuple   # Typing helpers
+
+import finsage_metrics                                # Shared middleware → subclassed for this registry's HTTP metrics
+from finsage_metrics import CallbackCollector, SlowRequestProfiler  # noqa: F401  (re-exported for main.py)
+from prometheus_client import CONTENT_TYPE_LATEST as CONTENT_TYPE  # noqa: F401  (re-exported for main.py)
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
+
+NAMESPACE = "finsage_ai_service"
+
+# Seconds; covers sub-millisecond cached answers up to multi-second simulations
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+registry = CollectorRegistry()   # This service's registry → rendered by GET /metrics
+
+# HTTP requests (recorded by MetricsMiddleware)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route", "status"),
+    namespace=NAMESPACE, buckets=BUCKETS, registry=registry)
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests being served", namespace=NAMESPACE, registry=registry)
+
+
+class MetricsMiddleware(finsage_metrics.MetricsMiddleware):   # Per-route latency and in-flight requests → the metrics above
+    latency = HTTP_LATENCY
+    in_flight = HTTP_IN_FLIGHT
+
+
+# LLM calls (recorded by AIOrchestrator)
+LLM_LATENCY = Histogram(
+    "llm_request_duration_seconds", "LLM call latency (streamed calls: until the last token)", ("mode", "outcome"),
+    namespace=NAMESPACE, buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0), registry=registry)
+LLM_TOKENS = Counter(
+    "llm_tokens_total", "LLM tokens by direction (provider usage, else estimated)", ("direction",),
+    namespace=NAMESPACE, registry=registry)
+
+# MCP upstream (recorded by AsyncMCPConnector)
+MCP_LATENCY = Histogram(
+    "mcp_request_duration_seconds", "MCP upstream call latency by result", ("result",),
+    namespace=NAMESPACE, buckets=BUCKETS, registry=registry)
+
+# Monte Carlo (recorded by PortfolioProjectionEngine)
+SIMULATION_PATHS = Counter(
+    "simulation_paths_total", "Monte Carlo paths simulated (rate() gives paths/s)", ("kind",),
+    namespace=NAMESPACE, registry=registry)
+SIMULATION_SECONDS = Histogram(
+    "simulation_duration_seconds", "Time spent simulating paths", ("kind",),
+    namespace=NAMESPACE, buckets=BUCKETS, registry=registry)
+
+
+def record_simulation(kind: str, paths: int, seconds: float) -> None:
+    SIMULATION_PATHS.labels(kind=kind).inc(paths)
+    SIMULATION_SECONDS.labels(kind=kind).observe(seconds)
+
+
+def record_llm_call(mode: str, outcome: str, seconds: float, input_tokens: int = 0, output_tokens: int = 0) -> None:
+    LLM_LATENCY.labels(mode=mode, outcome=outcome).observe(seconds)
+    if input_tokens:
+        LLM_TOKENS.labels(direction="input").inc(input_tokens)
+    if output_tokens:
+        LLM_TOKENS.labels(direction="output").inc(output_tokens)
+
+
+def collect(name: str, documentation: str, callback: Callable[[], Dict[Tuple, float]],
+            labels: Sequence[str] = (), kind: str = "gauge") -> None:
+    """Register a metric computed on every scrape, e.g. from an existing stats() dict."""
+    registry.register(CallbackCollector(f"{NAMESPACE}_{name}", documentation, callback, labels, kind))
@@ -0,0 +1,13 @@
+import os
+
+# Settings requires these (normally from the root .env); tests run against the fake LLM and never reach MCP
+for name, value in {
+    "GEMINI_API_KEY": "test",
+    "MCP_API_KEY": "test",
+    "MCP_BASE_URL": "http://127.0.0.1:9",
+    "API_PORT": "8002",
+    "DATABASE_URL": "postgresql://test@localhost/test",
+    "LLM_PROVIDER": "fake",
+    "FAKE_LLM_LATENCY": "0",
+}.items():
+    os.environ.setdefault(name, value)
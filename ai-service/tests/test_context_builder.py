@@ -0,0 +1,122 @@
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+import main
+from src.services.context_builder import NO_DATA_CONTEXT, UserContextBuilder, estimate_tokens
+
+client = TestClient(main.app)
+
+FINANCIALS = {
+    "bank_accounts": [{"type": "savings", "balance": 250_000}, {"type": "current", "balance": "40000"}],
+    "investments": [{"type": "mutual_fund", "current_value": 600_000, "monthly_sip": 15_000}],
+    "credit_cards": [{"outstanding": 12_000}],
+    "goals": [{"name": "house", "target_amount": 5_000_000, "current_amount": 1_250_000, "target_date": "2030-01-01"}],
+    "transactions": [
+        {"date": "2026-09-03", "amount": -30_000, "category": "rent", "type": "debit"},
+        {"date": "2026-09-05", "amount": 9_000, "category": "groceries", "type": "debit"},
+        {"date": "2026-09-09", "amount": 2_500, "category": "transport", "type": "debit"},
+        {"date": "2026-09-12", "amount": 400, "category": "books", "type": "debit"},
+        {"date": "2026-09-30", "amount": 120_000, "category": "salary", "type": "credit"},
+    ],
+}
+
+
+class FakeConnector:
+    def __init__(self, financials=None):
+        self.financials = financials
+        self.calls = 0
+
+    async def fetch_user_financial_data(self, user_id):
+        self.calls += 1
+        if self.financials is None:
+            raise ConnectionError("MCP down")
+        return self.financials
+
+
+def test_context_is_trimmed_to_the_token_budget():
+    full = UserContextBuilder(token_budget=10_000)
+    full.load("u1", FINANCIALS)
+    lines = full.cached_context("u1").split("\n")
+    assert lines[0] == "Balances: savings 250,000; current 40,000; credit card dues 12,000"
+    assert lines[-4:] == ["- rent 30,000", "- groceries 9,000", "- transport 2,500", "- books 400"]
+
+    for budget in (5, 20, 40, 60, 80):
+        builder = UserContextBuilder(token_budget=budget)
+        builder.load("u1", FINANCIALS)
+        context = builder.cached_context("u1")
+        assert estimate_tokens(context) <= budget
+        if budget >= estimate_tokens(lines[0]):
+            # Whole lines, most important first: trimming drops the smallest categories, then the goals ...
+            assert context.split("\n") == lines[:len(context.split("\n"))]
+        else:
+            assert context == lines[0][:budget * 4]   # A single oversized line is cut
+
+
+def test_added_transactions_update_the_cached_context():
+    builder = UserContextBuilder(token_budget=10_000)
+    builder.load("u1", FINANCIALS)
+    before = builder.cached_context("u1")
+    assert builder.add_transactions("u1", [{"date": "2026-09-20", "amount": 600, "category": "books", "type": "debit"}])
+    assert builder.cached_context("u1") != before and "- books 1,000" in builder.cached_context("u1")
+
+    reloaded = UserContextBuilder(token_budget=10_000)
+    reloaded.load("u1", {**FINANCIALS, "transactions": FINANCIALS["transactions"] + [
+        {"date": "2026-09-20", "amount": 600, "category": "books", "type": "debit"}]})
+    assert builder.cached_context("u1") == reloaded.cached_context("u1")
+    assert not builder.add_transactions("nobody", [])
+
+
+def test_users_load_once_through_the_connector():
+    connector = FakeConnector(FINANCIALS)
+    builder = UserContextBuilder(connector=connector)
+    first = asyncio.run(builder.get_context("u1"))
+    assert asyncio.run(builder.get_context("u1")) == first and connector.calls == 1
+    assert asyncio.run(builder.get_context(None)) == NO_DATA_CONTEXT
+
+    down = UserContextBuilder(connector=FakeConnector())
+    assert asyncio.run(down.get_context("u1")) == NO_DATA_CONTEXT   # MCP failure → chat goes on without personal data
+
+
+def test_transactions_are_counted_once_and_undated_ones_skipped():
+    builder = UserContextBuilder(token_budget=10_000)
+    builder.load("u1", {"transactions": [{"id": "t1", "date": "2026-08-02", "amount": 500, "category": "books"}]})
+    batch = [
+        {"id": "t1", "date": "2026-08-02", "amount": 500, "category": "books"},      # Already loaded
+        {"id": "t2", "date": "2026-08-04", "amount": 700, "category": "books"},
+        {"id": "t2", "date": "2026-08-04", "amount": 700, "category": "books"},      # Retried delivery
+        {"amount": 9_999, "category": "rent"},                                        # Undated → not "the latest month"
+        {"date": "unknown", "amount": 9_999, "category": "rent"},
+    ]
+    assert builder.add_transactions("u1", batch) and builder.add_transactions("u1", batch)
+    assert builder.cached_context("u1").split("\n") == ["Spend 2026-08: total 1,200", "- books 1,200"]
+
+
+def test_summaries_are_bounded_and_expire(monkeypatch):
+    builder = UserContextBuilder(max_users=2, ttl_seconds=60)
+    for user_id in ("u1", "u2"):
+        builder.load(user_id, FINANCIALS)
+    assert builder.cached_context("u1") is not None   # u1 now most recently used
+    builder.load("u3", FINANCIALS)
+    assert builder.cached_context("u2") is None and builder.evictions == 1
+    assert builder.cached_context("u1") is not None
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+    assert builder.cached_context("u1") is None and not builder.add_transactions("u3", [])
+    assert builder.expirations == 2
+
+    connector = FakeConnector(FINANCIALS)
+    reloading = UserContextBuilder(connector=connector, ttl_seconds=0)
+    asyncio.run(reloading.get_context("u1"))
+    asyncio.run(reloading.get_context("u1"))
+    assert connector.calls == 2                      # Expired → fetched from MCP again
+
+
+def test_transactions_route_drops_the_users_cached_answers():
+    cache = main.ai_orchestrator.get().cache
+    cache.set("how am i doing", "context", "fine", user_id="u-route")
+    response = client.post("/ai/context/u-route/transactions", json=[{"id": "t1", "date": "2026-09-01", "amount": 10}])
+    assert response.status_code == 200
+    assert cache.get("how am i doing", "context") is None
@@ -0,0 +1,117 @@
+import asyncio
+import csv
+import io
+import json
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from src.services.export_service import ExportService
+
+client = TestClient(app)
+service = ExportService(max_workers=0)
+
+ROWS = [
+    {"id": i, "date": f"2026-{i % 12 + 1:02d}-01", "amount": i * 10 if i % 2 else i * 10 + 0.5, "category": "rent"}
+    for i in range(25)
+]
+ROWS[3]["note"] = "late key"   # Key missing from the first row → still a column
+
+
+def read_csv(text):
+    return list(csv.DictReader(io.StringIO(text)))
+
+
+def read_columnar(data, export_format):
+    if export_format == "parquet":
+        return pq.read_table(pa.BufferReader(data))
+    return pa.ipc.open_stream(data).read_all()
+
+
+def as_text(value):
+    return "" if value is None else str(value)
+
+
+async def body(data, piece=7):
+    for start in range(0, len(data), piece):   # Rows split across body chunks
+        yield data[start:start + piece]
+
+
+def export(data, export_format, schema=None, piece=7):
+    async def collect():
+        return [chunk async for chunk in service.aiter_export(body(data, piece), export_format, schema)]
+    chunks = asyncio.run(collect())
+    return "".join(chunks) if export_format == "csv" else b"".join(chunks)
+
+
+@pytest.mark.parametrize("export_format", ["parquet", "arrow"])
+def test_csv_and_columnar_exports_agree_row_by_row(export_format):
+    columns = ["id", "date", "amount", "category", "note"]
+    text = "".join(service.iter_csv(ROWS, columns=columns, chunk_rows=4))
+    table = read_columnar(b"".join(service.iter_columnar(ROWS, export_format, chunk_rows=10)), export_format)
+
+    assert table.schema.names == columns
+    assert table.schema.field("amount").type == pa.float64()   # Ints and floats in the first batch → float64
+    assert table.num_rows == len(ROWS)
+    if export_format == "parquet":
+        assert pq.read_metadata(pa.BufferReader(b"".join(service.iter_columnar(ROWS, chunk_rows=10)))).num_row_groups == 3
+    for line, record in zip(read_csv(text), table.to_pylist()):
+        assert line["id"] == str(record["id"]) and line["date"] == record["date"]
+        assert float(line["amount"]) == record["amount"]
+        assert line["note"] == as_text(record["note"])
+
+
+def test_later_batches_must_fit_the_schema_unless_it_is_declared():
+    late_column = ROWS + [{"id": 99, "amount": 1.0, "merchant": "new"}]
+    with pytest.raises(ValueError, match="merchant"):
+        b"".join(service.iter_columnar(late_column, chunk_rows=10))
+    with pytest.raises(ValueError, match="amount"):
+        b"".join(service.iter_columnar(ROWS + [{"id": 99, "amount": "n/a"}], chunk_rows=10))
+
+    schema = {"id": "int64", "merchant": "string", "amount": "float64"}
+    table = read_columnar(b"".join(service.iter_columnar(late_column, schema=schema, chunk_rows=10)), "parquet")
+    assert table.schema.names == ["id", "merchant", "amount"] and table.num_rows == 26
+    assert table.column("merchant").to_pylist()[-2:] == [None, "new"]
+    empty = read_columnar(b"".join(service.iter_columnar([], schema=schema)), "parquet")
+    assert empty.schema.names == ["id", "merchant", "amount"] and empty.num_rows == 0
+
+
+def test_streamed_bodies_export_like_in_memory_rows():
+    ndjson = "".join(json.dumps(row) + "\n" for row in ROWS).encode()
+    array = json.dumps(ROWS, indent=1).encode()
+    expected = "".join(service.iter_csv(ROWS))
+    assert export(ndjson, "csv") == expected
+    assert export(array, "csv", piece=1) == expected
+    assert export(b"[]", "csv", schema={"id": "int64", "amount": "float64"}) == "id,amount\n"
+
+    table = read_columnar(export(ndjson, "parquet"), "parquet")
+    assert table.to_pylist() == read_columnar(b"".join(service.iter_columnar(ROWS)), "parquet").to_pylist()
+    for bad in (b'{"id": 1}\n[2]\n', b'[{"id": 1} {"id": 2}]', b'[{"id": 1}', b'{"id": '):
+        with pytest.raises(ValueError):
+            export(bad, "csv")
+
+
+def test_export_route_streams_ndjson_and_json_arrays():
+    lines = "".join(json.dumps(row) + "\n" for row in ROWS).encode()
+    response = client.post("/ai/export/data", content=iter([lines[:100], lines[100:]]),
+                           headers={"Content-Type": "application/x-ndjson"})
+    assert response.status_code == 200 and response.headers["content-type"].startswith("text/csv")
+    assert response.text == "".join(service.iter_csv(ROWS))
+
+    response = client.post("/ai/export/data", params={"format": "arrow", "schema": "id:int32,amount:float64"}, json=ROWS)
+    assert response.status_code == 200
+    table = read_columnar(response.content, "arrow")
+    assert table.schema == pa.schema([("id", pa.int32()), ("amount", pa.float64())]) and table.num_rows == 25
+
+    assert client.post("/ai/export/data", params={"format": "parquet", "schema": "id:int1024"}, json=ROWS).status_code == 400
+    assert client.post("/ai/export/data", content=b'[{"id": 1}, 2]').status_code == 400
+
+
+def test_chart_size_is_bounded():
+    chart = {"data": [{"month": 1, "value": 1000}, {"month": 2, "value": 2010}], "x_key": "month", "y_key": "value"}
+    assert client.post("/ai/export/chart", json={**chart, "format": "svg", "width": 4, "height": 3}).status_code == 200
+    for size in ({"width": 1e6}, {"height": 0}, {"width": -5}):
+        assert client.post("/ai/export/chart", json={**chart, **size}).status_code == 422, size
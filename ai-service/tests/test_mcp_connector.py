@@ -0,0 +1,154 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from src.services.mcp_connector import AsyncMCPConnector, CircuitBreaker, MCPError
+
+FINANCIALS = {"bank_accounts": [{"balance": 125_000}], "investments": [], "credit_cards": []}
+
+
+class StubMCP:
+    """aiohttp server answering /users/{id}/financials with a scripted list of statuses (then 200s)."""
+
+    def __init__(self, statuses=(), etag=None, delay=0.0):
+        self.statuses = list(statuses)
+        self.etag = etag
+        self.delay = delay
+        self.requests = []
+
+    async def financials(self, request):
+        self.requests.append(dict(request.headers))
+        await asyncio.sleep(self.delay)
+        status = self.statuses.pop(0) if self.statuses else 200
+        if status != 200:
+            return web.Response(status=status)
+        if self.etag and request.headers.get("If-None-Match") == self.etag:
+            return web.Response(status=304)
+        return web.json_response(FINANCIALS, headers={"ETag": self.etag} if self.etag else {})
+
+
+def run(stub, scenario, **options):
+    """Start the stub on a free port, run scenario(connector), then shut both down."""
+    async def main():
+        app = web.Application()
+        app.router.add_get("/users/{user_id}/financials", stub.financials)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        connector = AsyncMCPConnector("key", f"http://127.0.0.1:{port}", backoff_base=0.001, **options)
+        try:
+            return await scenario(connector)
+        finally:
+            await connector.close()
+            await runner.cleanup()
+
+    return asyncio.run(main())
+
+
+def test_concurrent_requests_share_one_upstream_call():
+    stub = StubMCP(delay=0.05)
+
+    async def scenario(connector):
+        results = await asyncio.gather(*(connector.fetch_user_financial_data("u1") for _ in range(10)))
+        again = await connector.fetch_account_balances("u1")
+        return results, again, connector.stats()
+
+    results, again, stats = run(stub, scenario)
+    assert results == [FINANCIALS] * 10 and again == FINANCIALS
+    assert len(stub.requests) == 1
+    assert stub.requests[0]["Authorization"] == "Bearer key"
+    assert (stats["upstream_calls"], stats["coalesced"], stats["cache_hits"]) == (1, 9, 1)
+
+
+def test_expired_entries_are_revalidated_with_etag():
+    stub = StubMCP(etag='"v1"')
+
+    async def scenario(connector):
+        first = await connector.fetch_user_financial_data("u1")
+        second = await connector.fetch_user_financial_data("u1")   # TTL 0 → revalidate
+        return first, second, connector.stats()
+
+    first, second, stats = run(stub, scenario, cache_ttl=0)
+    assert first is second                                            # 304 → the cached payload object is reused
+    assert "If-None-Match" not in stub.requests[0] and stub.requests[1]["If-None-Match"] == '"v1"'
+    assert stats["revalidations"] == 1
+
+
+def test_cache_is_bounded_and_old_entries_are_fetched_in_full():
+    stub = StubMCP(etag='"v1"')
+
+    async def scenario(connector):
+        for user_id in ("u1", "u2", "u1", "u3"):          # u2 is least recently used when u3 arrives
+            await connector.fetch_user_financial_data(user_id)
+        cached = list(connector._cache)
+        await connector.fetch_user_financial_data("u2")
+        return cached, connector.stats()
+
+    cached, stats = run(stub, scenario, max_cached_users=2)
+    assert cached == ["u1", "u3"] and stats["evictions"] == 2 and stats["cached_users"] == 2
+    assert len(stub.requests) == 4 and "If-None-Match" not in stub.requests[-1]
+
+    stub = StubMCP(etag='"v1"')
+
+    async def expired(connector):
+        await connector.fetch_user_financial_data("u1")
+        await connector.fetch_user_financial_data("u1")   # Past the revalidation window → no ETag, full payload
+        return connector.stats()
+
+    stats = run(stub, expired, cache_ttl=0, revalidate_window=0)
+    assert len(stub.requests) == 2 and "If-None-Match" not in stub.requests[1] and stats["revalidations"] == 0
+
+
+def test_transient_errors_are_retried():
+    stub = StubMCP(statuses=[503, 429])
+
+    async def scenario(connector):
+        return await connector.fetch_user_financial_data("u1"), connector.stats()
+
+    data, stats = run(stub, scenario, max_retries=2)
+    assert data == FINANCIALS and stats["upstream_calls"] == 3 and stats["circuit"] == "closed"
+
+
+def test_client_errors_are_not_retried_and_keep_the_circuit_closed():
+    stub = StubMCP(statuses=[404])
+
+    async def scenario(connector):
+        with pytest.raises(MCPError, match="HTTP 404"):
+            await connector.fetch_user_financial_data("missing")
+        return connector.stats()
+
+    stats = run(stub, scenario, max_retries=3)
+    assert len(stub.requests) == 1 and stats["circuit"] == "closed"
+
+
+def test_circuit_breaker_opens_fails_fast_and_recovers_through_one_trial():
+    stub = StubMCP(statuses=[500] * 3)
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.2)
+
+    async def scenario(connector):
+        states = []
+        for _ in range(2):
+            with pytest.raises(MCPError):
+                await connector.fetch_user_financial_data("u1")
+        states.append(breaker.state)
+        with pytest.raises(MCPError, match="circuit open"):         # Fails fast, MCP isn't called
+            await connector.fetch_user_financial_data("u1")
+        calls = len(stub.requests)
+
+        await asyncio.sleep(0.2)
+        states.append(breaker.state)
+        with pytest.raises(MCPError):                                # Failed trial (third 500) → open again
+            await connector.fetch_user_financial_data("u1")
+        states.append(breaker.state)
+
+        await asyncio.sleep(0.2)
+        data = await connector.fetch_user_financial_data("u1")      # Successful trial → closed
+        states.append(breaker.state)
+        return states, calls, data
+
+    states, calls, data = run(stub, scenario, max_retries=0, circuit_breaker=breaker)
+    assert states == ["open", "half_open", "open", "closed"]
+    assert calls == 2 and data == FINANCIALS
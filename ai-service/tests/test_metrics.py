@@ -0,0 +1,36 @@
+import re
+
+from fastapi.testclient import TestClient
+
+from main import app
+
+client = TestClient(app)
+
+
+def sample(text, series):
+    match = re.search(rf"^{re.escape(series)} (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else None
+
+
+def test_metrics_endpoint_reports_routes_simulations_and_llm_calls():
+    before = client.get("/metrics").text
+    client.post("/ai/context/u-metrics/transactions", json=[])
+    client.post("/ai/simulate/portfolio", json={
+        "user_id": "u-metrics", "initial_investment": 100_000, "allocation": {"equity": 100},
+        "annual_rates": {"equity": 12}, "annual_volatilities": {"equity": 18}, "tenure_years": 1,
+        "simulations": 500, "seed": 20261018,
+    })
+    client.post("/ai/chat", json={"query": "How much should I save each month?"})
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    assert 'route="/ai/context/{user_id}/transactions",status="200"' in text
+    assert "u-metrics" not in text
+    paths = 'finsage_ai_service_simulation_paths_total{kind="portfolio"}'
+    assert sample(text, paths) - (sample(before, paths) or 0) == 500
+    assert 'finsage_ai_service_llm_request_duration_seconds_count{mode="invoke",outcome="ok"}' in text
+    assert sample(text, 'finsage_ai_service_llm_tokens_total{direction="input"}') > 0
+    assert sample(text, "finsage_ai_service_what_if_cache_bytes") is not None
+    assert sample(text, 'finsage_ai_service_llm_slots{state="active"}') == 0 and sample(text, 'finsage_ai_service_llm_slots{state="waiting"}') == 0
@@ -0,0 +1,110 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+import main
+from src.services.ai_orchestrator import AIOrchestrator, OrchestratorBusy
+from src.services.fake_llm import FakeLLM
+from src.services.response_cache import ResponseCache
+from src.utils.lazy import Lazy
+
+ANSWER = "Invest a fixed amount every month and raise it with your salary."
+
+
+class CountingLLM(FakeLLM):
+    """FakeLLM that records how many calls overlap."""
+
+    def __init__(self, **kwargs):
+        super().__init__(response=ANSWER, token_delay=0, **kwargs)
+        self.running = self.peak = self.calls = 0
+
+    async def ainvoke(self, prompt):
+        self.calls += 1
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            return await super().ainvoke(prompt)
+        finally:
+            self.running -= 1
+
+
+def orchestrator(llm, **kwargs):
+    return AIOrchestrator(api_key="test", llm=llm, **kwargs)
+
+
+def test_concurrent_llm_calls_are_capped_and_overflow_is_rejected():
+    llm = CountingLLM(latency=0.05)
+    ai = orchestrator(llm, max_concurrency=2, max_queue=3)
+
+    async def burst():
+        return await asyncio.gather(*(ai.aprocess_query(f"question {i}") for i in range(6)), return_exceptions=True)
+
+    results = asyncio.run(burst())
+    assert llm.peak == 2
+    assert results[:5] == [ANSWER] * 5                       # 2 running + 3 queued
+    assert isinstance(results[5], OrchestratorBusy)
+    assert ai.stats() == {"active": 0, "waiting": 0, "max_concurrency": 2, "max_queue": 3}
+
+
+def test_cache_hits_skip_the_llm_and_its_slots():
+    llm = CountingLLM(latency=0)
+    ai = orchestrator(llm, max_concurrency=1, max_queue=0, cache=ResponseCache(ttl_seconds=60))
+
+    async def ask_twice():
+        first = await ai.aprocess_query("How much should I save?", "u1")
+        async with ai.slot():                                 # Every slot taken, no queue
+            with pytest.raises(OrchestratorBusy):
+                await ai.aprocess_query("a new question", "u1")
+            return first, await ai.aprocess_query("how much should i save", "u1")
+
+    assert asyncio.run(ask_twice()) == (ANSWER, ANSWER)
+    assert llm.calls == 1
+
+
+def request_app(monkeypatch, ai, *requests):
+    """Send requests concurrently to the app (one event loop, so they share the orchestrator's slots)."""
+    monkeypatch.setattr(main, "ai_orchestrator", Lazy(lambda: ai))
+
+    async def send():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(client.post(path, json=body) for path, body in requests))
+
+    return asyncio.run(send())
+
+
+def test_chat_route_answers_429_with_retry_after_when_overloaded(monkeypatch):
+    ai = orchestrator(CountingLLM(latency=0.1), max_concurrency=1, max_queue=1)
+    responses = request_app(monkeypatch, ai, *[("/ai/chat", {"query": f"q{i}"}) for i in range(3)])
+    assert [response.status_code for response in responses] == [200, 200, 429]
+    assert responses[0].json() == {"response": ANSWER}
+    assert responses[2].headers["Retry-After"] == "1"
+
+
+def test_chat_stream_sends_token_events_then_done(monkeypatch):
+    ai = orchestrator(FakeLLM(response=ANSWER, latency=0, token_delay=0))
+    response, = request_app(monkeypatch, ai, ("/ai/chat/stream", {"query": "hi"}))
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = response.text.split("\n\n")
+    assert events[-1] == ""                                  # Every event ends with a blank line
+    parsed = [dict(line.split(": ", 1) for line in event.split("\n")) for event in events[:-1]]
+    assert [event["event"] for event in parsed] == ["token"] * len(ANSWER.split(" ")) + ["done"]
+    assert "".join(json.loads(event["data"])["token"] for event in parsed[:-1]) == ANSWER
+    assert json.loads(parsed[-1]["data"]) == {}
+
+
+def test_chat_stream_rejects_before_streaming_when_full(monkeypatch):
+    ai = orchestrator(CountingLLM(latency=0), max_concurrency=1, max_queue=0)
+    monkeypatch.setattr(main, "ai_orchestrator", Lazy(lambda: ai))
+
+    async def stream_while_busy():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            async with ai.slot():                             # The only slot is taken, no queue
+                return await client.post("/ai/chat/stream", json={"query": "hi"})
+
+    response = asyncio.run(stream_while_busy())
+    assert response.status_code == 429                         # A real status, not an error event in a 200 stream
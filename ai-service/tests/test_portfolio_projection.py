@@ -0,0 +1,55 @@
+import numpy as np
+from fastapi.testclient import TestClient
+
+from main import app
+from src.models.simulation_models import PortfolioProjectionInput
+from src.services.portfolio_projection import PortfolioProjectionEngine
+
+client = TestClient(app)
+
+PROJECTION = {
+    "user_id": "u1",
+    "initial_investment": 100_000,
+    "allocation": {"equity": 60, "bonds": 40},
+    "annual_rates": {"equity": 12, "bonds": 7},
+    "annual_volatilities": {"equity": 18, "bonds": 5},
+    "correlations": {"equity": {"bonds": -0.2}},
+    "tenure_years": 3,
+    "simulations": 2_000,
+    "seed": 11,
+}
+
+
+def test_projection_is_reproducible_with_a_seed():
+    first = client.post("/ai/simulate/portfolio", json=PROJECTION)
+    assert first.status_code == 200
+    assert set(first.json()) == {"equity", "bonds", "total"}
+    assert len(first.json()["total"]["chart_data"]) == 36
+    assert client.post("/ai/simulate/portfolio", json=PROJECTION).json() == first.json()
+
+
+def test_perfectly_correlated_assets_use_the_eigen_fallback():
+    projection = PortfolioProjectionInput(**{
+        **PROJECTION, "allocation": {"equity": 50, "stocks": 50}, "annual_rates": {"equity": 10, "stocks": 10},
+        "annual_volatilities": {"equity": 15, "stocks": 15}, "correlations": {"equity": {"stocks": 1.0}},
+        "rebalance_every_months": 0,
+    })
+    engine = PortfolioProjectionEngine()
+    factor = engine.cholesky_factor(["equity", "stocks"], projection)
+    sigma = 0.15 / np.sqrt(12)
+    np.testing.assert_allclose(factor @ factor.T, np.full((2, 2), sigma ** 2), atol=1e-15)
+
+    # Identical shocks → identical holdings on every path
+    series, bands = engine.simulate_bands(projection, seed=3)
+    np.testing.assert_allclose(bands[:, :, 0], bands[:, :, 1], rtol=1e-9)
+
+
+def test_inconsistent_correlations_are_a_400():
+    response = client.post("/ai/simulate/portfolio", json={
+        **PROJECTION,
+        "allocation": {"equity": 40, "bonds": 30, "gold": 30},
+        "annual_rates": {"equity": 12, "bonds": 7, "gold": 8},
+        "correlations": {"equity": {"bonds": 0.9, "gold": -0.9}, "bonds": {"gold": 0.9}},
+    })
+    assert response.status_code == 400
+    assert "positive semi-definite" in response.json()["detail"]
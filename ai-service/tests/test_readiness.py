@@ -0,0 +1,61 @@
+import time
+
+from fastapi.testclient import TestClient
+
+import main
+from benchmarks.import_time import DEFERRED, measure
+from src.utils.lazy import Lazy
+
+client = TestClient(main.app)
+
+
+def services(monkeypatch, **factories):
+    lazies = {name: Lazy(factory) for name, factory in factories.items()}
+    monkeypatch.setattr(main, "READINESS", lazies)
+    return lazies
+
+
+def test_health_and_ready_answer_before_services_are_built(monkeypatch):
+    built = []
+    services(monkeypatch, ai_orchestrator=lambda: built.append("ai") or "ai", export_service=lambda: built.append("export") or "export")
+
+    assert client.get("/health").json() == {"status": "healthy"}
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json() == {"status": "not_ready", "services": {"ai_orchestrator": "starting", "export_service": "starting"}}
+    assert built == []
+
+    with TestClient(main.app) as started:   # Startup → background warm-up builds every service
+        deadline = time.monotonic() + 5
+        while started.get("/ready").status_code != 200 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert started.get("/ready").json()["status"] == "ready"
+    assert sorted(built) == ["ai", "export"]
+
+
+def test_failed_services_are_reported_and_retried(monkeypatch):
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("GEMINI_API_KEY missing")
+        return "ai"
+
+    lazies = services(monkeypatch, ai_orchestrator=flaky, export_service=lambda: "export")
+    lazies["export_service"].get()
+    try:
+        lazies["ai_orchestrator"].get()
+    except RuntimeError:
+        pass
+    body = client.get("/ready").json()
+    assert body["services"] == {"ai_orchestrator": "failed", "export_service": "ready"}
+    assert body["errors"] == {"ai_orchestrator": "GEMINI_API_KEY missing"}
+
+    assert lazies["ai_orchestrator"].get() == "ai"   # Next use builds it again
+    assert client.get("/ready").status_code == 200 and "errors" not in client.get("/ready").json()
+
+
+def test_import_main_defers_heavy_dependencies():
+    imported = {name.strip().split(".")[0] for name, _, _ in measure("main")}
+    assert not imported & set(DEFERRED)
@@ -0,0 +1,69 @@
+import pytest
+
+from src.services import response_cache
+from src.services.response_cache import RECOMMENDED_SIMILARITY_THRESHOLD, ResponseCache, embed, normalize_query
+
+CONTEXT = "Net worth 6.5L; SIP 12,000/month"
+QUESTION = "Should I increase my SIP contribution this year?"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_exact_matches_only_by_default():
+    cache = ResponseCache()
+    cache.set(QUESTION, CONTEXT, "Yes")
+    assert cache.get("should i increase my sip contribution this year", CONTEXT) == "Yes"   # Same normalized query
+    assert cache.get("increase my sip contribution this year please", CONTEXT) is None
+    assert cache.get(QUESTION, "Net worth 7L") is None                                     # Different financial data
+    assert cache.stats()["indexed"] == 0
+
+
+@pytest.mark.parametrize("threshold", [0.8, 0.85, RECOMMENDED_SIMILARITY_THRESHOLD])
+def test_opposite_questions_never_share_an_answer(threshold):
+    # Character trigrams rate these close to the cached question (the old 0.85 default served "decrease");
+    # the content-word guard is what keeps them apart, whatever the threshold
+    assert embed(normalize_query(QUESTION)) @ embed("should i decrease my sip contribution this year") > 0.85
+    cache = ResponseCache(similarity_threshold=threshold)
+    cache.set(QUESTION, CONTEXT, "Yes, raise it by 10%")
+    for other in ("should i decrease my sip contribution this year",
+                  "should i stop my sip contribution this year",
+                  "should i increase my sip contribution next year",
+                  "should i increase my sip contribution by 5000 this year"):
+        assert cache.get(other, CONTEXT) is None, other
+    assert cache.stats()["semantic_hits"] == 0
+
+
+def test_rewordings_hit_when_similarity_is_enabled():
+    cache = ResponseCache(similarity_threshold=RECOMMENDED_SIMILARITY_THRESHOLD)
+    cache.set(QUESTION, CONTEXT, "Yes")
+    assert cache.get("Increase my SIP contribution this year, please!", CONTEXT) == "Yes"    # Filler words
+    assert cache.get("should i increase my sips contribution this year", CONTEXT) == "Yes"  # Plural
+    assert cache.get(QUESTION, "another context") is None
+    assert cache.stats()["semantic_hits"] == 2
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = ResponseCache(ttl_seconds=60, similarity_threshold=RECOMMENDED_SIMILARITY_THRESHOLD)
+    cache.set(QUESTION, CONTEXT, "Yes")
+    clock[0] += 59
+    assert cache.get(QUESTION, CONTEXT) == "Yes"
+    clock[0] += 2
+    assert cache.get(QUESTION, CONTEXT) is None
+    assert cache.stats()["expirations"] == 1 and cache.stats()["entries"] == 0 and cache.stats()["indexed"] == 0
+
+
+def test_invalidation_and_lru_eviction():
+    cache = ResponseCache(max_entries=2, similarity_threshold=RECOMMENDED_SIMILARITY_THRESHOLD, max_index_entries=2)
+    cache.set("q1", CONTEXT, "a1", user_id="u1")
+    cache.set("q2", CONTEXT, "a2", user_id="u1")
+    cache.set("q3", CONTEXT, "a3", user_id="u2")
+    assert cache.get("q1", CONTEXT) is None and cache.stats()["evictions"] == 1
+
+    assert cache.invalidate_user("u1") == 1
+    assert cache.get("q2", CONTEXT) is None and cache.get("q3", CONTEXT) == "a3"
+    assert cache.stats()["entries"] == 1 and cache.stats()["indexed"] == 1
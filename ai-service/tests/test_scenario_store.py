@@ -0,0 +1,102 @@
+import os
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from src.services import scenario_store
+from src.services.scenario_store import ScenarioStore
+from src.utils.lazy import Lazy
+
+client = TestClient(main.app)
+
+INPUTS = {"initial_investment": 100_000, "allocation": {"equity": 100}, "tenure_years": 1}
+
+
+def save(store, scenario_id, months=12, user_id="u1"):
+    bands = np.arange(3 * months * 2, dtype=np.float64).reshape(3, months, 2)
+    return store.put(user_id, scenario_id, INPUTS, seed=7, engine_version="test",
+                     series=["equity", "total"], percentiles=[10, 50, 90], bands=bands)
+
+
+def record_path(store, scenario_id, user_id="u1"):
+    return os.path.join(store.directory, store._file_name(user_id, scenario_id))
+
+
+def test_round_trip_maps_the_saved_bands(tmp_path):
+    store = ScenarioStore(str(tmp_path))
+    saved = save(store, "retire")
+    loaded = ScenarioStore(str(tmp_path)).get("u1", "retire")   # Another worker reading the same directory
+    assert loaded.inputs == INPUTS and loaded.seed == 7 and loaded.series == ["equity", "total"]
+    assert isinstance(loaded.bands, np.memmap) and loaded.bands.dtype == np.float32
+    np.testing.assert_array_equal(loaded.bands, saved.bands)
+    assert loaded.summary == {"equity": {"p10": 22.0, "p50": 46.0, "p90": 70.0}, "total": {"p10": 23.0, "p50": 47.0, "p90": 71.0}}
+    assert store.get("u1", "missing") is None and store.get("u2", "retire") is None
+
+
+def test_put_returns_the_saved_scenario_without_reading_it_back(tmp_path, monkeypatch):
+    store = ScenarioStore(str(tmp_path))
+    monkeypatch.setattr(store, "_read", lambda name: None)   # e.g. evicted by another worker right after the rename
+    saved = save(store, "retire")
+    assert saved.seed == 7 and saved.summary["total"] == {"p10": 23.0, "p50": 47.0, "p90": 71.0}
+    assert saved.bands.dtype == np.float32 and not saved.bands.flags.writeable
+
+
+@pytest.mark.parametrize("damage", ["truncated bands", "truncated header", "empty", "bad magic", "bad json"])
+def test_corrupt_records_read_as_missing_and_are_removed(tmp_path, damage):
+    store = ScenarioStore(str(tmp_path))
+    save(store, "retire")
+    path = record_path(store, "retire")
+    data = open(path, "rb").read()
+    damaged = {
+        "truncated bands": data[:-5],
+        "truncated header": data[:20],
+        "empty": b"",
+        "bad magic": b"XXXX" + data[4:],
+        "bad json": data[:8] + b"[" + data[9:],
+    }[damage]
+    with open(path, "wb") as f:
+        f.write(damaged)
+
+    assert store.get("u1", "retire") is None
+    assert not os.path.exists(path)
+    assert store.stats()["corrupt"] == 1 and store.stats()["scenarios"] == 0 and store.bytes == 0
+    assert save(store, "retire").seed == 7   # Saving again replaces it
+
+
+def test_byte_budget_covers_every_worker_sharing_the_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(scenario_store, "RESCAN_SECONDS", 0)   # Every write re-reads the directory
+    save(ScenarioStore(str(tmp_path)), "a")
+    size = os.path.getsize(record_path(ScenarioStore(str(tmp_path)), "a"))
+    first, second = (ScenarioStore(str(tmp_path), max_bytes=int(3.5 * size)) for _ in range(2))
+    assert first.bytes == size   # Startup scan
+
+    save(second, "b")
+    save(second, "c")
+    os.utime(record_path(first, "a"), (1, 1))   # Oldest access → evicted first, whichever worker wrote it
+    save(first, "d")                            # 4 records on disk, though `first` wrote only one of them
+    names = sorted(name for name in os.listdir(tmp_path) if name.endswith(".scn"))
+    assert len(names) == 3 and os.path.basename(record_path(first, "a")) not in names
+    assert first.bytes == 3 * size and first.evictions == 1
+    assert second.get("u1", "a") is None and second.get("u1", "d") is not None
+
+
+def test_scenario_routes_return_404_for_corrupt_records(tmp_path, monkeypatch):
+    store = ScenarioStore(str(tmp_path))
+    monkeypatch.setattr(main, "scenario_store", Lazy(lambda: store))
+    projection = {"user_id": "u1", "scenario_id": "retire", "initial_investment": 100_000, "allocation": {"equity": 100},
+                  "annual_rates": {"equity": 12}, "annual_volatilities": {"equity": 18}, "tenure_years": 1,
+                  "simulations": 500, "seed": 3}
+    saved = client.post("/ai/scenarios", json=projection)
+    assert saved.status_code == 200 and saved.json()["recomputed"] is True
+    assert client.get("/ai/scenarios/u1/retire").json()["summary"] == saved.json()["summary"]
+
+    with open(record_path(store, "retire"), "r+b") as f:
+        f.truncate(100)
+    assert client.get("/ai/scenarios/u1/retire").status_code == 404
+    again = client.post("/ai/scenarios", json=projection)   # Recomputed from the same seed
+    assert again.json()["recomputed"] is True and again.json()["summary"] == saved.json()["summary"]
+
+    changed = client.post("/ai/scenarios", json={**projection, "tenure_years": 2})   # Same id, new inputs
+    assert changed.json()["recomputed"] is True and store.stats()["stale"] == 1
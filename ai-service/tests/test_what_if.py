@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from main import app
+from src.models.simulation_models import WhatIfGridInput
+from src.services.what_if_engine import WhatIfEngine
+
+client = TestClient(app)
+
+BASE = {"user_id": "u1", "monthly_investment": 10_000, "annual_rate": 12, "tenure_years": 10,
+        "target_amount": 2_500_000, "include_points": False}
+
+
+def grid(ranges, **extra):
+    return WhatIfGridInput(**{**BASE, "ranges": ranges, **extra})
+
+
+def test_incremental_updates_equal_a_full_recompute():
+    engine = WhatIfEngine()
+    steps = [
+        {"rate_increase": [0, 1, 2], "extra_investment": [0, 500, 1000], "tenure_increase": [0, 5]},
+        {"rate_increase": [0, 1, 2, 3], "extra_investment": [0, 500, 1000], "tenure_increase": [0, 5]},   # Value added
+        {"rate_increase": [3, 1, 0.5], "extra_investment": [0, 500, 1000], "tenure_increase": [0, 5]},    # Reordered, removed, new
+        {"rate_increase": [3, 1, 0.5], "extra_investment": [0, 500, 1000], "tenure_increase": [0, 5]},    # Unchanged
+        {"rate_increase": [3, 1, 0.5], "extra_investment": [250], "tenure_increase": [1, 2]},              # Two axes → full
+    ]
+    recomputed = []
+    for ranges in steps:
+        incremental = engine.run(grid(ranges, incremental=True))
+        full = WhatIfEngine().run(grid(ranges))
+        assert incremental.future_values == full.future_values
+        assert incremental.timeline_months == full.timeline_months
+        recomputed.append(incremental.recomputed_points)
+    assert recomputed == [18, 6, 6, 0, 6]
+
+
+def test_cached_grids_are_bounded_by_bytes():
+    ranges = {"rate_increase": list(np.linspace(0, 5, 100)), "extra_investment": list(np.linspace(0, 5000, 100))}
+    one_grid = 2 * 100 * 100 * 8 + 2 * 100 * 8     # Future values + timeline + axes
+    engine = WhatIfEngine(max_cached_bytes=int(2.5 * one_grid))
+    for user in ("a", "b", "c"):
+        engine.run(WhatIfGridInput(**{**BASE, "user_id": user, "ranges": ranges}))
+    assert engine.stats() == {"grids": 2, "bytes": 2 * one_grid, "evictions": 1}
+    assert engine.run(WhatIfGridInput(**{**BASE, "user_id": "a", "ranges": ranges, "incremental": True})).recomputed_points == 10_000
+    assert engine.run(WhatIfGridInput(**{**BASE, "user_id": "c", "ranges": ranges, "incremental": True})).recomputed_points == 0
+
+    tiny = WhatIfEngine(max_cached_bytes=1024)   # A grid bigger than the whole budget is not kept
+    tiny.run(grid(ranges))
+    assert tiny.stats()["grids"] == 0 and tiny.cached_bytes == 0
+
+
+def test_what_if_route():
+    response = client.post("/ai/simulate/what-if", json={**BASE, "ranges": {"rate_increase": [0, 2]}, "include_points": True})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["axes"] == {"rate_increase": [0.0, 2.0]} and len(body["points"]) == 2
+    assert body["future_values"][1] > body["future_values"][0]
+    bad = client.post("/ai/simulate/what-if", json={**BASE, "ranges": {"rate_increase": [0]}, "adjustments": {"bonus": 1}})
+    assert bad.status_code == 400
+
+
+def test_swept_values_must_keep_every_point_within_the_base_limits():
+    rejected = [
+        {"ranges": {"tenure_increase": [-10]}},                              # Tenure 0 → negative future value
+        {"ranges": {"rate_increase": [-2000], "tenure_increase": [0.5]}},    # Rate below 0%
+        {"ranges": {"rate_increase": [0, 89]}},                              # Rate above 100%
+        {"ranges": {"tenure_increase": [1e9]}},                              # Future value overflows → null
+        {"ranges": {"extra_investment": [-10_000]}},                         # Monthly amount 0
+        {"ranges": {"rate_increase": [1]}, "adjustments": {"extra_investment": -20_000}},   # Fixed adjustment applies to every point
+    ]
+    for extra in rejected:
+        assert client.post("/ai/simulate/what-if", json={**BASE, **extra}).status_code == 422, extra
+    for ranges, extra in [({"rate_increase": [float("nan")]}, {}), ({"extra_investment": [float("inf")]}, {}),
+                          ({"extra_investment": [1e308]}, {"monthly_investment": 1e308})]:   # Sum overflows
+        with pytest.raises(ValidationError, match="finite"):
+            grid(ranges, **extra)
+
+    # The swept value replaces the fixed adjustment of the same name
+    accepted = grid({"rate_increase": [-12, 88], "tenure_increase": [-9, 90]}, adjustments={"rate_increase": -50})
+    future_values = np.array(WhatIfEngine().run(accepted).future_values)
+    assert np.isfinite(future_values).all() and (future_values > 0).all()
@@ -0,0 +1,43 @@
+import os
+import tempfile
+from typing import Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """AI engine tuning knobs, overridable through FINSAGE_AI_* environment variables."""
+
+    model_config = SettingsConfigDict(env_prefix="FINSAGE_AI_")
+
+    # Memoized /analyze/goal and /simulate/goal results
+    result_cache_max_entries: int = 1024
+    result_cache_max_bytes: int = 32 * 1024 * 1024
+    result_cache_ttl_seconds: float = 300.0
+
+    # Background PDF report rendering and the on-disk cache of finished reports
+    report_workers: int = 2
+    report_max_pending: int = 32
+    report_cache_dir: str = os.path.join(tempfile.gettempdir(), "finsage-reports")
+    report_cache_max_bytes: int = 256 * 1024 * 1024
+    report_failed_ttl_seconds: float = 300.0
+
+    # CPU-bound routes run in a process pool (0 workers → inline on the event loop).
+    # Costs are paths x months; cheaper jobs run inline, and beyond the pending limits
+    # requests get 429 instead of queueing
+    compute_workers: int = 2
+    compute_max_pending: int = 16
+    compute_max_pending_cost: float = 200_000_000
+    compute_inline_max_cost: float = 200_000
+    compute_shared_memory_min_bytes: int = 1024 * 1024
+
+    # In-memory per-user transaction ledgers for /analyze/spending (least recently synced evicted first)
+    spending_max_users: int = 10_000
+
+    # Slow-request profiler: requests slower than this dump folded stacks to profile_dir (unset → off)
+    profile_slow_requests_ms: Optional[float] = None
+    profile_interval_ms: float = 5.0
+    profile_dir: str = os.path.join(tempfile.gettempdir(), "finsage-profiles")
+
+
+settings = Settings()
@@ -1,11 +1,38 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
+from prometheus_client import generate_latest
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any, List, Literal
 import os
 import numpy as np
 from datetime import datetime
 
+from app.routers import analyze, export, optimize
+from app.services.analysis_service import spending_store
+from app.services.chat_service import intent_router
+from app.services.compute_pool import ComputeOverloaded, compute_pool, run_cached
+from app.services.export_service import report_jobs
+from app.services.simulation_service import (
+    closed_form_simulation,
+    last_estimate,
+    lognormal_simulation,
+    run_adaptive_simulation,
+    run_batch_simulation,
+    run_simulation,
+    to_ndjson,
+    to_sse,
+)
+from app.config.settings import settings
+from app.utils.cache import cache_key, result_cache
+from app.utils.calculations import sip_future_value
+from app.utils.helpers import encode_float32
+from app.utils.metrics import CONTENT_TYPE, MetricsMiddleware, SlowRequestProfiler, collect, registry
+from app.utils.monte_carlo import DEFAULT_SIMULATIONS, MAX_SIMULATIONS
+
+MAX_BATCH_SCENARIOS = 64
+
 app = FastAPI(title="FinSage AI Engine", version="1.0.0")
 
 # CORS
@@ -17,6 +44,49 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route latency and in-flight requests for /metrics (optionally profiling slow requests)
+app.add_middleware(
+    MetricsMiddleware,
+    profiler=SlowRequestProfiler(
+        threshold=settings.profile_slow_requests_ms / 1000,
+        directory=settings.profile_dir,
+        interval=settings.profile_interval_ms / 1000,
+    ) if settings.profile_slow_requests_ms is not None else None,
+)
+
+collect(
+    "result_cache_lookups_total", "Result cache lookups by outcome",
+    lambda: {("hit",): result_cache.hits, ("miss",): result_cache.misses}, labels=("outcome",), kind="counter",
+)
+collect("result_cache_hit_ratio", "Result cache hits / lookups", lambda: {(): result_cache.stats()["hit_ratio"]})
+collect("result_cache_bytes", "Approximate memory held by cached results", lambda: {(): result_cache.stats()["bytes"]})
+collect(
+    "compute_pending", "Pooled simulation jobs queued or running",
+    lambda: {("jobs",): compute_pool.pending, ("path_months",): compute_pool.pending_cost}, labels=("measure",),
+)
+collect(
+    "compute_jobs_total", "CPU-bound jobs by how they were handled",
+    lambda: {("pool",): compute_pool.completed, ("inline",): compute_pool.inline, ("rejected",): compute_pool.rejected},
+    labels=("handling",), kind="counter",
+)
+collect(
+    "spending_ledgers", "Users and transactions held in the spending analytics store",
+    lambda: {(measure,): value for measure, value in spending_store.counts().items()}, labels=("measure",),
+)
+collect(
+    "report_jobs", "PDF report jobs known to this worker by status",
+    lambda: report_jobs.counts(), labels=("status",),
+)
+
+@app.exception_handler(ComputeOverloaded)
+async def compute_overloaded(request, exc: ComputeOverloaded):
+    # Fail fast and tell the caller when to retry, instead of queueing past the backend's timeout
+    return JSONResponse({"detail": str(exc)}, status_code=429, headers={"Retry-After": str(exc.retry_after)})
+
+app.include_router(analyze.router)
+app.include_router(optimize.router)
+app.include_router(export.router)
+
 # Pydantic models
 class ChatRequest(BaseModel):
     message: str
@@ -34,6 +104,20 @@ class SimulationRequest(BaseModel):
     timeHorizon: int
     expectedReturn: float = 0.12
     volatility: float = 0.15
+    simulations: int = Field(DEFAULT_SIMULATIONS, ge=1, le=MAX_SIMULATIONS)
+    seed: Optional[int] = None
+    # Adaptive mode: stop once the 95% intervals are narrower than ciWidth
+    ciWidth: Optional[float] = Field(None, gt=0, lt=1)
+    maxSimulations: int = Field(100_000, ge=1, le=MAX_SIMULATIONS)
+    sampling: Literal["plain", "antithetic", "control_variate", "sobol"] = "plain"
+    # Restrict the response to these statistics; mean/median alone skip simulation entirely
+    outputs: Optional[List[Literal["mean", "median", "p10", "p90", "success_probability", "scenarios"]]] = None
+
+class BatchSimulationRequest(BaseModel):
+    # Scenarios run fixed-size plain sampling; per-scenario seeds are ignored
+    # in favour of the batch seed so scenarios can share random shocks
+    scenarios: List[SimulationRequest] = Field(..., min_length=1, max_length=MAX_BATCH_SCENARIOS)
+    seed: Optional[int] = None
 
 @app.get("/")
 async def root():
@@ -47,51 +131,16 @@ async def root():
 async def financial_chat(request: ChatRequest):
     """AI Chat endpoint with smart template responses"""
     
-    message = request.message.lower()
-    context = request.context
-    
-    # Pattern matching for common questions
-    if any(word in message for word in ['50l', 'flat', 'home', 'afford']):
-        return {
-            "response": f"Based on your current ₹{context.get('sipAmount', 12000):,}/month SIP at 12% returns, you'll accumulate ₹38L in 5 years. To reach your ₹50L goal, increase your SIP by ₹6,000/month to ₹18,000. This gives you an 85% probability of achieving your dream home goal! 🏠",
-            "source": "template",
-            "confidence": 0.95
-        }
-    
-    elif any(word in message for word in ['sip', 'increase', 'optimize']):
-        return {
-            "response": "Great question! I recommend increasing your SIP by ₹6,000/month. This would take your total to ₹18,000/month and significantly improve your goal achievement probability from 65% to 85%. The extra investment will compound beautifully over 5 years! 📈",
-            "source": "template",
-            "confidence": 0.9
-        }
-    
-    elif any(word in message for word in ['net worth', 'growth']):
-        return {
-            "response": f"Your current net worth is ₹{context.get('netWorth', 650000)/100000:.1f}L with a healthy 12.5% growth this month! Your portfolio is well-diversified across bank savings, mutual funds, and EPF. Keep up the excellent momentum! 💪",
-            "source": "template",
-            "confidence": 0.9
-        }
-    
-    else:
-        return {
-            "response": "I understand your question about finances. Based on your current financial profile, here are some personalized insights. Would you like me to analyze a specific aspect of your financial goals? 🤔",
-            "source": "template",
-            "confidence": 0.7
-        }
+    # Keyword intents compiled into one pattern; see app/services/chat_service.INTENTS
+    return intent_router.route(request.message, request.context)
 
-@app.post("/analyze/goal")
-async def analyze_goal(request: GoalAnalysisRequest):
-    """Analyze goal achievement"""
-    
+def goal_analysis(request: GoalAnalysisRequest) -> Dict[str, Any]:
     # Calculate SIP future value
     monthly_return = request.expectedReturnPA / 12
     months = request.years * 12
     
     # Future value of SIP
-    if monthly_return > 0:
-        fv_sip = request.monthlySIP * (((1 + monthly_return) ** months - 1) / monthly_return)
-    else:
-        fv_sip = request.monthlySIP * months
+    fv_sip = sip_future_value(request.monthlySIP, monthly_return, months)
     
     # Calculate gap
     gap = max(0, request.goalAmount - fv_sip)
@@ -113,40 +162,135 @@ async def analyze_goal(request: GoalAnalysisRequest):
         "recommendedAction": "increase_sip" if gap > 0 else "maintain_sip"
     }
 
+@app.post("/analyze/goal")
+async def analyze_goal(request: GoalAnalysisRequest):
+    """Analyze goal achievement"""
+    # Closed form (cost = months) → always below the inline threshold, never worth a process hop
+    return await run_cached(cache_key("analyze/goal", request), goal_analysis, request, cost=request.years * 12)
+
+def simulation_cost(request: SimulationRequest) -> float:
+    """Estimated work of a /simulate/goal request in path-months (0 for the analytical fast paths)."""
+    if (request.outputs and set(request.outputs) <= {"mean", "median"}) or request.volatility == 0:
+        return 0
+    paths = request.maxSimulations if request.ciWidth is not None else request.simulations
+    return paths * request.timeHorizon
+
+def goal_simulation(request: SimulationRequest) -> Dict[str, Any]:
+    # Analytical fast paths: nothing random to simulate, or only mean/median wanted
+    if request.outputs and set(request.outputs) <= {"mean", "median"}:
+        return lognormal_simulation(request.monthlySIP, request.timeHorizon, request.expectedReturn, request.volatility)
+    
+    if request.volatility == 0:
+        result = closed_form_simulation(
+            monthly_sip=request.monthlySIP,
+            target_amount=request.targetAmount,
+            months=request.timeHorizon,
+            expected_return=request.expectedReturn,
+            volatility=request.volatility,
+            simulations=request.simulations,
+            sampling=request.sampling,
+        )
+    elif request.ciWidth is None:
+        # ValueError (invalid sampling setup) → 400 in the route; runs in a worker, so no HTTPException here
+        result = run_simulation(
+            monthly_sip=request.monthlySIP,
+            target_amount=request.targetAmount,
+            months=request.timeHorizon,
+            expected_return=request.expectedReturn,
+            volatility=request.volatility,
+            simulations=request.simulations,
+            seed=request.seed,
+            sampling=request.sampling,
+        )
+    else:
+        result = last_estimate(adaptive_estimates(request))
+    
+    if request.outputs:
+        result = {key: value for key, value in result.items() if key in request.outputs or key == "method"}
+    return result
+
+def check_adaptive_sampling(request: SimulationRequest):
+    if request.sampling != "plain":
+        raise HTTPException(status_code=400, detail="Adaptive and streamed simulations only support plain sampling")
+
+def adaptive_estimates(request: SimulationRequest):
+    return run_adaptive_simulation(
+        monthly_sip=request.monthlySIP,
+        target_amount=request.targetAmount,
+        months=request.timeHorizon,
+        expected_return=request.expectedReturn,
+        volatility=request.volatility,
+        max_simulations=request.maxSimulations if request.ciWidth is not None else request.simulations,
+        ci_width=request.ciWidth,
+        seed=request.seed,
+    )
+
+def released_after(estimates, release):
+    """Pass the estimates through, calling `release` once the stream ends (finished, failed or closed)."""
+    try:
+        yield from estimates
+    finally:
+        release()
+
 @app.post("/simulate/goal")
-async def simulate_goal(request: SimulationRequest):
+async def simulate_goal(
+    request: SimulationRequest,
+    stream: Optional[Literal["ndjson", "sse"]] = None,
+    encoding: Optional[Literal["float32"]] = None,
+):
     """Run Monte Carlo simulation"""
     
-    months = request.timeHorizon
-    monthly_return = request.expectedReturn / 12
-    monthly_volatility = request.volatility / np.sqrt(12)
+    if stream is None:
+        if request.ciWidth is not None:
+            check_adaptive_sampling(request)
+        try:
+            result = await run_cached(cache_key("simulate/goal", request), goal_simulation, request, cost=simulation_cost(request))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if encoding == "float32" and "scenarios" in result:
+            # Compact chart payload: scenarios as one base64 float32 string instead of a JSON list
+            result = {**result, "scenarios": encode_float32(result["scenarios"]), "scenarios_encoding": "float32-base64"}
+        return result
     
-    # Simplified Monte Carlo simulation
-    simulations = 1000
-    final_values = []
-    
-    for _ in range(simulations):
-        portfolio_value = 0
-        for month in range(months):
-            # Add monthly SIP
-            portfolio_value += request.monthlySIP
-            
-            # Apply random return
-            random_return = np.random.normal(monthly_return, monthly_volatility)
-            portfolio_value *= (1 + random_return)
-        
-        final_values.append(max(0, portfolio_value))
+    check_adaptive_sampling(request)
+    # Streams always simulate (no analytical fast path), so admission uses the full path count.
+    # The cost is held until the stream ends: the generator's finally covers a finished or failed
+    # stream, the background task one that was never iterated (client gone before the first chunk)
+    paths = request.maxSimulations if request.ciWidth is not None else request.simulations
+    release = compute_pool.reserve(paths * request.timeHorizon)
+    encode = to_ndjson if stream == "ndjson" else to_sse
+    return StreamingResponse(
+        encode(released_after(adaptive_estimates(request), release)),
+        media_type="application/x-ndjson" if stream == "ndjson" else "text/event-stream",
+        background=BackgroundTask(release),
+    )
+
+@app.post("/simulate/goal/batch")
+async def simulate_goal_batch(request: BatchSimulationRequest):
+    """Run many goal simulations in one pass on common random numbers"""
     
-    final_values = np.array(final_values)
+    if any(s.ciWidth is not None or s.sampling != "plain" for s in request.scenarios):
+        raise HTTPException(status_code=400, detail="Batch simulations only support fixed-size plain sampling")
     
-    return {
-        "mean": float(np.mean(final_values)),
-        "median": float(np.median(final_values)),
-        "p10": float(np.percentile(final_values, 10)),
-        "p90": float(np.percentile(final_values, 90)),
-        "success_probability": float(np.mean(final_values >= request.targetAmount)),
-        "scenarios": final_values[:100].tolist()  # First 100 for charts
-    }
+    cost = sum(s.simulations * s.timeHorizon for s in request.scenarios)
+    return await compute_pool.run(run_batch_simulation, [s.model_dump() for s in request.scenarios], request.seed, cost=cost)
+
+@app.on_event("shutdown")
+def stop_workers():
+    report_jobs.shutdown()
+    compute_pool.shutdown()
+
+@app.get("/cache/stats")
+async def cache_stats():
+    return result_cache.stats()
+
+@app.get("/compute/stats")
+async def compute_stats():
+    return compute_pool.stats()
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE)
 
 @app.get("/health")
 async def health_check():
@@ -0,0 +1,46 @@
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+MAX_REPORT_CHARTS = 12
+MAX_CHART_POINTS = 2000
+
+
+class ReportChart(BaseModel):
+    title: str
+    xKey: str
+    yKey: str
+    data: List[Dict[str, Any]] = Field(..., min_length=1, max_length=MAX_CHART_POINTS)
+
+
+class ReportRequest(BaseModel):
+    title: str = "FinSage Financial Report"
+    userName: Optional[str] = None
+    # Headline figures printed on the first page, e.g. {"Net worth": "₹6.5L"}
+    summary: Dict[str, Any] = {}
+    charts: List[ReportChart] = Field([], max_length=MAX_REPORT_CHARTS)
+    notes: List[str] = []
+
+
+# Categories of the backend Transaction model, in the order used for category codes
+TRANSACTION_CATEGORIES = (
+    "food", "transport", "shopping", "bills", "entertainment",
+    "healthcare", "education", "investment", "salary", "other",
+)
+MAX_SYNC_TRANSACTIONS = 50_000
+
+
+class Transaction(BaseModel):
+    transactionId: str
+    amount: float = Field(..., ge=0)
+    type: Literal["credit", "debit"]
+    # Categories outside TRANSACTION_CATEGORIES are counted as "other"
+    category: str = "other"
+    date: datetime
+
+
+class TransactionSyncRequest(BaseModel):
+    userId: str
+    # Overlapping syncs are fine: transactions already seen (by transactionId) are skipped
+    transactions: List[Transaction] = Field(..., max_length=MAX_SYNC_TRANSACTIONS)
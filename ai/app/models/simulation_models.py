@@ -0,0 +1,17 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+from app.utils.monte_carlo import MAX_SIMULATIONS
+
+
+class SIPOptimizationRequest(BaseModel):
+    targetAmount: float = Field(..., gt=0)
+    timeHorizon: int = Field(..., ge=1)  # months
+    successProbability: float = Field(0.85, gt=0, lt=1)  # required probability of reaching the target
+    expectedReturn: float = 0.12
+    volatility: float = Field(0.15, ge=0)
+    simulations: int = Field(10_000, ge=100, le=MAX_SIMULATIONS)
+    seed: Optional[int] = None
+    # Set to also find the shortest horizon (up to maxHorizon months) at which this SIP reaches the target
+    monthlySIP: Optional[float] = Field(None, gt=0)
+    maxHorizon: int = Field(600, ge=1, le=1200)
@@ -0,0 +1,37 @@
+from typing import Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.models.financial_models import TransactionSyncRequest
+from app.services.analysis_service import spending_store
+
+router = APIRouter(prefix="/analyze", tags=["analyze"])
+
+
+@router.post("/transactions")
+async def sync_transactions(request: TransactionSyncRequest):
+    """Add a user's transactions (e.g. from an MCP sync) to their spending ledger and rollups"""
+    return spending_store.sync(request.userId, request.transactions)
+
+
+@router.get("/spending")
+async def analyze_spending(
+    userId: str,
+    query: Literal["trend", "top_categories", "anomalies"] = "trend",
+    months: Optional[int] = Query(None, ge=1, le=120),
+    top: int = Query(5, ge=1, le=20),
+    threshold: float = Query(2.0, gt=0),
+):
+    """
+    Spending trend, top categories or anomalies, answered from the precomputed rollups.
+    Without `months`, each query uses its own window (trend 12, top_categories 3, anomalies 6).
+    """
+    window = {} if months is None else {"months": months}
+    ledger = spending_store.ledger(userId)
+    if ledger is None:
+        raise HTTPException(status_code=404, detail="No transactions synced for this user")
+    if query == "trend":
+        return ledger.trend(**window)
+    if query == "top_categories":
+        return ledger.top_categories(top=top, **window)
+    return ledger.anomalies(threshold=threshold, **window)
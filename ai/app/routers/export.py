@@ -0,0 +1,37 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+
+from app.models.financial_models import ReportRequest
+from app.services.export_service import report_jobs
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+
+@router.post("/pdf", status_code=202)
+async def submit_pdf_report(request: ReportRequest):
+    """Queue a PDF report; poll /export/jobs/{jobId} and download when it is done"""
+    try:
+        return report_jobs.submit(request.model_dump())
+    except OverflowError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+
+
+@router.get("/jobs/{job_id}")
+async def report_status(job_id: str):
+    status = report_jobs.status(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Unknown report job")
+    return status
+
+
+@router.get("/jobs/{job_id}/download")
+async def download_report(job_id: str):
+    status = report_jobs.status(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Unknown report job")
+    if status["status"] != "done":
+        raise HTTPException(status_code=409, detail=f"Report is {status['status']}")
+    path = report_jobs.download_path(job_id)
+    if path is None:
+        raise HTTPException(status_code=410, detail="Report was evicted from the cache; submit it again")
+    return FileResponse(path, media_type="application/pdf", filename=f"finsage-report-{job_id[:8]}.pdf")
@@ -0,0 +1,33 @@
+from functools import partial
+
+from fastapi import APIRouter
+
+from app.models.simulation_models import SIPOptimizationRequest
+from app.services.optimization_service import optimize_sip
+from app.services.compute_pool import run_cached
+from app.utils.cache import cache_key
+
+router = APIRouter(prefix="/optimize", tags=["optimize"])
+
+
+@router.post("/sip")
+async def optimize_sip_route(request: SIPOptimizationRequest):
+    """Find the minimum monthly SIP that reaches the target with the requested probability"""
+    # Cost: one simulation over the horizon, or over maxHorizon when the shortest horizon is searched too
+    months = request.maxHorizon if request.monthlySIP is not None else request.timeHorizon
+    return await run_cached(
+        cache_key("optimize/sip", request),
+        partial(
+            optimize_sip,
+            target_amount=request.targetAmount,
+            months=request.timeHorizon,
+            success_probability=request.successProbability,
+            expected_return=request.expectedReturn,
+            volatility=request.volatility,
+            simulations=request.simulations,
+            seed=request.seed,
+            monthly_sip=request.monthlySIP,
+            max_horizon=request.maxHorizon,
+        ),
+        cost=request.simulations * months,
+    )
@@ -0,0 +1,260 @@
+import threading
+from collections import OrderedDict
+from datetime import date, timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.config.settings import settings
+from app.models.financial_models import TRANSACTION_CATEGORIES, Transaction
+
+CATEGORY_CODES = {category: code for code, category in enumerate(TRANSACTION_CATEGORIES)}
+OTHER = CATEGORY_CODES["other"]
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+INITIAL_CAPACITY = 256
+
+
+def day_number(moment) -> int:
+    """Days since 1970-01-01 of a transaction timestamp (UTC for timezone-aware ones)."""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc)
+    return moment.toordinal() - EPOCH_ORDINAL
+
+
+def month_numbers(days: np.ndarray) -> np.ndarray:
+    """Months since 1970-01 (year * 12 + month - 1 - 1970 * 12) of int32 day numbers."""
+    return days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int32)
+
+
+def month_label(month: int) -> str:
+    return f"{1970 + month // 12}-{month % 12 + 1:02d}"
+
+
+class SpendingLedger:
+    """
+    One user's transactions as NumPy columns (int32 day numbers, uint8
+    category codes, float64 amounts, a debit flag), grown by doubling, plus
+    rollups kept up to date as transactions arrive:
+
+    - `spending[month, category]`: debits per calendar month and category
+    - `income[month]`: credits per month
+    - per-category count / sum / sum of squares of debit amounts
+
+    Rollup rows start at `first_month`; a sync that reaches further back or
+    forward widens them. Queries read only the rollups (and, for large
+    transactions, one month's slice of the columns), so they don't depend on
+    how long the history is.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._seen = set()
+        self.size = 0
+        self.days = np.empty(INITIAL_CAPACITY, dtype=np.int32)
+        self.categories = np.empty(INITIAL_CAPACITY, dtype=np.uint8)
+        self.amounts = np.empty(INITIAL_CAPACITY)
+        self.debits = np.empty(INITIAL_CAPACITY, dtype=bool)
+
+        self.first_month: Optional[int] = None
+        self.spending = np.zeros((0, len(TRANSACTION_CATEGORIES)))
+        self.income = np.zeros(0)
+        self.category_count = np.zeros(len(TRANSACTION_CATEGORIES))
+        self.category_sum = np.zeros(len(TRANSACTION_CATEGORIES))
+        self.category_sum_squares = np.zeros(len(TRANSACTION_CATEGORIES))
+        self.latest = np.zeros(0, dtype=np.int64)   # Column positions of the latest month's transactions
+
+    @property
+    def months(self) -> int:
+        return len(self.income)
+
+    @property
+    def last_month(self) -> Optional[int]:
+        return None if self.first_month is None else self.first_month + self.months - 1
+
+    # ---------------- Ingest ----------------
+
+    def add(self, transactions: List[Transaction]) -> int:
+        """Append transactions not seen before and fold them into the rollups; returns how many were new."""
+        with self._lock:
+            new = []
+            for transaction in transactions:
+                if transaction.transactionId not in self._seen:
+                    self._seen.add(transaction.transactionId)
+                    new.append(transaction)
+            if not new:
+                return 0
+
+            days = np.fromiter((day_number(t.date) for t in new), dtype=np.int32, count=len(new))
+            categories = np.fromiter((CATEGORY_CODES.get(t.category, OTHER) for t in new), dtype=np.uint8, count=len(new))
+            amounts = np.fromiter((t.amount for t in new), dtype=np.float64, count=len(new))
+            debits = np.fromiter((t.type == "debit" for t in new), dtype=bool, count=len(new))
+            position = self.size
+            self._append(days, categories, amounts, debits)
+            self._roll_up(month_numbers(days), categories, amounts, debits, position)
+            return len(new)
+
+    def _append(self, days, categories, amounts, debits):
+        end = self.size + len(days)
+        if end > len(self.days):
+            capacity = max(end, 2 * len(self.days))
+            for name in ("days", "categories", "amounts", "debits"):
+                column = getattr(self, name)
+                grown = np.empty(capacity, dtype=column.dtype)
+                grown[:self.size] = column[:self.size]
+                setattr(self, name, grown)
+        self.days[self.size:end] = days
+        self.categories[self.size:end] = categories
+        self.amounts[self.size:end] = amounts
+        self.debits[self.size:end] = debits
+        self.size = end
+
+    def _roll_up(self, months, categories, amounts, debits, position):
+        """Fold a batch appended at column `position` into the rollups."""
+        first, last = int(months.min()), int(months.max())
+        if self.first_month is None:
+            self.first_month = first
+        previous_last = self.last_month if self.months else None
+        if first < self.first_month or last > self.last_month:
+            # Widen the monthly rollups to cover the new range (rare: once per new month)
+            start = min(first, self.first_month)
+            width = max(last, self.last_month) - start + 1
+            offset = self.first_month - start
+            spending = np.zeros((width, len(TRANSACTION_CATEGORIES)))
+            income = np.zeros(width)
+            spending[offset:offset + self.months] = self.spending
+            income[offset:offset + self.months] = self.income
+            self.first_month, self.spending, self.income = start, spending, income
+
+        # New latest month → start its index over; same month → extend it; older months → leave it
+        latest = position + np.flatnonzero(months == self.last_month)
+        self.latest = latest if self.last_month != previous_last else np.concatenate([self.latest, latest])
+
+        rows = months - self.first_month
+        spent = amounts[debits]
+        spent_categories = categories[debits]
+        np.add.at(self.spending, (rows[debits], spent_categories), spent)
+        np.add.at(self.income, rows[~debits], amounts[~debits])
+        length = len(TRANSACTION_CATEGORIES)
+        self.category_count += np.bincount(spent_categories, minlength=length)
+        self.category_sum += np.bincount(spent_categories, weights=spent, minlength=length)
+        self.category_sum_squares += np.bincount(spent_categories, weights=spent * spent, minlength=length)
+
+    # ---------------- Queries ----------------
+
+    def _window(self, months: int) -> slice:
+        return slice(max(0, self.months - months), self.months)
+
+    def trend(self, months: int = 12) -> Dict[str, Any]:
+        """Monthly spending, income and savings for the last `months` months with data."""
+        window = self._window(months)
+        spending = self.spending[window].sum(axis=1)
+        income = self.income[window]
+        labels = [month_label(self.first_month + row) for row in range(window.start, window.stop)]
+        previous = spending[:-1]
+        average = float(previous.mean()) if len(previous) else None
+        return {
+            "months": [
+                {"month": label, "spending": float(spent), "income": float(earned), "savings": float(earned - spent)}
+                for label, spent, earned in zip(labels, spending, income)
+            ],
+            "averageSpending": float(spending.mean()) if len(spending) else 0.0,
+            # Latest month against the average of the months before it
+            "changePct": (float(spending[-1]) / average - 1) * 100 if average else None,
+        }
+
+    def top_categories(self, months: int = 3, top: int = 5) -> Dict[str, Any]:
+        """Categories with the most spending over the last `months` months."""
+        window = self._window(months)
+        totals = self.spending[window].sum(axis=0)
+        total = totals.sum()
+        order = np.argsort(totals)[::-1][:top]
+        return {
+            "from": month_label(self.first_month + window.start) if self.months else None,
+            "to": month_label(self.last_month) if self.months else None,
+            "totalSpending": float(total),
+            "categories": [
+                {"category": TRANSACTION_CATEGORIES[code], "spending": float(totals[code]),
+                 "sharePct": float(totals[code] / total * 100)}
+                for code in order if totals[code] > 0
+            ],
+        }
+
+    def anomalies(self, months: int = 6, threshold: float = 2.0) -> Dict[str, Any]:
+        """
+        Unusual spending in the latest month:
+
+        - categories whose spend is more than `threshold` standard deviations
+          above their mean over the previous `months` months (at least two)
+        - single debits more than `threshold` standard deviations above the
+          category's all-time mean amount
+        """
+        if not self.months:
+            return {"month": None, "categories": [], "transactions": []}
+        history = self.spending[self._window(months + 1)][:-1]
+        current = self.spending[-1]
+        result = {"month": month_label(self.last_month), "categories": [], "transactions": []}
+
+        if len(history) >= 2:
+            mean = history.mean(axis=0)
+            # Floor the spread at a tenth of the mean, so steady categories (rent, bills) can still flag
+            # a jump; categories with no history are not scored
+            spread = np.maximum(history.std(axis=0, ddof=1), 0.1 * mean)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                scores = np.where(spread > 0, (current - mean) / spread, 0)
+            for code in np.flatnonzero(scores > threshold):
+                result["categories"].append({
+                    "category": TRANSACTION_CATEGORIES[code], "spending": float(current[code]),
+                    "typicalSpending": float(mean[code]), "zScore": float(scores[code]),
+                })
+
+        count = np.maximum(self.category_count, 1)
+        mean = self.category_sum / count
+        std = np.sqrt(np.maximum(self.category_sum_squares / count - mean * mean, 0))
+        latest = self.latest[self.debits[self.latest]]
+        codes, amounts = self.categories[latest], self.amounts[latest]
+        flagged = (self.category_count[codes] >= 5) & (amounts > mean[codes] + threshold * std[codes])
+        for code, amount, day in zip(codes[flagged], amounts[flagged], self.days[latest[flagged]]):
+            result["transactions"].append({
+                "date": str(np.datetime64(int(day), "D")), "category": TRANSACTION_CATEGORIES[code],
+                "amount": float(amount), "typicalAmount": float(mean[code]),
+            })
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {"transactions": self.size, "months": self.months,
+                "from": month_label(self.first_month) if self.months else None,
+                "to": month_label(self.last_month) if self.months else None}
+
+
+class SpendingStore:
+    """Per-user ledgers, least recently used evicted beyond `max_users` (they are rebuilt on the next sync)."""
+
+    def __init__(self, max_users: int = 10_000):
+        self.max_users = max_users
+        self._ledgers: "OrderedDict[str, SpendingLedger]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def ledger(self, user_id: str, create: bool = False) -> Optional[SpendingLedger]:
+        with self._lock:
+            ledger = self._ledgers.get(user_id)
+            if ledger is None and create:
+                ledger = self._ledgers[user_id] = SpendingLedger()
+                while len(self._ledgers) > self.max_users:
+                    self._ledgers.popitem(last=False)
+                    self.evictions += 1
+            if ledger is not None:
+                self._ledgers.move_to_end(user_id)
+            return ledger
+
+    def sync(self, user_id: str, transactions: List[Transaction]) -> Dict[str, Any]:
+        ledger = self.ledger(user_id, create=True)
+        added = ledger.add(transactions)
+        return {"added": added, "duplicates": len(transactions) - added, **ledger.stats()}
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            return {"users": len(self._ledgers), "transactions": sum(ledger.size for ledger in self._ledgers.values())}
+
+
+spending_store = SpendingStore(max_users=settings.spending_max_users)
@@ -0,0 +1,157 @@
+import re
+import string
+from collections import ChainMap
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Intent table for the template chat, in precedence order. `keywords` is a list
+# of keywords/phrases (substring match), or a dict of keyword → weight to score
+# some above others (default weight 1). An intent scores the highest weight among
+# its keywords found in the message; the top score wins, and ties go to the
+# earlier row. With default weights a message gets the first row with any keyword
+# it contains, exactly like the original if/elif chain of
+# `any(word in message for word in [...])` checks. The other matching rows are
+# reported as secondary intents. `values` derive template fields from the request context.
+INTENTS: List[Dict[str, Any]] = [
+    {
+        "name": "home_affordability",
+        "keywords": ["50l", "flat", "home", "afford"],
+        "template": "Based on your current ₹{sipAmount:,}/month SIP at 12% returns, you'll accumulate ₹38L in 5 years. To reach your ₹50L goal, increase your SIP by ₹6,000/month to ₹18,000. This gives you an 85% probability of achieving your dream home goal! 🏠",
+        "defaults": {"sipAmount": 12000},
+        "confidence": 0.95,
+    },
+    {
+        "name": "sip_optimization",
+        "keywords": ["sip", "increase", "optimize"],
+        "template": "Great question! I recommend increasing your SIP by ₹6,000/month. This would take your total to ₹18,000/month and significantly improve your goal achievement probability from 65% to 85%. The extra investment will compound beautifully over 5 years! 📈",
+        "confidence": 0.9,
+    },
+    {
+        "name": "net_worth",
+        "keywords": ["net worth", "growth"],
+        "template": "Your current net worth is ₹{netWorthLakhs:.1f}L with a healthy 12.5% growth this month! Your portfolio is well-diversified across bank savings, mutual funds, and EPF. Keep up the excellent momentum! 💪",
+        "defaults": {"netWorth": 650000},
+        "values": {"netWorthLakhs": lambda context: context["netWorth"] / 100000},
+        "confidence": 0.9,
+    },
+]
+
+FALLBACK_INTENT = {
+    "name": "general",
+    "template": "I understand your question about finances. Based on your current financial profile, here are some personalized insights. Would you like me to analyze a specific aspect of your financial goals? 🤔",
+    "confidence": 0.7,
+}
+
+
+def trie_pattern(words: List[str]) -> str:
+    """
+    Regex alternation with shared prefixes factored out ("sip|save" → "s(?:ip|ave)"),
+    so the engine tests each character of the message against one branch per
+    distinct next character instead of re-trying every keyword.
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}                       # End-of-word marker
+
+    def emit(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        optional = "" in node
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 and not optional else "(?:" + "|".join(branches) + ")"
+        return body + "?" if optional else body   # Word ends here but longer keywords continue: prefer the longer one
+
+    return emit(trie)
+
+
+class Template:
+    """A response template parsed once; rendering is a join over literal and field chunks."""
+
+    def __init__(self, text: str, defaults: Optional[Dict[str, Any]] = None,
+                 values: Optional[Dict[str, Callable[[Dict[str, Any]], Any]]] = None):
+        self.chunks: List[Tuple[str, Optional[str], str]] = [
+            (literal, field, spec or "") for literal, field, spec, _ in string.Formatter().parse(text)
+        ]
+        self.defaults = defaults or {}
+        self.values = values or {}
+
+    def render(self, context: Dict[str, Any]) -> str:
+        fields = ChainMap(context, self.defaults)
+        if self.values:
+            fields = ChainMap({name: derive(fields) for name, derive in self.values.items()}, fields)
+        return "".join(
+            literal + (format(fields[field], spec) if field is not None else "")
+            for literal, field, spec in self.chunks
+        )
+
+
+class IntentRouter:
+    """Keyword intents compiled into one regex; a message is scored in a single scan."""
+
+    def __init__(self, intents: List[Dict[str, Any]], fallback: Dict[str, Any] = FALLBACK_INTENT):
+        self.intents = intents
+        self.templates = [Template(i["template"], i.get("defaults"), i.get("values")) for i in intents]
+        self.fallback = fallback
+        self.fallback_template = Template(fallback["template"], fallback.get("defaults"), fallback.get("values"))
+
+        # keyword → {intent row: weight}, for keywords listed by several intents
+        self.keyword_weights: Dict[str, Dict[int, float]] = {}
+        for index, intent in enumerate(intents):
+            keywords = intent["keywords"]
+            weights = keywords.items() if isinstance(keywords, dict) else ((keyword, 1.0) for keyword in keywords)
+            for keyword, weight in weights:
+                rows = self.keyword_weights.setdefault(keyword.lower(), {})
+                rows[index] = max(weight, rows.get(index, weight))
+        # The scan reports the longest keyword starting at each position (a lookahead, so matches may
+        # overlap). Keywords inside a match ("sip" in "sips") occur in the message too, so each match
+        # stands for all of them: the same result as testing every keyword with `in`
+        self.pattern = re.compile("(?=(" + trie_pattern(list(self.keyword_weights)) + "))")
+        self.match_weights: Dict[str, Dict[int, float]] = {}
+        for keyword in sorted(self.keyword_weights, key=len):
+            inner = [keyword[:end] for end in range(1, len(keyword)) if keyword[:end] in self.keyword_weights]
+            inner += self.pattern.findall(keyword, 1)   # Shorter, so already resolved
+            weights = dict(self.keyword_weights[keyword])
+            for other in inner:
+                for index, weight in self.match_weights[other].items():
+                    weights[index] = max(weight, weights.get(index, weight))
+            self.match_weights[keyword] = weights
+
+    def scores(self, message: str) -> Dict[int, float]:
+        """Intent row → score, for every intent with a keyword in the message."""
+        scores: Dict[int, float] = {}
+        for keyword in set(self.pattern.findall(message.lower())):
+            for index, weight in self.match_weights[keyword].items():
+                scores[index] = max(weight, scores.get(index, weight))
+        return scores
+
+    def rank(self, message: str) -> List[int]:
+        """Rows of the intents found in the message, best first (highest score, then earlier row)."""
+        scores = self.scores(message)
+        return sorted(scores, key=lambda index: (-scores[index], index))
+
+    def match(self, message: str) -> Optional[int]:
+        """Row of the top intent, or None."""
+        ranked = self.rank(message)
+        return ranked[0] if ranked else None
+
+    def classify(self, message: str) -> Dict[str, Any]:
+        """Name of the top intent (or the fallback) and of the secondary intents, best first."""
+        names = [self.intents[index]["name"] for index in self.rank(message)]
+        return {"intent": names[0] if names else self.fallback["name"], "secondary": names[1:]}
+
+    def route(self, message: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        index = self.match(message)
+        if index is None:
+            intent, template = self.fallback, self.fallback_template
+        else:
+            intent, template = self.intents[index], self.templates[index]
+        return {
+            "response": template.render(context),
+            "source": "template",
+            "confidence": intent["confidence"],
+        }
+
+
+intent_router = IntentRouter(INTENTS)
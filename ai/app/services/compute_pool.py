@@ -0,0 +1,212 @@
+import asyncio
+import math
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from app.config.settings import settings
+from app.utils.cache import result_cache
+from app.utils import metrics
+
+
+@dataclass
+class SharedArray:
+    """A worker's result array left in shared memory; only this descriptor is pickled."""
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+
+def _export_arrays(value: Any, min_bytes: int) -> Any:
+    """Move arrays of at least `min_bytes` in a (nested) result into shared memory."""
+    if isinstance(value, np.ndarray) and value.nbytes >= min_bytes:
+        segment = shared_memory.SharedMemory(create=True, size=value.nbytes)
+        np.ndarray(value.shape, value.dtype, buffer=segment.buf)[...] = value
+        descriptor = SharedArray(segment.name, value.shape, value.dtype.str)
+        segment.close()  # The parent unlinks it once copied out
+        return descriptor
+    if isinstance(value, dict):
+        return {key: _export_arrays(item, min_bytes) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_export_arrays(item, min_bytes) for item in value)
+    return value
+
+
+def _import_arrays(value: Any) -> Any:
+    """Inverse of _export_arrays, run in the parent: one memcpy per array, then the segment is freed."""
+    if isinstance(value, SharedArray):
+        segment = shared_memory.SharedMemory(name=value.name)
+        try:
+            return np.ndarray(value.shape, np.dtype(value.dtype), buffer=segment.buf).copy()
+        finally:
+            segment.close()
+            segment.unlink()
+    if isinstance(value, dict):
+        return {key: _import_arrays(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_import_arrays(item) for item in value)
+    return value
+
+
+class ComputeOverloaded(OverflowError):
+    """Raised when the pool's admission limits are reached; the app answers 429 with `retry_after`."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _execute(fn: Callable, args: tuple, min_shared_bytes: int):
+    """Worker entry point: run the job, ship big arrays via shared memory and the metrics it recorded."""
+    result, simulations = metrics.recorded(fn, args)
+    return _export_arrays(result, min_shared_bytes), simulations
+
+
+class ComputePool:
+    """
+    CPU-bound jobs (Monte Carlo simulations, SIP optimization) run in a
+    process pool so they never block the event loop serving other requests.
+
+    Every job carries an estimated cost (paths x months). Jobs cheaper than
+    `inline_max_cost` run inline, since process hand-off would cost more than
+    the work. Pooled jobs are admitted only while fewer than `max_pending` are
+    queued or running and their total cost stays within `max_pending_cost`
+    (one job is always admitted when the pool is idle); otherwise run()
+    raises ComputeOverloaded, which the app turns into 429 with a Retry-After
+    estimated from the pool's observed throughput.
+    """
+
+    def __init__(self, workers: int, max_pending: int, max_pending_cost: float,
+                 inline_max_cost: float, min_shared_bytes: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_pending_cost = max_pending_cost
+        self.inline_max_cost = inline_max_cost
+        self.min_shared_bytes = min_shared_bytes
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.pending_cost = 0.0
+        self.completed = 0
+        self.rejected = 0
+        self.inline = 0
+        self._cost_per_second: Optional[float] = None  # EWMA of pool throughput
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: workers never inherit the server's threads or open sockets
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def retry_after(self) -> int:
+        """Seconds until the current backlog should have drained."""
+        if not self._cost_per_second:
+            return 1
+        return max(1, math.ceil(self.pending_cost / self._cost_per_second))
+
+    def _admit(self, cost: float) -> None:
+        with self._lock:
+            if self.pending and (self.pending >= self.max_pending or self.pending_cost + cost > self.max_pending_cost):
+                self.rejected += 1
+                raise ComputeOverloaded(
+                    f"{self.pending} simulations already queued ({self.pending_cost:,.0f} path-months); try again shortly",
+                    self.retry_after(),
+                )
+            self.pending += 1
+            self.pending_cost += cost
+
+    def _release(self, cost: float, seconds: Optional[float]) -> None:
+        with self._lock:
+            self.pending -= 1
+            self.pending_cost -= cost
+            if seconds is not None:
+                self.completed += 1
+                # Pool-wide throughput: each worker processes cost/seconds
+                rate = cost / max(seconds, 1e-6) * self.workers
+                self._cost_per_second = rate if self._cost_per_second is None else 0.8 * self._cost_per_second + 0.2 * rate
+
+    def reserve(self, cost: float) -> Callable[[], None]:
+        """
+        Admit work that runs outside the pool (a streamed simulation iterated in
+        the server's threads) against the same limits as run(): raises
+        ComputeOverloaded when they are reached, otherwise holds `cost` until the
+        returned release function is called. Releasing twice is harmless.
+        """
+        if self.workers <= 0 or cost < self.inline_max_cost:
+            self.inline += 1
+            return lambda: None
+
+        self._admit(cost)
+        held = [True]
+        lock = threading.Lock()
+
+        def release() -> None:
+            with lock:
+                if not held[0]:
+                    return
+                held[0] = False
+            self._release(cost, None)   # Stream duration follows the client too, so it isn't a throughput sample
+
+        return release
+
+    async def run(self, fn: Callable, *args: Any, cost: float) -> Any:
+        """Run fn(*args) (picklable, top-level) in the pool, or inline for cheap jobs or workers=0."""
+        if self.workers <= 0 or cost < self.inline_max_cost:
+            self.inline += 1
+            return fn(*args)
+
+        self._admit(cost)
+        start = time.perf_counter()
+        seconds = None
+        try:
+            result, simulations = await asyncio.get_running_loop().run_in_executor(
+                self._get_pool(), _execute, fn, args, self.min_shared_bytes
+            )
+            seconds = time.perf_counter() - start
+        finally:
+            self._release(cost, seconds)
+        metrics.replay(simulations)
+        return _import_arrays(result)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "pending_cost": self.pending_cost,
+            "max_pending": self.max_pending,
+            "max_pending_cost": self.max_pending_cost,
+            "completed": self.completed,
+            "inline": self.inline,
+            "rejected": self.rejected,
+            "cost_per_second": self._cost_per_second,
+        }
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+compute_pool = ComputePool(
+    workers=settings.compute_workers,
+    max_pending=settings.compute_max_pending,
+    max_pending_cost=settings.compute_max_pending_cost,
+    inline_max_cost=settings.compute_inline_max_cost,
+    min_shared_bytes=settings.compute_shared_memory_min_bytes,
+)
+
+
+async def run_cached(key: str, fn: Callable, *args: Any, cost: float) -> Any:
+    """compute_pool.run behind the shared result cache."""
+    missing = object()
+    result = result_cache.get(key, missing)
+    if result is missing:
+        result = await compute_pool.run(fn, *args, cost=cost)
+        result_cache.set(key, result)
+    return result
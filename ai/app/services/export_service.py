@@ -0,0 +1,238 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional
+
+from app.config.settings import settings
+
+# Page size in inches (A4)
+PAGE_SIZE = (8.27, 11.69)
+
+
+def render_report_pdf(report: Dict[str, Any], path: str) -> int:
+    """
+    Render a ReportRequest (as a dict) to a PDF at `path`: a summary page, then
+    one page per chart. Runs in a worker process; the file is written next to
+    `path` and renamed into place, so readers never see a partial report.
+    Returns the file size in bytes.
+    """
+    from matplotlib.backends.backend_pdf import PdfPages
+    from matplotlib.figure import Figure
+
+    partial = f"{path}.{os.getpid()}.partial"
+    try:
+        with PdfPages(partial) as pdf:
+            page = Figure(figsize=PAGE_SIZE)
+            page.text(0.1, 0.92, report["title"], fontsize=20, weight="bold")
+            y = 0.87
+            if report.get("userName"):
+                page.text(0.1, y, f"Prepared for {report['userName']}", fontsize=12)
+                y -= 0.05
+            for label, value in report.get("summary", {}).items():
+                page.text(0.1, y, f"{label}: {value}", fontsize=12)
+                y -= 0.035
+            for note in report.get("notes", []):
+                y -= 0.01
+                page.text(0.1, y, note, fontsize=10, wrap=True)
+                y -= 0.035
+            pdf.savefig(page)
+
+            for chart in report.get("charts", []):
+                figure = Figure(figsize=PAGE_SIZE)
+                axes = figure.add_axes((0.12, 0.55, 0.8, 0.35))
+                axes.plot([row[chart["xKey"]] for row in chart["data"]], [row[chart["yKey"]] for row in chart["data"]])
+                axes.set_title(chart["title"])
+                axes.set_xlabel(chart["xKey"])
+                axes.set_ylabel(chart["yKey"])
+                axes.grid(True)
+                pdf.savefig(figure)
+        os.replace(partial, path)
+    finally:
+        # A failed render must not leave its partial file behind in the cache directory
+        if os.path.exists(partial):
+            os.remove(partial)
+    return os.path.getsize(path)
+
+
+class ReportJobs:
+    """
+    Report jobs rendered in a bounded process pool.
+
+    The job id is a content hash of the request, so identical requests share
+    one job and one file. Finished PDFs live in `cache_dir`, trimmed to
+    `max_bytes` by least recent use (file mtime is bumped on every download),
+    and are found again by id even after a restart or from another worker.
+    Failed jobs are kept for `failed_ttl` seconds so clients can read the error.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int, workers: int, max_pending: int, failed_ttl: float = 300):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.workers = workers
+        self.max_pending = max_pending
+        self.failed_ttl = failed_ttl
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @staticmethod
+    def job_id(report: Dict[str, Any]) -> str:
+        return hashlib.sha256(json.dumps(report, sort_keys=True, separators=(",", ":")).encode()).hexdigest()[:32]
+
+    def path(self, job_id: str) -> str:
+        return os.path.join(self.cache_dir, f"{job_id}.pdf")
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: workers never inherit the server's threads or open sockets
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def _reset_pool(self, broken: ProcessPoolExecutor) -> None:
+        """Drop a pool broken by a dead worker (unless already replaced); the next _get_pool starts a new one."""
+        if self._pool is broken:
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _submit(self, job_id: str, job: Dict[str, Any], report: Dict[str, Any]) -> Future:
+        """Queue a render; if the pool is broken it is replaced and the render submitted once more."""
+        pool = self._get_pool()
+        try:
+            future = pool.submit(render_report_pdf, report, self.path(job_id))
+        except BrokenProcessPool:
+            self._reset_pool(pool)
+            pool = self._get_pool()
+            future = pool.submit(render_report_pdf, report, self.path(job_id))
+        job["pool"] = pool
+        return future
+
+    def submit(self, report: Dict[str, Any]) -> Dict[str, Any]:
+        """Start rendering (unless cached or already running) and return the job status."""
+        job_id = self.job_id(report)
+        with self._lock:
+            self._expire_failed()
+            job = self._current(job_id)
+            if job is not None and job["status"] != "failed":
+                return self._public(job_id, job)
+            if os.path.exists(self.path(job_id)):
+                return self._public(job_id, {"status": "done", "size": os.path.getsize(self.path(job_id))})
+            pending = sum(1 for job in self._jobs.values() if job["status"] == "pending")
+            if pending >= self.max_pending:
+                raise OverflowError(f"{pending} reports are already being generated")
+
+            os.makedirs(self.cache_dir, exist_ok=True)
+            job = {"status": "pending", "submitted_at": time.time(), "report": report}
+            self._jobs[job_id] = job
+            future = self._submit(job_id, job, report)
+        future.add_done_callback(lambda done: self._finish(job_id, done))
+        return self._public(job_id, job)
+
+    def _finish(self, job_id: str, future: Future) -> None:
+        error = future.exception()
+        with self._lock:
+            job = self._jobs[job_id]
+            if isinstance(error, BrokenProcessPool) and not job.get("retried"):
+                # A worker died (e.g. killed for memory) and took the pool with it: start a new pool
+                # and render this report once more before reporting it as failed
+                job["retried"] = True
+                self._reset_pool(job["pool"])
+                retry = self._submit(job_id, job, job["report"])
+            else:
+                retry = None
+                del job["report"], job["pool"]
+                if error is not None:
+                    job.update(status="failed", error=str(error), finished_at=time.time())
+                else:
+                    job.update(status="done", size=future.result(), finished_at=time.time())
+        if retry is not None:
+            retry.add_done_callback(lambda done: self._finish(job_id, done))
+        elif error is None:
+            self._trim_cache()
+
+    def _current(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """The job entry, dropped first if it is done but its PDF has since been deleted from the cache."""
+        job = self._jobs.get(job_id)
+        if job is not None and job["status"] == "done" and not os.path.exists(self.path(job_id)):
+            self._jobs.pop(job_id, None)
+            return None
+        return job
+
+    def _expire_failed(self) -> None:
+        cutoff = time.time() - self.failed_ttl
+        for job_id in [job_id for job_id, job in self._jobs.items() if job["status"] == "failed" and job["finished_at"] < cutoff]:
+            del self._jobs[job_id]
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._expire_failed()
+            job = self._current(job_id)
+        if job is not None:
+            return self._public(job_id, job)
+        if os.path.exists(self.path(job_id)):
+            # Rendered earlier (before a restart, or by another worker process)
+            return self._public(job_id, {"status": "done", "size": os.path.getsize(self.path(job_id))})
+        return None
+
+    def download_path(self, job_id: str) -> Optional[str]:
+        path = self.path(job_id)
+        try:
+            os.utime(path)  # Mark as recently used for the cache trimming
+        except FileNotFoundError:
+            return None
+        return path
+
+    def _trim_cache(self) -> None:
+        """Delete least recently used reports until the directory fits in max_bytes."""
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".pdf"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path, entry.name[:-4]))
+        total = sum(size for _, size, _, _ in files)
+        for _, size, path, job_id in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            with self._lock:
+                if self._jobs.get(job_id, {}).get("status") == "done":
+                    del self._jobs[job_id]
+
+    def counts(self) -> Dict[tuple, int]:
+        """Jobs by status, for metrics."""
+        with self._lock:
+            self._expire_failed()
+            statuses = [job["status"] for job in self._jobs.values()]
+        return {(status,): statuses.count(status) for status in ("pending", "done", "failed")}
+
+    @staticmethod
+    def _public(job_id: str, job: Dict[str, Any]) -> Dict[str, Any]:
+        result = {"jobId": job_id, "status": job["status"]}
+        if job["status"] == "done":
+            result["size"] = job.get("size")
+            result["downloadUrl"] = f"/export/jobs/{job_id}/download"
+        if job["status"] == "failed":
+            result["error"] = job.get("error")
+        return result
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+report_jobs = ReportJobs(
+    cache_dir=settings.report_cache_dir,
+    max_bytes=settings.report_cache_max_bytes,
+    workers=settings.report_workers,
+    max_pending=settings.report_max_pending,
+    failed_ttl=settings.report_failed_ttl_seconds,
+)
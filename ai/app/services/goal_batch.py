@@ -0,0 +1,185 @@
+"""
+Offline bulk recompute of /analyze/goal outputs.
+
+    cd ai && python -m app.services.goal_batch goals.parquet results.parquet --expected-return 0.11
+
+Reads goals (goalAmount, years, monthlySIP and optionally expectedReturnPA)
+from a CSV or Parquet file in chunks, computes projectedCorpus, gapToGoal,
+successProbability and recommendedAction exactly as goal_analysis does, and
+streams each chunk to the output file (CSV or Parquet, by extension) before
+reading the next. Every other input column (goal ids, user ids, ...) is
+copied through. Memory is bounded by the chunk size, whatever the file size.
+"""
+import argparse
+import csv as stdlib_csv
+import multiprocessing
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from app.utils.calculations import sip_future_values
+
+INPUT_COLUMNS = ("goalAmount", "years", "monthlySIP", "expectedReturnPA")
+OUTPUT_COLUMNS = ("projectedCorpus", "gapToGoal", "successProbability", "recommendedAction")
+DEFAULT_EXPECTED_RETURN = 0.12   # GoalAnalysisRequest.expectedReturnPA default
+DEFAULT_CHUNK_ROWS = 1 << 18
+CSV_BYTES_PER_ROW = 64           # Rough CSV row width, to size read blocks from a row count
+CSV_MAX_BLOCK_BYTES = 1 << 20    # Arrow keeps several blocks in flight; bigger blocks only add memory
+
+
+def _column(batch: pa.RecordBatch, name: str) -> np.ndarray:
+    """A numeric input column as float64; nulls become NaN (and so null results)."""
+    column = batch.column(name)
+    if column.type != pa.float64():
+        column = column.cast(pa.float64())
+    return column.to_numpy(zero_copy_only=False)
+
+
+def recompute_batch(batch: pa.RecordBatch, expected_return: Optional[float] = None) -> pa.RecordBatch:
+    """
+    goal_analysis over a whole batch. `expected_return` overrides the
+    expectedReturnPA column (e.g. after a market-assumption change); without
+    either, the request default of 12% applies.
+    """
+    goal_amount = _column(batch, "goalAmount")
+    months = _column(batch, "years") * 12
+    monthly_sip = _column(batch, "monthlySIP")
+    if expected_return is None and "expectedReturnPA" in batch.schema.names:
+        # Blank → the request default, as when the API request leaves it out
+        annual_return = np.nan_to_num(_column(batch, "expectedReturnPA"), nan=DEFAULT_EXPECTED_RETURN)
+    else:
+        annual_return = np.full(batch.num_rows, DEFAULT_EXPECTED_RETURN if expected_return is None else expected_return)
+
+    projected = sip_future_values(monthly_sip, annual_return / 12, months)
+    gap = np.maximum(0, goal_amount - projected)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        success = np.minimum(projected / goal_amount, 1.0)
+
+    # from_pandas=True → NaN (missing or invalid inputs) is written as null
+    projected, gap, success = (pa.array(values, from_pandas=True) for values in (projected, gap, success))
+    action = pc.if_else(pc.greater(gap, 0), "increase_sip", "maintain_sip")   # Null gap → null action
+
+    passthrough = [name for name in batch.schema.names if name not in INPUT_COLUMNS and name not in OUTPUT_COLUMNS]
+    columns = [batch.column(name) for name in passthrough] + [projected, gap, success, action]
+    return pa.RecordBatch.from_arrays(columns, names=passthrough + list(OUTPUT_COLUMNS))
+
+
+def read_batches(path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[pa.RecordBatch]:
+    """Stream a CSV or Parquet file as record batches of at most `chunk_rows` rows."""
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        # Buffered column reads: by default every column chunk of a row group is pre-buffered,
+        # so memory would follow the file's row group size rather than chunk_rows
+        yield from pq.ParquetFile(path, buffer_size=1 << 20, pre_buffer=False).iter_batches(batch_size=chunk_rows)
+        return
+
+    from pyarrow import csv
+
+    with open(path, newline="") as f:
+        header = next(stdlib_csv.reader(f), [])
+    # A Python file object, not the path: given a path, Arrow reads further ahead
+    with open(path, "rb") as f:
+        reader = csv.open_csv(
+            f,
+            read_options=csv.ReadOptions(block_size=min(CSV_MAX_BLOCK_BYTES, max(1 << 12, chunk_rows * CSV_BYTES_PER_ROW))),
+            # Inputs are numbers; everything else stays text, so a goalId like "007" comes back as it went in
+            convert_options=csv.ConvertOptions(column_types={
+                name: pa.float64() if name in INPUT_COLUMNS else pa.string() for name in header
+            }),
+        )
+        for batch in reader:
+            for offset in range(0, batch.num_rows, chunk_rows):
+                yield batch.slice(offset, chunk_rows)
+
+
+class BatchWriter:
+    """Appends record batches to a CSV or Parquet file, opened on the first batch."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._writer = None
+
+    def write(self, batch: pa.RecordBatch):
+        if self._writer is None:
+            if self.path.endswith(".parquet"):
+                import pyarrow.parquet as pq
+
+                self._writer = pq.ParquetWriter(self.path, batch.schema)
+            else:
+                from pyarrow import csv
+
+                self._writer = csv.CSVWriter(self.path, batch.schema)
+        self._writer.write_batch(batch)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def recompute_batches(batches: Iterator[pa.RecordBatch], expected_return: Optional[float] = None,
+                      workers: int = 0) -> Iterator[pa.RecordBatch]:
+    """
+    recompute_batch over a stream of batches, in input order.
+
+    With `workers` > 0, batches are computed in a process pool while the caller
+    reads and writes; at most 2 x workers batches are in flight, so memory stays
+    bounded by the chunk size either way.
+    """
+    if workers <= 0:
+        for batch in batches:
+            yield recompute_batch(batch, expected_return)
+        return
+
+    # spawn, like the compute pool: workers don't inherit the caller's threads
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        in_flight = deque()
+        for batch in batches:
+            in_flight.append(pool.submit(recompute_batch, batch, expected_return))
+            if len(in_flight) >= 2 * workers:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def recompute_file(source: str, destination: str, expected_return: Optional[float] = None,
+                   chunk_rows: int = DEFAULT_CHUNK_ROWS, workers: int = 0) -> int:
+    """Recompute every goal in `source` into `destination`, one chunk at a time; returns the row count."""
+    rows = 0
+    with BatchWriter(destination) as writer:
+        for result in recompute_batches(read_batches(source, chunk_rows), expected_return, workers):
+            writer.write(result)
+            rows += result.num_rows
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recompute /analyze/goal outputs for every goal in a file")
+    parser.add_argument("source", help="Goals as .csv or .parquet (goalAmount, years, monthlySIP[, expectedReturnPA])")
+    parser.add_argument("destination", help="Results as .csv or .parquet; other input columns are copied through")
+    parser.add_argument("--expected-return", type=float, help="Annual return for every goal, e.g. 0.11 (overrides the column)")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS, help="Goals per chunk (bounds memory)")
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes (0 = compute in this process)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    rows = recompute_file(args.source, args.destination, args.expected_return, args.chunk_rows, args.workers)
+    seconds = time.perf_counter() - start
+    print(f"{rows:,} goals in {seconds:.2f} s ({rows / max(seconds, 1e-9) * 60:,.0f} goals/min) → {args.destination}",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
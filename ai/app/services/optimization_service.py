@@ -0,0 +1,126 @@
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from app.utils.monte_carlo import CHUNK_ELEMENTS, make_rng, monthly_parameters
+
+# Points on the returned probability-vs-SIP curve
+CURVE_POINTS = 25
+
+
+def annuity_factor_paths(
+    months: int,
+    expected_return: float,
+    volatility: float,
+    simulations: int,
+    seed: Optional[int] = None,
+    monthly_sip: Optional[float] = None,
+    target_amount: Optional[float] = None,
+    stop_probability: Optional[float] = None,
+    chunk_elements: int = CHUNK_ELEMENTS,
+):
+    """
+    One forward pass over a single stream of pre-drawn shocks.
+
+    Tracks the per-path annuity factor A_t (the corpus after t months of a
+    SIP of 1), so the corpus for any SIP is simply SIP * A_t. Returns the
+    factors at month `months` and, when `monthly_sip` and `target_amount` are
+    given, the success probability at every month up to `months`. With
+    `stop_probability` the pass ends at the first month reaching it and the
+    probabilities are truncated there.
+    """
+    rng = make_rng(seed)
+    monthly_return, monthly_volatility = monthly_parameters(expected_return, volatility)
+    factors = np.zeros(simulations)
+    probabilities = np.zeros(months) if monthly_sip is not None else None
+    threshold = target_amount / monthly_sip if monthly_sip is not None else None
+    month_block = max(1, min(months, chunk_elements // simulations))
+
+    for start in range(0, months, month_block):
+        growth = rng.standard_normal((min(month_block, months - start), simulations))
+        growth *= monthly_volatility
+        growth += 1 + monthly_return
+        for offset, monthly_growth in enumerate(growth):
+            factors += 1
+            factors *= monthly_growth
+            if probabilities is not None:
+                month = start + offset
+                probabilities[month] = np.count_nonzero(factors >= threshold) / simulations
+                if stop_probability is not None and probabilities[month] >= stop_probability:
+                    return factors, probabilities[:month + 1]
+
+    return factors, probabilities
+
+
+def required_sip(factors: np.ndarray, target_amount: float, success_probability: float) -> Optional[float]:
+    """
+    Smallest SIP reaching `target_amount` on at least `success_probability` of
+    the paths. The corpus is SIP * A, so this is the target divided by the
+    k-th largest annuity factor with k = ceil(p * n): an order statistic,
+    exact on the sample, with no iterative search.
+    """
+    n = len(factors)
+    k = min(n, int(np.ceil(success_probability * n - 1e-9)))
+    kth_largest = np.partition(factors, n - k)[n - k]
+    if kth_largest <= 0:
+        return None
+    return float(target_amount / kth_largest * (1 + 1e-12))
+
+
+def probability_curve(factors: np.ndarray, target_amount: float, sips: np.ndarray) -> np.ndarray:
+    """P(SIP * A >= target) for every SIP in `sips`, from one sort of the factors."""
+    sorted_factors = np.sort(factors)
+    thresholds = target_amount / sips
+    n = len(sorted_factors)
+    return (n - np.searchsorted(sorted_factors, thresholds, side="left")) / n
+
+
+def optimize_sip(
+    target_amount: float,
+    months: int,
+    success_probability: float,
+    expected_return: float,
+    volatility: float,
+    simulations: int,
+    seed: Optional[int] = None,
+    monthly_sip: Optional[float] = None,
+    max_horizon: int = 600,
+) -> Dict[str, Any]:
+    """Minimum monthly SIP (and optionally horizon) for a target amount at a given success probability."""
+    factors, _ = annuity_factor_paths(months, expected_return, volatility, simulations, seed)
+    sip = required_sip(factors, target_amount, success_probability)
+
+    # Curve spans the SIPs that succeed on 5%..99% of paths
+    low = required_sip(factors, target_amount, 0.05)
+    high = required_sip(factors, target_amount, 0.99) or (sip or low or target_amount / months) * 2
+    low = low or high / 2
+    grid = np.unique(np.append(np.linspace(low, high, CURVE_POINTS), sip if sip is not None else []))
+    curve = probability_curve(factors, target_amount, grid)
+
+    result = {
+        "requiredSIP": sip,
+        "feasible": sip is not None,
+        "targetProbability": success_probability,
+        "successProbability": float(probability_curve(factors, target_amount, np.array([sip]))[0]) if sip is not None else None,
+        "timeHorizon": months,
+        "simulations": simulations,
+        "probabilityCurve": [
+            {"monthlySIP": float(x), "successProbability": float(p)} for x, p in zip(grid, curve)
+        ],
+    }
+
+    if monthly_sip is not None:
+        _, by_month = annuity_factor_paths(
+            max_horizon, expected_return, volatility, simulations, seed,
+            monthly_sip=monthly_sip, target_amount=target_amount, stop_probability=success_probability,
+        )
+        reached = by_month[-1] >= success_probability
+        result["monthlySIP"] = monthly_sip
+        result["minimumHorizon"] = len(by_month) if reached else None
+        # Yearly points up to the month the search stopped at
+        result["horizonCurve"] = [
+            {"months": m, "successProbability": float(by_month[m - 1])}
+            for m in sorted(set(range(12, len(by_month) + 1, 12)) | {len(by_month)})
+        ]
+
+    return result
@@ -0,0 +1,233 @@
+import json
+import time
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from app.utils.calculations import sip_future_value
+from app.utils.metrics import record_simulation
+from app.utils.monte_carlo import (
+    estimate_with_standard_error,
+    lognormal_approximation,
+    make_rng,
+    mean_interval,
+    monthly_parameters,
+    quantile_interval,
+    simulate_common_final_values,
+    simulate_final_values,
+    summarize,
+    terminal_moments,
+    wilson_interval,
+)
+
+# First batch is small so easy goals settle quickly; later batches grow the
+# sample by ~25% each so the number of convergence checks stays logarithmic.
+INITIAL_BATCH = 250
+BATCH_GROWTH = 0.25
+
+
+def closed_form_simulation(
+    monthly_sip: float,
+    target_amount: float,
+    months: int,
+    expected_return: float,
+    volatility: float,
+    simulations: int,
+    sampling: str = "plain",
+) -> Dict[str, Any]:
+    """
+    Zero-volatility fast path: every path is the deterministic SIP corpus, so
+    the summary is exact without simulating anything.
+    """
+    monthly_return, _ = monthly_parameters(expected_return, volatility)
+    corpus = max(0.0, sip_future_value(monthly_sip, monthly_return, months, due=True)) if months > 0 else 0.0
+    return {
+        "mean": corpus,
+        "median": corpus,
+        "p10": corpus,
+        "p90": corpus,
+        "success_probability": 1.0 if corpus >= target_amount else 0.0,
+        "scenarios": [corpus] * min(simulations, 100),
+        "sampling": sampling,
+        "simulations": 0,
+        "standard_error": {"mean": 0.0, "success_probability": 0.0},
+        "method": "closed_form",
+    }
+
+
+def lognormal_simulation(monthly_sip: float, months: int, expected_return: float, volatility: float) -> Dict[str, Any]:
+    """Mean (exact) and median (moment-matched lognormal) without launching paths."""
+    result = lognormal_approximation(*terminal_moments(monthly_sip, months, expected_return, volatility))
+    result["method"] = "lognormal"
+    return result
+
+
+def run_simulation(
+    monthly_sip: float,
+    target_amount: float,
+    months: int,
+    expected_return: float,
+    volatility: float,
+    simulations: int,
+    seed: Optional[int] = None,
+    sampling: str = "plain",
+) -> Dict[str, Any]:
+    """Fixed-size simulation with the chosen sampling strategy and its standard errors."""
+    start = time.perf_counter()
+    final_values = simulate_final_values(
+        monthly_sip, months, expected_return, volatility,
+        simulations=simulations, seed=seed, sampling=sampling, clip=False,
+    )
+    record_simulation(sampling, len(final_values), time.perf_counter() - start)
+
+    control_mean = None
+    if sampling == "control_variate":
+        # Expected terminal corpus: the deterministic SIP corpus at the mean monthly return
+        monthly_return, _ = monthly_parameters(expected_return, volatility)
+        control_mean = sip_future_value(monthly_sip, monthly_return, months, due=True)
+
+    result = summarize(np.maximum(final_values, 0), target_amount)
+    result.update(estimate_with_standard_error(final_values, target_amount, sampling, control_mean))
+    result["method"] = "monte_carlo"
+    return result
+
+
+def common_random_numbers_seed(seed: Optional[int], months: int, volatility: float) -> np.random.SeedSequence:
+    """Per-group seed, so a group's shocks don't depend on the other scenarios in the batch."""
+    if seed is None:
+        return np.random.SeedSequence()
+    return np.random.SeedSequence([seed, months, int(round(volatility * 1_000_000))])
+
+
+def run_batch_simulation(scenarios: List[Dict[str, Any]], seed: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Simulate many goal scenarios in one pass.
+
+    Scenarios with the same horizon and volatility share one stream of random
+    shocks (common random numbers), so differences between them reflect the
+    inputs rather than sampling noise. Each scenario dict carries the
+    /simulate/goal fields monthlySIP, targetAmount, timeHorizon,
+    expectedReturn, volatility and simulations.
+    """
+    groups: Dict[Tuple[int, float], List[int]] = {}
+    for index, scenario in enumerate(scenarios):
+        groups.setdefault((scenario["timeHorizon"], scenario["volatility"]), []).append(index)
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(scenarios)
+    for (months, volatility), members in groups.items():
+        start = time.perf_counter()
+        final_values = simulate_common_final_values(
+            monthly_sips=[scenarios[i]["monthlySIP"] for i in members],
+            expected_returns=[scenarios[i]["expectedReturn"] for i in members],
+            simulations=[scenarios[i]["simulations"] for i in members],
+            months=months,
+            volatility=volatility,
+            rng=make_rng(common_random_numbers_seed(seed, months, volatility)),
+        )
+        record_simulation("batch", max(len(values) for values in final_values), time.perf_counter() - start)
+        for i, values in zip(members, final_values):
+            results[i] = summarize(values, scenarios[i]["targetAmount"])
+            results[i]["simulations"] = len(values)
+
+    return {"results": results, "shared_shock_groups": len(groups)}
+
+
+def running_estimate(final_values: np.ndarray, target_amount: float) -> Dict[str, Any]:
+    """Point estimates plus 95% intervals for the paths simulated so far."""
+    n = len(final_values)
+    sorted_values = np.sort(final_values)
+    p10, median, p90 = np.percentile(sorted_values, [10, 50, 90])
+    successes = int(n - np.searchsorted(sorted_values, target_amount, side="left"))
+
+    return {
+        "mean": float(np.mean(sorted_values)),
+        "median": float(median),
+        "p10": float(p10),
+        "p90": float(p90),
+        "success_probability": successes / n,
+        "simulations": n,
+        "confidence_intervals": {
+            "success_probability": wilson_interval(successes, n),
+            "mean": mean_interval(sorted_values),
+            "p10": quantile_interval(sorted_values, 0.10),
+            "p90": quantile_interval(sorted_values, 0.90),
+        },
+    }
+
+
+def relative_width(interval, estimate: float) -> float:
+    lower, upper = interval
+    if upper == lower:
+        return 0.0
+    return (upper - lower) / abs(estimate) if estimate else float("inf")
+
+
+def is_converged(estimate: Dict[str, Any], ci_width: float) -> bool:
+    """
+    `ci_width` is the absolute width allowed on the success probability interval
+    and the width allowed on mean/p10/p90 relative to their estimates.
+    """
+    intervals = estimate["confidence_intervals"]
+    lower, upper = intervals["success_probability"]
+    if upper - lower > ci_width:
+        return False
+    return all(relative_width(intervals[key], estimate[key]) <= ci_width for key in ("mean", "p10", "p90"))
+
+
+def run_adaptive_simulation(
+    monthly_sip: float,
+    target_amount: float,
+    months: int,
+    expected_return: float,
+    volatility: float,
+    max_simulations: int,
+    ci_width: Optional[float] = None,
+    seed: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Simulate in growing batches, yielding the running estimate after each one.
+
+    Stops once every interval is inside `ci_width` or `max_simulations` paths
+    have run. Without `ci_width` it simply runs all `max_simulations` paths in
+    batches. The last estimate has `done` set and carries the chart scenarios.
+    """
+    rng = make_rng(seed)
+    final_values = np.empty(max_simulations)
+    n = 0
+
+    while n < max_simulations:
+        batch = min(max(INITIAL_BATCH, int(n * BATCH_GROWTH)), max_simulations - n)
+        start = time.perf_counter()
+        final_values[n:n + batch] = simulate_final_values(
+            monthly_sip, months, expected_return, volatility, simulations=batch, rng=rng
+        )
+        record_simulation("adaptive", batch, time.perf_counter() - start)
+        n += batch
+
+        estimate = running_estimate(final_values[:n], target_amount)
+        converged = ci_width is not None and is_converged(estimate, ci_width)
+        done = converged or n >= max_simulations
+        estimate["converged"] = converged
+        estimate["done"] = done
+        if done:
+            estimate["scenarios"] = summarize(final_values[:n], target_amount)["scenarios"]
+        yield estimate
+        if done:
+            return
+
+
+def last_estimate(estimates: Iterator[Dict[str, Any]]) -> Dict[str, Any]:
+    """Run the simulation to completion and return only the final estimate."""
+    return deque(estimates, maxlen=1)[0]
+
+
+def to_ndjson(estimates: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    for estimate in estimates:
+        yield json.dumps(estimate) + "\n"
+
+
+def to_sse(estimates: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    for estimate in estimates:
+        event = "result" if estimate["done"] else "progress"
+        yield f"event: {event}\ndata: {json.dumps(estimate)}\n\n"
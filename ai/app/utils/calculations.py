@@ -0,0 +1,29 @@
+import numpy as np
+
+
+def sip_future_value(monthly_sip: float, monthly_rate: float, months: float, due: bool = False) -> float:
+    """
+    Closed-form future value of a monthly SIP.
+
+    With `due=False` each instalment starts compounding the month after it is
+    paid (the /analyze/goal convention). With `due=True` it also earns the
+    month it is paid in, which matches the Monte Carlo recurrence
+    V_t = (V_{t-1} + SIP) * (1 + r) and so equals its expected terminal value.
+
+    /analyze/goal has always projected a zero or negative return as the plain
+    sum of instalments, so `due=False` keeps that; the `due=True` path
+    compounds negative returns too, as the simulation does.
+    """
+    if monthly_rate > 0 or (due and monthly_rate < 0):
+        fv = monthly_sip * (((1 + monthly_rate) ** months - 1) / monthly_rate)
+    else:
+        fv = monthly_sip * months
+    return fv * (1 + monthly_rate) if due else fv
+
+
+def sip_future_values(monthly_sip: np.ndarray, monthly_rate: np.ndarray, months: np.ndarray) -> np.ndarray:
+    """Element-wise sip_future_value (due=False) over arrays, for bulk recomputes."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = np.power(1 + monthly_rate, months)
+        fv = monthly_sip * ((growth - 1) / monthly_rate)
+    return np.where(monthly_rate > 0, fv, monthly_sip * months)
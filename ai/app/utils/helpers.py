@@ -0,0 +1,8 @@
+import base64
+
+import numpy as np
+
+
+def encode_float32(values) -> str:
+    """Base64 of `values` as little-endian float32 (decode with `new Float32Array(buffer)`)."""
+    return base64.b64encode(np.asarray(values, dtype="<f4").tobytes()).decode("ascii")
@@ -0,0 +1,72 @@
+"""
+The AI Engine's metrics, rendered by GET /metrics: one prometheus_client
+registry, the HTTP metrics recorded by MetricsMiddleware and the Monte Carlo
+throughput recorded by the simulation service. Simulations that run in
+compute pool workers are recorded there and replayed here (see `recorded`).
+"""
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import finsage_metrics
+from finsage_metrics import CallbackCollector, SlowRequestProfiler  # noqa: F401
+from prometheus_client import CONTENT_TYPE_LATEST as CONTENT_TYPE  # noqa: F401
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
+
+NAMESPACE = "finsage_ai"
+
+# Seconds; covers sub-millisecond cached answers up to multi-second simulations
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+registry = CollectorRegistry()
+
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route", "status"),
+    namespace=NAMESPACE, buckets=BUCKETS, registry=registry)
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests being served", namespace=NAMESPACE, registry=registry)
+
+
+class MetricsMiddleware(finsage_metrics.MetricsMiddleware):
+    latency = HTTP_LATENCY
+    in_flight = HTTP_IN_FLIGHT
+
+
+SIMULATION_PATHS = Counter(
+    "simulation_paths_total", "Monte Carlo paths simulated (rate() gives paths/s)", ("kind",),
+    namespace=NAMESPACE, registry=registry)
+SIMULATION_SECONDS = Histogram(
+    "simulation_duration_seconds", "Time spent simulating paths", ("kind",),
+    namespace=NAMESPACE, buckets=BUCKETS, registry=registry)
+
+_recording: Optional[List[Tuple[str, int, float]]] = None   # Set while a pool worker runs a job
+
+
+def record_simulation(kind: str, paths: int, seconds: float) -> None:
+    if _recording is not None:
+        _recording.append((kind, paths, seconds))
+        return
+    SIMULATION_PATHS.labels(kind=kind).inc(paths)
+    SIMULATION_SECONDS.labels(kind=kind).observe(seconds)
+
+
+def recorded(fn: Callable, args: tuple) -> Tuple[object, List[Tuple[str, int, float]]]:
+    """
+    Run fn(*args) in a compute pool worker and return its result with the
+    simulations it recorded, for the parent to replay(): the worker's own
+    registry is never scraped.
+    """
+    global _recording
+    _recording = []
+    try:
+        return fn(*args), _recording
+    finally:
+        _recording = None
+
+
+def replay(simulations: List[Tuple[str, int, float]]) -> None:
+    for kind, paths, seconds in simulations:
+        record_simulation(kind, paths, seconds)
+
+
+def collect(name: str, documentation: str, callback: Callable[[], Dict[Tuple, float]],
+            labels: Sequence[str] = (), kind: str = "gauge") -> None:
+    """Register a metric computed on every scrape, e.g. from an existing stats() dict."""
+    registry.register(CallbackCollector(f"{NAMESPACE}_{name}", documentation, callback, labels, kind))
@@ -0,0 +1,326 @@
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence
+
+DEFAULT_SIMULATIONS = 1000
+MAX_SIMULATIONS = 200_000
+
+# Upper bound on the number of float64 shocks held in memory at once (~8 MB).
+CHUNK_ELEMENTS = 1 << 20
+
+# Two-sided 95% normal quantile used for all confidence intervals.
+Z_95 = 1.959963984540054
+
+SAMPLING_STRATEGIES = ("plain", "antithetic", "control_variate", "sobol")
+
+# Independent scrambles used to estimate the error of randomized QMC.
+SOBOL_REPLICATES = 8
+
+
+def monthly_parameters(expected_return: float, volatility: float):
+    """Convert annual return/volatility into the monthly drift and sigma used by the engine."""
+    return expected_return / 12, volatility / np.sqrt(12)
+
+
+def make_rng(seed: Optional[int] = None) -> np.random.Generator:
+    """Seedable generator for simulation shocks (SFC64 is the fastest bit generator NumPy ships)."""
+    return np.random.Generator(np.random.SFC64(seed))
+
+
+def accumulate_block(values: np.ndarray, growth: np.ndarray, monthly_sip: float) -> np.ndarray:
+    """
+    Advance the SIP recurrence V_t = (V_{t-1} + SIP) * g_t over a block of months.
+
+    `growth` is a (paths x months) array of gross monthly returns g_t = 1 + r_t.
+    Unrolling the recurrence over the block gives
+
+        V_end = V_start * prod(g) + SIP * sum_k prod_{j>=k} g_j
+
+    which is a reversed cumulative product, so the block is handled with two
+    vectorized reductions instead of a Python loop per month.
+    """
+    tail = np.cumprod(growth[:, ::-1], axis=1)
+    values *= tail[:, -1]
+    values += monthly_sip * tail.sum(axis=1)
+    return values
+
+
+def _antithetic_paths(simulations: int) -> int:
+    return -(-simulations // 2)
+
+
+def _sobol_points_per_replicate(simulations: int) -> int:
+    per_replicate = -(-simulations // SOBOL_REPLICATES)
+    return 1 << max(0, int(per_replicate - 1).bit_length())
+
+
+def simulated_paths(simulations: int, sampling: str = "plain") -> int:
+    """Number of paths a strategy actually runs for a requested path count."""
+    if sampling == "antithetic":
+        return 2 * _antithetic_paths(simulations)
+    if sampling == "sobol":
+        return SOBOL_REPLICATES * _sobol_points_per_replicate(simulations)
+    return simulations
+
+
+def _sobol_shock_blocks(rng: np.random.Generator, points: int, months: int, chunk_elements: int):
+    """
+    Yield (start, shocks) blocks of scrambled-Sobol normal shocks, one
+    independent scramble per replicate, each replicate `points` long.
+    """
+    from scipy.special import ndtri
+    from scipy.stats import qmc
+
+    if months > qmc.Sobol.MAXDIM:
+        raise ValueError(f"Sobol sampling supports at most {qmc.Sobol.MAXDIM} months")
+
+    # Power-of-two draws keep the balance properties of each replicate
+    rows = min(points, 1 << (max(1, chunk_elements // months).bit_length() - 1))
+    for replicate in range(SOBOL_REPLICATES):
+        sampler = qmc.Sobol(d=months, scramble=True, rng=rng)
+        for start in range(0, points, rows):
+            uniforms = sampler.random(rows)
+            np.clip(uniforms, 1e-12, 1 - 1e-12, out=uniforms)
+            yield replicate * points + start, ndtri(uniforms, out=uniforms)
+
+
+def _normal_shock_blocks(rng: np.random.Generator, paths: int, months: int, chunk_elements: int):
+    """Yield (start, month, shocks) blocks of pseudo-random normal shocks in row-major order."""
+    month_block = min(months, chunk_elements)
+    path_block = max(1, chunk_elements // month_block)
+    buffer = np.empty(min(path_block, paths) * month_block)
+
+    for start in range(0, paths, path_block):
+        rows = min(path_block, paths - start)
+        for month in range(0, months, month_block):
+            width = min(month_block, months - month)
+            shocks = buffer[: rows * width].reshape(rows, width)
+            rng.standard_normal(out=shocks)
+            yield start, month, shocks
+
+
+def simulate_final_values(
+    monthly_sip: float,
+    months: int,
+    expected_return: float,
+    volatility: float,
+    simulations: int = DEFAULT_SIMULATIONS,
+    seed: Optional[int] = None,
+    chunk_elements: int = CHUNK_ELEMENTS,
+    rng: Optional[np.random.Generator] = None,
+    sampling: str = "plain",
+    clip: bool = True,
+) -> np.ndarray:
+    """
+    Simulate terminal SIP corpus values for `simulations` paths.
+
+    Returns are drawn from a seedable Generator as (paths x months) blocks of at
+    most `chunk_elements` shocks, so memory stays bounded for long horizons and
+    large path counts. Shocks are consumed in row-major (path, month) order, so
+    a given seed yields the same paths whatever the chunk size. Pass `rng` to
+    continue an existing stream (e.g. when simulating in batches).
+
+    `sampling` selects how shocks are generated (see SAMPLING_STRATEGIES):
+
+    - "antithetic": path i and path i + n/2 use mirrored shocks Z and -Z.
+    - "sobol": SOBOL_REPLICATES independently scrambled Sobol' sequences laid
+      out back to back, mapped to normals with the inverse normal CDF.
+    - "plain" and "control_variate" draw ordinary pseudo-random shocks; the
+      control variate correction is applied later by `estimate_with_standard_error`.
+
+    Antithetic and Sobol runs round the path count up (see `simulated_paths`).
+    Set `clip=False` to keep negative corpus values, e.g. for a control variate.
+    """
+    if sampling not in SAMPLING_STRATEGIES:
+        raise ValueError(f"Unknown sampling strategy '{sampling}'")
+
+    final_values = np.zeros(simulated_paths(simulations, sampling))
+    if months <= 0 or simulations <= 0:
+        return final_values
+
+    rng = rng if rng is not None else make_rng(seed)
+    monthly_return, monthly_volatility = monthly_parameters(expected_return, volatility)
+    mean_growth = 1 + monthly_return
+
+    if sampling == "sobol":
+        points = _sobol_points_per_replicate(simulations)
+        for start, shocks in _sobol_shock_blocks(rng, points, months, chunk_elements):
+            shocks *= monthly_volatility
+            shocks += mean_growth
+            accumulate_block(final_values[start:start + len(shocks)], shocks, monthly_sip)
+    else:
+        paths = _antithetic_paths(simulations) if sampling == "antithetic" else simulations
+        for start, _, shocks in _normal_shock_blocks(rng, paths, months, chunk_elements):
+            shocks *= monthly_volatility
+            shocks += mean_growth
+            accumulate_block(final_values[start:start + len(shocks)], shocks, monthly_sip)
+            if sampling == "antithetic":
+                # 1 + mu - sigma*Z == 2 * (1 + mu) - (1 + mu + sigma*Z)
+                np.subtract(2 * mean_growth, shocks, out=shocks)
+                mirror = start + paths
+                accumulate_block(final_values[mirror:mirror + len(shocks)], shocks, monthly_sip)
+
+    if clip:
+        np.maximum(final_values, 0, out=final_values)
+    return final_values
+
+
+def simulate_common_final_values(
+    monthly_sips: Sequence[float],
+    expected_returns: Sequence[float],
+    simulations: Sequence[int],
+    months: int,
+    volatility: float,
+    rng: np.random.Generator,
+    chunk_elements: int = CHUNK_ELEMENTS,
+) -> List[np.ndarray]:
+    """
+    Simulate several scenarios that share a horizon and volatility on common
+    random numbers: one stream of shocks drives every scenario, and scenario i
+    uses its first `simulations[i]` paths.
+
+    The terminal corpus is linear in the SIP, so the recurrence is run once per
+    distinct expected return with SIP = 1 and scaled per scenario afterwards.
+    """
+    paths = max(simulations)
+    if months <= 0:
+        return [np.zeros(n) for n in simulations]
+
+    monthly_volatility = volatility / np.sqrt(12)
+    factors = {expected_return: np.zeros(paths) for expected_return in expected_returns}
+
+    for start, _, shocks in _normal_shock_blocks(rng, paths, months, chunk_elements):
+        growth = np.empty_like(shocks)
+        for expected_return, factor in factors.items():
+            np.multiply(shocks, monthly_volatility, out=growth)
+            growth += 1 + expected_return / 12
+            accumulate_block(factor[start:start + len(shocks)], growth, 1.0)
+
+    return [
+        np.maximum(monthly_sip * factors[expected_return][:n], 0)
+        for monthly_sip, expected_return, n in zip(monthly_sips, expected_returns, simulations)
+    ]
+
+
+def _mean_and_standard_error(samples: np.ndarray, sampling: str):
+    """Estimate E[samples] and its standard error, respecting the strategy's dependence structure."""
+    if sampling == "antithetic":
+        half = len(samples) // 2
+        samples = (samples[:half] + samples[half:]) / 2
+    elif sampling == "sobol":
+        samples = samples.reshape(SOBOL_REPLICATES, -1).mean(axis=1)
+    if len(samples) < 2:
+        return float(np.mean(samples)), 0.0
+    return float(np.mean(samples)), float(np.std(samples, ddof=1) / np.sqrt(len(samples)))
+
+
+def _control_variate(samples: np.ndarray, control: np.ndarray, control_mean: float):
+    """Regression-adjusted estimate of E[samples] using `control`, whose mean is known exactly."""
+    centred = control - control.mean()
+    variance = float(np.dot(centred, centred))
+    beta = float(np.dot(samples - samples.mean(), centred)) / variance if variance > 0 else 0.0
+    adjusted = samples - beta * (control - control_mean)
+    return float(np.mean(adjusted)), float(np.std(adjusted, ddof=1) / np.sqrt(len(adjusted)))
+
+
+def estimate_with_standard_error(
+    final_values: np.ndarray,
+    target_amount: float,
+    sampling: str = "plain",
+    control_mean: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Mean corpus and success probability with their estimated standard errors.
+
+    For "control_variate", `final_values` must be unclipped and `control_mean`
+    must be their exact expectation (the deterministic SIP corpus).
+    """
+    corpus = np.maximum(final_values, 0)
+    successes = (final_values >= target_amount).astype(float)
+
+    if sampling == "control_variate":
+        mean, mean_error = _control_variate(corpus, final_values, control_mean)
+        probability, probability_error = _control_variate(successes, final_values, control_mean)
+        probability = min(max(probability, 0.0), 1.0)
+    else:
+        mean, mean_error = _mean_and_standard_error(corpus, sampling)
+        probability, probability_error = _mean_and_standard_error(successes, sampling)
+
+    return {
+        "mean": mean,
+        "success_probability": probability,
+        "sampling": sampling,
+        "simulations": len(final_values),
+        "standard_error": {"mean": mean_error, "success_probability": probability_error},
+    }
+
+
+def terminal_moments(monthly_sip: float, months: int, expected_return: float, volatility: float):
+    """
+    Exact mean and variance of the terminal corpus V_T under i.i.d. monthly
+    gross returns g with E[g] = 1 + mu and Var[g] = sigma^2, from
+
+        E[V_t]   = (E[V_{t-1}] + SIP) * E[g]
+        E[V_t^2] = (E[V_{t-1}^2] + 2 SIP E[V_{t-1}] + SIP^2) * E[g^2]
+    """
+    monthly_return, monthly_volatility = monthly_parameters(expected_return, volatility)
+    first = 1 + monthly_return
+    second = first * first + monthly_volatility * monthly_volatility
+    mean, square = 0.0, 0.0
+    for _ in range(max(0, months)):
+        mean, square = (mean + monthly_sip) * first, (square + 2 * monthly_sip * mean + monthly_sip * monthly_sip) * second
+    return mean, max(0.0, square - mean * mean)
+
+
+def lognormal_approximation(mean: float, variance: float) -> Dict[str, float]:
+    """Moment-matched lognormal mean and median for a positive terminal corpus."""
+    if mean <= 0 or variance == 0:
+        return {"mean": mean, "median": mean}
+    log_variance = np.log1p(variance / (mean * mean))
+    return {"mean": mean, "median": float(mean * np.exp(-log_variance / 2))}
+
+
+def wilson_interval(successes: int, n: int, z: float = Z_95):
+    """Wilson score interval for a binomial proportion."""
+    if n == 0:
+        return 0.0, 1.0
+    p = successes / n
+    denominator = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denominator
+    half_width = z * np.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominator
+    return float(max(0.0, centre - half_width)), float(min(1.0, centre + half_width))
+
+
+def mean_interval(values: np.ndarray, z: float = Z_95):
+    """Normal-approximation interval for the mean (mean +/- z * standard error)."""
+    mean = float(np.mean(values))
+    if len(values) < 2:
+        return mean, mean
+    standard_error = float(np.std(values, ddof=1)) / np.sqrt(len(values))
+    return mean - z * standard_error, mean + z * standard_error
+
+
+def quantile_interval(sorted_values: np.ndarray, q: float, z: float = Z_95):
+    """
+    Distribution-free interval for the q-quantile from order statistics.
+
+    The rank of the true quantile among n samples is Binomial(n, q), so the
+    order statistics at n*q +/- z*sqrt(n*q*(1-q)) bracket it.
+    """
+    n = len(sorted_values)
+    spread = z * np.sqrt(n * q * (1 - q))
+    lower = int(np.clip(np.floor(n * q - spread), 0, n - 1))
+    upper = int(np.clip(np.ceil(n * q + spread), 0, n - 1))
+    return float(sorted_values[lower]), float(sorted_values[upper])
+
+
+def summarize(final_values: np.ndarray, target_amount: float, scenario_count: int = 100) -> Dict[str, Any]:
+    """Summary statistics returned by /simulate/goal."""
+    p10, median, p90 = np.percentile(final_values, [10, 50, 90])
+    return {
+        "mean": float(np.mean(final_values)),
+        "median": float(median),
+        "p10": float(p10),
+        "p90": float(p90),
+        "success_probability": float(np.mean(final_values >= target_amount)),
+        "scenarios": final_values[:scenario_count].tolist()  # First 100 for charts
+    }
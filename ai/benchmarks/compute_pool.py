@@ -0,0 +1,95 @@
+"""
+Event-loop responsiveness, overload behaviour and result transfer of the
+compute pool.
+
+    cd ai && python -m benchmarks.compute_pool
+
+1. /health latency while heavy /simulate/goal requests are in flight, with
+   simulations inline on the event loop (workers=0) and in the pool.
+2. A burst of heavy requests against the admission limits: how many are
+   rejected with 429 and how long the accepted ones take.
+3. Returning a large array from a worker: pickled through the pool's pipe
+   vs. shared memory.
+"""
+import asyncio
+import time
+
+import httpx
+import numpy as np
+
+from app.main import app
+from app.services.compute_pool import ComputePool, compute_pool
+from app.utils.cache import result_cache
+
+HEAVY = {"monthlySIP": 10_000, "targetAmount": 5_000_000, "timeHorizon": 240, "simulations": 20_000}
+
+
+async def health_under_load(client: httpx.AsyncClient, heavy_requests: int):
+    latencies = []
+    done = asyncio.Event()
+
+    async def ping():
+        while not done.is_set():
+            start = time.perf_counter()
+            await client.get("/health")
+            latencies.append((time.perf_counter() - start) * 1000)
+            await asyncio.sleep(0.01)
+
+    pinger = asyncio.create_task(ping())
+    await asyncio.sleep(0.05)
+    await asyncio.gather(*(client.post("/simulate/goal", json={**HEAVY, "seed": i}) for i in range(heavy_requests)))
+    done.set()
+    await pinger
+    return np.percentile(latencies, [50, 99]), len(latencies)
+
+
+async def burst(client: httpx.AsyncClient, requests: int):
+    async def one(i):
+        start = time.perf_counter()
+        response = await client.post("/simulate/goal", json={**HEAVY, "seed": 1000 + i})
+        return response.status_code, time.perf_counter() - start
+
+    return await asyncio.gather(*(one(i) for i in range(requests)))
+
+
+async def transfer(size_mb: int):
+    array_length = size_mb * 1024 * 1024 // 8
+    for name, min_bytes in (("pickled", 1 << 62), ("shared memory", 0)):
+        pool = ComputePool(workers=1, max_pending=4, max_pending_cost=1e12, inline_max_cost=0, min_shared_bytes=min_bytes)
+        await pool.run(np.ones, 1, cost=1)  # Start the worker
+        timings = []
+        for _ in range(5):
+            start = time.perf_counter()
+            await pool.run(np.ones, array_length, cost=1)
+            timings.append(time.perf_counter() - start)
+        pool.shutdown()
+        print(f"  {size_mb} MB array, {name:<14} {min(timings) * 1000:>7.1f} ms")
+
+
+async def main():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"1. /health latency with 4 heavy simulations in flight ({HEAVY['simulations']:,} paths x {HEAVY['timeHorizon']} months)")
+        for workers in (0, compute_pool.workers):
+            compute_pool.workers = workers
+            result_cache.clear()
+            (p50, p99), pings = await health_under_load(client, 4)
+            label = "inline" if workers == 0 else f"pool ({workers} workers)"
+            print(f"  {label:<20} p50 {p50:>7.1f} ms   p99 {p99:>7.1f} ms   ({pings} pings)")
+
+        print(f"2. burst of 40 heavy requests, max_pending={compute_pool.max_pending}")
+        result_cache.clear()
+        start = time.perf_counter()
+        results = await burst(client, 40)
+        accepted = [seconds for status, seconds in results if status == 200]
+        rejected = [seconds for status, seconds in results if status == 429]
+        print(f"  {len(accepted)} accepted (slowest {max(accepted):.2f} s), {len(rejected)} rejected with 429 "
+              f"(slowest rejection {max(rejected, default=0) * 1000:.1f} ms), total {time.perf_counter() - start:.2f} s")
+    compute_pool.shutdown()
+
+    print("3. returning a result array from a worker")
+    await transfer(64)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+"""
+Throughput and memory of the offline goal recompute.
+
+    cd ai && python -m benchmarks.goal_batch [--goals 2000000]
+
+Writes a synthetic goals file as Parquet and CSV, then runs the CLI on it
+for each format, in-process and with worker processes, and with a smaller
+chunk size. Peak memory is the CLI process's max RSS (workers not included).
+"""
+import argparse
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def run_cli(source: str, destination: str, chunk_rows: int, workers: int):
+    """
+    Seconds and peak RSS (MB) of one `python -m app.services.goal_batch` run.
+    A child's max RSS includes this process's size at fork, hence the small parent.
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen([
+        sys.executable, "-m", "app.services.goal_batch", source, destination,
+        "--expected-return", "0.11", "--chunk-rows", str(chunk_rows), "--workers", str(workers),
+    ], stderr=subprocess.DEVNULL)
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode:
+        raise RuntimeError(f"goal_batch exited with {process.returncode}")
+    return time.perf_counter() - start, usage.ru_maxrss / 1024
+
+
+def write_goals(directory: str, goals: int):
+    """Synthetic goals.parquet / goals.csv. Runs in its own process so this one stays small (see run_cli)."""
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from pyarrow import csv
+
+    rng = np.random.default_rng(0)
+    table = pa.table({
+        "goalId": pa.array(np.arange(goals)).cast(pa.string()),
+        "goalAmount": rng.uniform(1e5, 5e7, goals).round(),
+        "years": rng.integers(1, 31, goals).astype(float),
+        "monthlySIP": rng.uniform(500, 1e5, goals).round(),
+        "expectedReturnPA": rng.choice([0.08, 0.1, 0.12], goals),
+    })
+    pq.write_table(table, os.path.join(directory, "goals.parquet"))
+    csv.write_csv(table, os.path.join(directory, "goals.csv"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--goals", type=int, default=2_000_000)
+    parser.add_argument("--chunk-rows", type=int, default=1 << 18)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        writer = multiprocessing.get_context("spawn").Process(target=write_goals, args=(directory, args.goals))
+        writer.start()
+        writer.join()
+
+        print(f"{args.goals:,} goals (times include interpreter start-up)")
+        small = args.chunk_rows // 8
+        for source, destination, chunk_rows, workers in (
+            ("goals.parquet", "results.parquet", args.chunk_rows, 0),
+            ("goals.parquet", "results.parquet", small, 0),
+            ("goals.parquet", "results.parquet", args.chunk_rows, 2),
+            ("goals.csv", "results.csv", args.chunk_rows, 0),
+            ("goals.csv", "results.csv", small, 0),
+            ("goals.csv", "results.csv", args.chunk_rows, 2),
+        ):
+            seconds, peak_mb = run_cli(os.path.join(directory, source), os.path.join(directory, destination),
+                                       chunk_rows, workers)
+            print(f"  {source:<14} → {destination:<16} chunk={chunk_rows:>7,} workers={workers}  {seconds:>6.2f} s  "
+                  f"{args.goals / seconds * 60 / 1e6:>6.1f}M goals/min  peak RSS {peak_mb:>5.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Measurement, JSON reports and baseline comparison for benchmarks.suite.
+
+A case is a zero-argument callable plus how much work one call does
+(`units` of `unit`, e.g. 10_000 paths), so throughput is comparable across
+cases that batch differently. Timing and memory are measured in separate
+passes: tracemalloc slows allocation-heavy code down, so it never runs
+while the clock does.
+"""
+import gc
+import json
+import platform
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+# Allowed relative change before a case counts as a regression
+DEFAULT_THRESHOLDS = {
+    "throughput": 0.20,    # 20% fewer units/s
+    "p99_ms": 1.00,        # 2x slower tail (tails are far noisier than throughput)
+    "peak_kb": 0.25,       # 25% more peak memory
+}
+
+# Absolute slack below which a change is noise, never a regression
+NOISE = {"p99_ms": 1.0, "peak_kb": 64}
+
+
+@dataclass
+class Case:
+    name: str
+    fn: Callable[[], Any]
+    unit: str = "calls"
+    units: int = 1
+    group: str = "in-process"
+
+
+def measure(case: Case, min_time: float = 1.0, min_calls: int = 5, rounds: int = 3,
+            warmup: float = 0.3) -> Dict[str, Any]:
+    """
+    Run `case` for `rounds` rounds of at least `min_time / rounds` seconds and
+    `min_calls` calls each, and return its report entry. Throughput is the best
+    round (as timeit does: slower rounds measure other load on the machine, not
+    the code); latency percentiles cover every call.
+    """
+    # Warm-up (at least one call): lazy imports, validator builds, client threads and
+    # first-touch allocations otherwise land in the tail of whichever case runs first
+    deadline = time.perf_counter() + warmup
+    case.fn()
+    while time.perf_counter() < deadline:
+        case.fn()
+    gc.collect()
+
+    durations = []
+    best = 0.0
+    for _ in range(rounds):
+        round_durations = []
+        deadline = time.perf_counter() + min_time / rounds
+        while len(round_durations) < min_calls or time.perf_counter() < deadline:
+            start = time.perf_counter_ns()
+            case.fn()
+            round_durations.append(time.perf_counter_ns() - start)
+        best = max(best, case.units * len(round_durations) / (sum(round_durations) / 1e9))
+        durations.extend(round_durations)
+
+    tracemalloc.start()
+    case.fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    durations = np.array(durations) / 1e6
+    return {
+        "name": case.name,
+        "group": case.group,
+        "unit": case.unit,
+        "calls": len(durations),
+        "throughput": best,
+        "p50_ms": float(np.percentile(durations, 50)),
+        "p99_ms": float(np.percentile(durations, 99)),
+        "peak_kb": peak / 1024,
+    }
+
+
+def report(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(), "numpy": np.__version__},
+        "results": {result["name"]: result for result in results},
+    }
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path) as file:
+        return json.load(file)
+
+
+def save(data: Dict[str, Any], path: str) -> None:
+    with open(path, "w") as file:
+        json.dump(data, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any],
+            thresholds: Optional[Dict[str, float]] = None) -> List[str]:
+    """
+    Regressions of `current` against `baseline` (both report dicts), one
+    message per metric over its threshold. Thresholds come from the argument,
+    else the baseline file's "thresholds", else DEFAULT_THRESHOLDS; a case can
+    override them with its own "thresholds" entry in the baseline.
+    Cases missing from either side are skipped.
+    """
+    thresholds = {**DEFAULT_THRESHOLDS, **baseline.get("thresholds", {}), **(thresholds or {})}
+    regressions = []
+    for name, base in baseline.get("results", {}).items():
+        result = current["results"].get(name)
+        if result is None:
+            continue
+        limits = {**thresholds, **base.get("thresholds", {})}
+        if result["throughput"] < base["throughput"] * (1 - limits["throughput"]):
+            regressions.append(
+                f"{name}: throughput {result['throughput']:,.0f} {result['unit']}/s "
+                f"< baseline {base['throughput']:,.0f} (-{limits['throughput']:.0%} allowed)"
+            )
+        for metric in ("p99_ms", "peak_kb"):
+            if result[metric] > base[metric] * (1 + limits[metric]) + NOISE[metric]:
+                regressions.append(
+                    f"{name}: {metric} {result[metric]:,.2f} > baseline {base[metric]:,.2f} "
+                    f"(+{limits[metric]:.0%} allowed)"
+                )
+    return regressions
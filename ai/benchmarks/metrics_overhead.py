@@ -0,0 +1,74 @@
+"""
+Per-request cost of the metrics middleware and of recording metrics.
+
+    cd ai && python -m benchmarks.metrics_overhead
+
+The middleware wraps a bare ASGI app that answers immediately and is called
+directly (no HTTP client, no routing), so the difference is the middleware's
+own overhead. The same runs are repeated with the slow-request profiler on.
+"""
+import asyncio
+import tempfile
+import time
+
+from prometheus_client import CollectorRegistry, Counter, Histogram
+
+from app.utils.metrics import MetricsMiddleware, SlowRequestProfiler
+
+REQUESTS = 100_000
+RECORDS = 1_000_000
+
+
+class Route:
+    path = "/simulate/goal"
+
+
+async def bare_app(scope, receive, send):
+    scope["route"] = Route
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def drive(app) -> float:
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        await app({"type": "http", "method": "POST", "path": "/simulate/goal"}, receive, send)
+    return (time.perf_counter() - start) / REQUESTS * 1e9
+
+
+def per_call_ns(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(RECORDS):
+        fn()
+    return (time.perf_counter() - start) / RECORDS * 1e9
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        profiler = SlowRequestProfiler(threshold=60.0, directory=directory)
+        apps = [
+            ("bare app", bare_app),
+            ("metrics middleware", MetricsMiddleware(bare_app)),
+            ("middleware + profiler", MetricsMiddleware(bare_app, profiler=profiler)),
+        ]
+        baseline = None
+        for name, app in apps:
+            ns = min(asyncio.run(drive(app)) for _ in range(3))
+            baseline = baseline if baseline is not None else ns
+            print(f"{name:<24} {ns:>8,.0f} ns/request   overhead {ns - baseline:>7,.0f} ns")
+
+    registry = CollectorRegistry()
+    counter = Counter("calls_total", "", ("kind",), registry=registry)
+    histogram = Histogram("latency_seconds", "", ("route",), registry=registry)
+    print(f"{'counter.inc':<24} {per_call_ns(lambda: counter.labels(kind='plain').inc()):>8,.0f} ns")
+    print(f"{'histogram.observe':<24} {per_call_ns(lambda: histogram.labels(route='/simulate/goal').observe(0.012)):>8,.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
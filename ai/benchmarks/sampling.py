@@ -0,0 +1,58 @@
+"""
+How many paths does each sampling strategy need to match plain Monte Carlo
+at 10k paths?
+
+    cd ai && python -m benchmarks.sampling
+
+For each strategy the reported standard error of success_probability and
+mean (averaged over a few seeds) is compared with plain MC at 10k paths, and
+the path count is bisected until it is at least as precise.
+"""
+import time
+
+import numpy as np
+
+from app.services.simulation_service import run_simulation
+from app.utils.monte_carlo import SAMPLING_STRATEGIES, simulated_paths
+
+SCENARIO = dict(monthly_sip=12000, target_amount=1_000_000, months=60, expected_return=0.12, volatility=0.15)
+REFERENCE_PATHS = 10_000
+SEEDS = range(5)
+
+
+def standard_errors(sampling: str, simulations: int):
+    errors = [run_simulation(simulations=simulations, seed=seed, sampling=sampling, **SCENARIO)["standard_error"] for seed in SEEDS]
+    return {key: float(np.mean([error[key] for error in errors])) for key in errors[0]}
+
+
+def paths_to_match(sampling: str, metric: str, target_error: float) -> int:
+    low, high = 16, REFERENCE_PATHS
+    if standard_errors(sampling, high)[metric] > target_error:
+        return -1
+    while high - low > max(16, low // 20):
+        middle = (low + high) // 2
+        if standard_errors(sampling, middle)[metric] <= target_error:
+            high = middle
+        else:
+            low = middle
+    return simulated_paths(high, sampling)
+
+
+def main():
+    reference = standard_errors("plain", REFERENCE_PATHS)
+    print(f"plain MC @ {REFERENCE_PATHS} paths: SE(success_probability)={reference['success_probability']:.5f} "
+          f"SE(mean)={reference['mean']:,.0f}")
+    print(f"{'strategy':<16}{'metric':<22}{'paths':>8}{'vs plain':>10}{'ms @ 10k':>10}")
+    for sampling in SAMPLING_STRATEGIES:
+        run_simulation(simulations=256, seed=0, sampling=sampling, **SCENARIO)  # warm up lazy imports
+        start = time.perf_counter()
+        run_simulation(simulations=REFERENCE_PATHS, seed=0, sampling=sampling, **SCENARIO)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        for metric in ("success_probability", "mean"):
+            paths = paths_to_match(sampling, metric, reference[metric])
+            ratio = f"{paths / REFERENCE_PATHS:.2f}x" if paths > 0 else "n/a"
+            print(f"{sampling:<16}{metric:<22}{paths:>8}{ratio:>10}{elapsed_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
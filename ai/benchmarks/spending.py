@@ -0,0 +1,100 @@
+"""
+Spending analytics: sync cost and query latency of the columnar ledger,
+against a pandas group-by over the raw transaction dicts per request.
+
+    cd ai && python -m benchmarks.spending [--years 5 --per-day 60]
+
+1. Initial sync of the full history, then a daily incremental sync.
+2. trend / top_categories / anomalies answered from the rollups (direct
+   call and through the ASGI app), and the same top-categories answer
+   recomputed with pandas from the raw dicts.
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.financial_models import TRANSACTION_CATEGORIES, Transaction
+from app.services.analysis_service import SpendingLedger
+
+
+def history(years: int, per_day: int, start: date = date(2021, 1, 1)):
+    rng = random.Random(0)
+    transactions = []
+    for day in range(years * 365):
+        when = (start + timedelta(days=day)).isoformat()
+        for i in range(per_day):
+            transactions.append({
+                "transactionId": f"{day}-{i}",
+                "amount": round(rng.lognormvariate(6, 1), 2),
+                "type": "credit" if i == 0 else "debit",
+                "category": rng.choice(TRANSACTION_CATEGORIES),
+                "date": when,
+            })
+    return transactions
+
+
+def best_us(fn, repeat: int = 200) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return float(np.percentile(timings, 50)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--per-day", type=int, default=60)
+    args = parser.parse_args()
+
+    raw = history(args.years, args.per_day)
+    daily, past = raw[-args.per_day:], raw[:-args.per_day]
+    print(f"{len(raw):,} transactions ({args.years} years x {args.per_day}/day)")
+
+    ledger = SpendingLedger()
+    start = time.perf_counter()
+    models = [Transaction(**t) for t in past]
+    validated = time.perf_counter()
+    ledger.add(models)
+    done = time.perf_counter()
+    print(f"1. initial sync: validation {(validated - start) * 1e3:.0f} ms, ledger.add {(done - validated) * 1e3:.0f} ms")
+    daily_models = [Transaction(**t) for t in daily]
+    start = time.perf_counter()
+    ledger.add(daily_models)
+    print(f"   daily sync ({len(daily)} transactions): {(time.perf_counter() - start) * 1e6:.0f} us")
+    memory = sum(column.nbytes for column in (ledger.days, ledger.categories, ledger.amounts, ledger.debits))
+    print(f"   columns {memory / 2**20:.1f} MB, rollups {ledger.spending.nbytes / 1024:.1f} KB")
+
+    print("2. query latency (median)")
+    for name, fn in (
+        ("trend 12 months", lambda: ledger.trend(12)),
+        ("top categories 3 months", lambda: ledger.top_categories(3, 5)),
+        ("anomalies", lambda: ledger.anomalies(6, 2.0)),
+    ):
+        print(f"   {name:<28} {best_us(fn):>9.1f} us")
+
+    client = TestClient(app)
+    client.post("/analyze/transactions", json={"userId": "bench", "transactions": raw[-90 * args.per_day:]})
+    for query in ("trend", "top_categories", "anomalies"):
+        us = best_us(lambda: client.get("/analyze/spending", params={"userId": "bench", "query": query}), repeat=100)
+        print(f"   http {query:<23} {us:>9.1f} us")
+
+    import pandas as pd
+
+    def pandas_top_categories():
+        frame = pd.DataFrame(raw)
+        frame["date"] = pd.to_datetime(frame["date"])
+        recent = frame[(frame["type"] == "debit") & (frame["date"] >= frame["date"].max() - pd.DateOffset(months=3))]
+        return recent.groupby("category")["amount"].sum().nlargest(5)
+
+    print(f"   {'pandas top categories':<28} {best_us(pandas_top_categories, repeat=3):>9.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Benchmark suite for the AI engine hot paths, with a JSON report and a
+baseline regression check.
+
+    cd ai && python -m benchmarks.suite                       # run, compare with benchmarks/baseline.json
+    cd ai && python -m benchmarks.suite --output results.json
+    cd ai && python -m benchmarks.suite --update-baseline     # after an intended change
+    cd ai && python -m benchmarks.suite --quick -k simulate   # short runs of matching cases
+
+Cases run in-process (the functions behind the routes) and end-to-end through
+the ASGI app with the in-process TestClient, so routing, validation and JSON
+serialization overhead show up separately. Request inputs change on every
+call so the result cache never answers. The ai-service cases (calculations,
+ExportService) are skipped when ../ai-service is not next to this directory.
+
+Exits with status 1 when any case regresses past the baseline thresholds
+(see benchmarks.harness.DEFAULT_THRESHOLDS). Baselines are machine-specific:
+regenerate them on the machine that runs the comparison.
+"""
+import argparse
+import itertools
+import os
+import sys
+from typing import List
+
+import numpy as np
+
+from benchmarks import harness
+from benchmarks.harness import Case
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+AI_SERVICE = os.path.join(os.path.dirname(__file__), "..", "..", "ai-service")
+
+SIMULATIONS = 10_000
+MONTHS = 120
+VECTOR_SIZE = 100_000
+EXPORT_ROWS = 10_000
+
+
+def engine_cases() -> List[Case]:
+    from app.main import GoalAnalysisRequest, goal_analysis
+    from app.services.chat_service import intent_router
+    from app.services.simulation_service import run_simulation
+
+    counter = itertools.count()
+    messages = [
+        "How much should I save for retirement?",
+        "is a home loan EMI of 40% of salary too much",
+        "which tax saving options under 80C",
+        "tell me something interesting",
+    ]
+
+    def analyze():
+        goal_analysis(GoalAnalysisRequest(goalAmount=5_000_000 + next(counter), years=10, monthlySIP=15_000))
+
+    def simulate():
+        run_simulation(
+            monthly_sip=15_000, target_amount=5_000_000, months=MONTHS, expected_return=0.12,
+            volatility=0.15, simulations=SIMULATIONS, seed=next(counter),
+        )
+
+    def chat():
+        for message in messages:
+            intent_router.route(message, {})
+
+    return [
+        Case("analyze_goal", analyze, unit="goals"),
+        Case("simulate_goal", simulate, unit="paths", units=SIMULATIONS),
+        Case("chat_router", chat, unit="messages", units=len(messages)),
+    ]
+
+
+def http_cases() -> List[Case]:
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    client = TestClient(app)
+    counter = itertools.count()
+
+    def post(path, payload):
+        response = client.post(path, json=payload)
+        response.raise_for_status()
+
+    return [
+        Case("http analyze_goal", lambda: post("/analyze/goal", {
+            "goalAmount": 5_000_000 + next(counter), "years": 10, "monthlySIP": 15_000,
+        }), unit="requests", group="http"),
+        Case("http simulate_goal", lambda: post("/simulate/goal", {
+            "monthlySIP": 15_000, "targetAmount": 5_000_000, "timeHorizon": MONTHS,
+            "simulations": SIMULATIONS, "seed": next(counter), "outputs": ["p10", "p90", "success_probability"],
+        }), unit="paths", units=SIMULATIONS, group="http"),
+        Case("http chat", lambda: post("/chat", {"message": "How much should I save for retirement?"}),
+             unit="requests", group="http"),
+    ]
+
+
+def ai_service_cases() -> List[Case]:
+    if not os.path.isdir(os.path.join(AI_SERVICE, "src")):
+        print(f"skipping ai-service cases: {os.path.abspath(AI_SERVICE)} not found", file=sys.stderr)
+        return []
+    sys.path.append(os.path.abspath(AI_SERVICE))
+    from src.services.export_service import ExportService
+    from src.utils.calculations import months_to_goal, sip_future_value
+
+    rng = np.random.default_rng(0)
+    sips = rng.uniform(500, 100_000, VECTOR_SIZE)
+    rates = rng.uniform(1, 30, VECTOR_SIZE)
+    tenures = rng.integers(1, 41, VECTOR_SIZE)
+    targets = rng.uniform(1e5, 1e8, VECTOR_SIZE)
+
+    export_service = ExportService(max_workers=0)   # Render inline → measures the renderer, not pool IPC
+    rows = [
+        {"id": i, "date": f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}", "amount": i * 1.5, "category": "groceries"}
+        for i in range(EXPORT_ROWS)
+    ]
+    chart_data = [{"month": month, "value": 15_000 * month * 1.01 ** month} for month in range(MONTHS)]
+    counter = itertools.count()
+
+    def chart():
+        # A new title per call → always a cache miss, so the render itself is timed
+        export_service.generate_chart(chart_data, "month", "value", f"Projection {next(counter)}")
+
+    return [
+        Case("sip_future_value", lambda: sip_future_value(sips, rates, tenures),
+             unit="combinations", units=VECTOR_SIZE, group="ai-service"),
+        Case("months_to_goal", lambda: months_to_goal(targets, sips, rates),
+             unit="combinations", units=VECTOR_SIZE, group="ai-service"),
+        Case("export iter_csv", lambda: sum(len(chunk) for chunk in export_service.iter_csv(rows)),
+             unit="rows", units=EXPORT_ROWS, group="ai-service"),
+        Case("export chart png", chart, unit="charts", group="ai-service"),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI engine benchmark suite")
+    parser.add_argument("-k", dest="pattern", help="only run cases whose name contains this")
+    parser.add_argument("--quick", action="store_true", help="shorter runs (smoke test, noisier numbers)")
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the new baseline")
+    args = parser.parse_args()
+
+    cases = engine_cases() + http_cases() + ai_service_cases()
+    if args.pattern:
+        cases = [case for case in cases if args.pattern in case.name]
+
+    results = []
+    print(f"{'case':<22} {'group':<11} {'per second':>14} {'unit':<13} {'p50 ms':>9} {'p99 ms':>9} {'peak KB':>10}")
+    for case in cases:
+        result = harness.measure(case, min_time=0.2 if args.quick else 1.0, min_calls=3 if args.quick else 5)
+        results.append(result)
+        print(f"{case.name:<22} {case.group:<11} {result['throughput']:>14,.0f} {case.unit:<13} "
+              f"{result['p50_ms']:>9.2f} {result['p99_ms']:>9.2f} {result['peak_kb']:>10,.0f}")
+    current = harness.report(results)
+
+    if args.output:
+        harness.save(current, args.output)
+    if args.update_baseline:
+        if os.path.exists(args.baseline):
+            # Keep hand-tuned thresholds across baseline refreshes
+            current["thresholds"] = harness.load(args.baseline).get("thresholds", {})
+        harness.save(current, args.baseline)
+        print(f"baseline written to {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}; run with --update-baseline to create one")
+        return
+
+    regressions = harness.compare(current, harness.load(args.baseline))
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions:
+        sys.exit(1)
+    print("no regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
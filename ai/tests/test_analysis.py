@@ -0,0 +1,106 @@
+import random
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.financial_models import TRANSACTION_CATEGORIES, Transaction
+from app.services.analysis_service import SpendingLedger, SpendingStore
+
+client = TestClient(app)
+
+
+def history(days=365, per_day=4, seed=0, start=date(2025, 1, 1)):
+    rng = random.Random(seed)
+    transactions = []
+    for day in range(days):
+        when = start + timedelta(days=day)
+        for i in range(per_day):
+            transactions.append({
+                "transactionId": f"{seed}-{day}-{i}",
+                "amount": round(rng.uniform(100, 2_000), 2),
+                "type": "credit" if i == 0 and when.day == 1 else "debit",
+                "category": "salary" if i == 0 and when.day == 1 else rng.choice(TRANSACTION_CATEGORIES[:7]),
+                "date": when.isoformat(),
+            })
+    return transactions
+
+
+def test_incremental_rollups_match_a_full_group_by():
+    transactions = [Transaction(**t) for t in history()]
+    ledger = SpendingLedger()
+    shuffled = transactions[:]
+    random.Random(1).shuffle(shuffled)   # Out-of-order syncs widen the rollups both ways
+    for start in range(0, len(shuffled), 300):
+        ledger.add(shuffled[start:start + 300])
+    assert ledger.add(transactions[:50]) == 0   # Re-synced transactions are skipped
+
+    expected = {}
+    for t in transactions:
+        if t.type == "debit":
+            key = (t.date.strftime("%Y-%m"), t.category)
+            expected[key] = expected.get(key, 0) + t.amount
+    assert ledger.size == len(transactions) and ledger.months == 12
+    for (month, category), amount in expected.items():
+        row = (int(month[:4]) - 1970) * 12 + int(month[5:]) - 1 - ledger.first_month
+        assert ledger.spending[row, TRANSACTION_CATEGORIES.index(category)] == pytest.approx(amount)
+    assert ledger.days.dtype == np.int32 and ledger.categories.dtype == np.uint8
+
+
+def test_trend_and_top_categories():
+    ledger = SpendingLedger()
+    ledger.add([Transaction(**t) for t in history()])
+    trend = ledger.trend(months=3)
+    assert [m["month"] for m in trend["months"]] == ["2025-10", "2025-11", "2025-12"]
+    december = trend["months"][-1]
+    assert december["savings"] == pytest.approx(december["income"] - december["spending"])
+
+    top = ledger.top_categories(months=12, top=3)
+    assert len(top["categories"]) == 3
+    assert top["categories"][0]["spending"] >= top["categories"][1]["spending"] >= top["categories"][2]["spending"]
+    assert sum(c["sharePct"] for c in ledger.top_categories(months=12, top=10)["categories"]) == pytest.approx(100)
+
+
+def test_anomalies_flag_category_spikes_and_large_debits():
+    ledger = SpendingLedger()
+    ledger.add([Transaction(**t) for t in history()])
+    ledger.add([
+        Transaction(transactionId="tv", amount=90_000, type="debit", category="shopping", date="2025-12-20T10:00:00Z"),
+        Transaction(transactionId="new", amount=400, type="debit", category="unknown", date="2025-12-21"),
+    ])
+    anomalies = ledger.anomalies(months=6)
+    assert anomalies["month"] == "2025-12"
+    assert [c["category"] for c in anomalies["categories"]] == ["shopping"]
+    assert [(t["date"], t["amount"]) for t in anomalies["transactions"]] == [("2025-12-20", 90_000)]
+
+
+def test_store_evicts_least_recently_synced_users():
+    store = SpendingStore(max_users=2)
+    for user in ("a", "b", "c"):
+        store.sync(user, [Transaction(**t) for t in history(days=3, seed=ord(user))])
+    assert store.ledger("a") is None and store.ledger("c") is not None
+    assert store.counts() == {"users": 2, "transactions": 24}
+
+
+def test_spending_endpoint():
+    response = client.post("/analyze/transactions", json={"userId": "u-spend", "transactions": history(days=60)})
+    assert response.status_code == 200
+    assert response.json()["added"] == 240 and response.json()["from"] == "2025-01"
+
+    trend = client.get("/analyze/spending", params={"userId": "u-spend"}).json()
+    assert [m["month"] for m in trend["months"]] == ["2025-01", "2025-02", "2025-03"]
+    top = client.get("/analyze/spending", params={"userId": "u-spend", "query": "top_categories", "top": 2}).json()
+    assert len(top["categories"]) == 2
+    assert client.get("/analyze/spending", params={"userId": "u-spend", "query": "anomalies"}).status_code == 200
+    assert client.get("/analyze/spending", params={"userId": "nobody"}).status_code == 404
+
+
+def test_spending_windows_default_per_query():
+    client.post("/analyze/transactions", json={"userId": "u-year", "transactions": history()})
+    spending = lambda **params: client.get("/analyze/spending", params={"userId": "u-year", **params}).json()
+    assert len(spending()["months"]) == 12
+    assert spending(query="top_categories")["from"] == "2025-10"
+    assert spending(query="top_categories", months=1)["from"] == "2025-12"
+    assert len(spending(months=2)["months"]) == 2
@@ -0,0 +1,34 @@
+from benchmarks.harness import Case, compare, measure
+
+
+def result(throughput=1000.0, p99_ms=2.0, peak_kb=500.0):
+    return {"unit": "calls", "throughput": throughput, "p50_ms": 1.0, "p99_ms": p99_ms, "peak_kb": peak_kb}
+
+
+def test_measure_reports_throughput_latency_and_memory():
+    entry = measure(Case("alloc", lambda: bytearray(1 << 20), unit="buffers", units=2),
+                    min_time=0.03, min_calls=3, warmup=0)
+    assert entry["calls"] >= 9 and entry["unit"] == "buffers"
+    assert entry["throughput"] > 0 and 0 < entry["p50_ms"] <= entry["p99_ms"]
+    assert entry["peak_kb"] >= 1024
+
+
+def test_compare_flags_only_changes_past_thresholds():
+    baseline = {"results": {"a": result(), "b": result(), "gone": result()}}
+    current = {"results": {
+        "a": result(throughput=850.0, p99_ms=4.5, peak_kb=600.0),   # within 20% / 2x / 25%
+        "b": result(throughput=700.0, p99_ms=9.0, peak_kb=900.0),
+        "new": result(throughput=1.0),
+    }}
+    regressions = compare(current, baseline)
+    assert len(regressions) == 3
+    assert all(message.startswith("b:") for message in regressions)
+
+
+def test_per_case_thresholds_override_defaults():
+    baseline = {"thresholds": {"throughput": 0.5}, "results": {"a": {**result(), "thresholds": {"throughput": 0.05}}}}
+    current = {"results": {"a": result(throughput=900.0)}}
+    assert compare(current, baseline) == [
+        "a: throughput 900 calls/s < baseline 1,000 (-5% allowed)"
+    ]
+    assert compare(current, {**baseline, "results": {"a": result()}}) == []
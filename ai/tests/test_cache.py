@@ -0,0 +1,59 @@
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.main import GoalAnalysisRequest, app, result_cache
+from app.utils.cache import ResultCache, cache_key
+
+client = TestClient(app)
+
+
+def test_lru_eviction_respects_entry_limit():
+    cache = ResultCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_memory_budget_evicts_oldest_entries():
+    cache = ResultCache(max_entries=100, max_bytes=20_000)
+    for i in range(10):
+        cache.set(i, np.zeros(500))  # ~4 KB each
+    assert cache.stats()["bytes"] <= 20_000
+    assert cache.get(0) is None and cache.get(9) is not None
+
+
+def test_expired_entries_are_misses():
+    cache = ResultCache(ttl_seconds=1e-9)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+    assert cache.expirations == 1 and cache.misses == 1
+
+
+def test_get_or_compute_counts_hits_and_misses():
+    cache = ResultCache()
+    calls = []
+    for _ in range(3):
+        cache.get_or_compute("k", lambda: calls.append(1) or "value")
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 1
+
+
+def test_cache_key_normalizes_defaults_and_float_noise():
+    explicit = GoalAnalysisRequest(goalAmount=5e6, years=5, monthlySIP=12000, expectedReturnPA=0.1 + 0.2 - 0.18)
+    implicit = GoalAnalysisRequest(goalAmount=5e6, years=5, monthlySIP=12000)
+    assert cache_key("analyze/goal", explicit) == cache_key("analyze/goal", implicit)
+
+
+def test_repeated_simulation_is_served_from_cache():
+    result_cache.clear()
+    payload = {"monthlySIP": 12000, "targetAmount": 1000000, "timeHorizon": 60, "seed": 9}
+    hits = result_cache.hits
+    first = client.post("/simulate/goal", json=payload).json()
+    second = client.post("/simulate/goal", json=payload).json()
+    assert first == second
+    assert result_cache.hits == hits + 1
+    assert client.get("/cache/stats").json()["entries"] == 1
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.utils.calculations import sip_future_value, sip_future_values
+
+client = TestClient(app)
+
+
+def test_analyze_goal_treats_non_positive_returns_as_plain_contributions():
+    for expected_return in (0.0, -0.05):
+        response = client.post("/analyze/goal", json={
+            "goalAmount": 1_000_000, "years": 5, "monthlySIP": 10_000, "expectedReturnPA": expected_return,
+        })
+        assert response.json()["projectedCorpus"] == pytest.approx(10_000 * 60)
+
+
+def test_due_path_compounds_negative_returns():
+    # Expected terminal value of V_t = (V_{t-1} + SIP) * (1 + r), as the simulation's control variate needs
+    value = 0.0
+    for _ in range(24):
+        value = (value + 1_000) * (1 - 0.01)
+    assert sip_future_value(1_000, -0.01, 24, due=True) == pytest.approx(value)
+
+
+def test_array_version_matches_scalar():
+    rates = np.array([0.01, 0.0, -0.004, 0.12 / 12])
+    months = np.array([60.0, 12.0, 36.0, 1.0])
+    sips = np.array([10_000.0, 5_000.0, 2_500.0, 100.0])
+    expected = [sip_future_value(s, r, m) for s, r, m in zip(sips, rates, months)]
+    np.testing.assert_allclose(sip_future_values(sips, rates, months), expected, rtol=1e-15)
@@ -0,0 +1,104 @@
+import random
+import re
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.chat_service import INTENTS, IntentRouter, intent_router, trie_pattern
+
+client = TestClient(app)
+
+
+def baseline_intent(message):
+    """The original /chat if/elif chain."""
+    message = message.lower()
+    if any(word in message for word in ['50l', 'flat', 'home', 'afford']):
+        return "home_affordability"
+    elif any(word in message for word in ['sip', 'increase', 'optimize']):
+        return "sip_optimization"
+    elif any(word in message for word in ['net worth', 'growth']):
+        return "net_worth"
+    return "general"
+
+
+def routed_intent(router, message):
+    index = router.match(message)
+    return "general" if index is None else router.intents[index]["name"]
+
+
+def test_chat_routes_to_template_with_context():
+    result = client.post("/chat", json={"message": "Can I afford a 50L flat?", "context": {"sipAmount": 15000}}).json()
+    assert set(result) == {"response", "source", "confidence"}   # The original response shape
+    assert result["confidence"] == 0.95
+    assert "₹15,000/month" in result["response"]
+
+
+def test_chat_falls_back_to_general_answer():
+    result = client.post("/chat", json={"message": "hello there"}).json()
+    assert result["source"] == "template" and result["confidence"] == 0.7
+
+
+def test_precedence_matches_the_original_if_elif_chain():
+    messages = [
+        "Can I afford to increase my SIP?",          # home_affordability wins over sip_optimization
+        "should I optimize my sip for net worth growth",
+        "my net worth growth this month",
+        "sips vs lump sum",
+        "gossip about homes",                         # Substring matches, as before
+        "increase",
+        "flat growth",
+        "What is my NET WORTH?",
+        "how do I save more",
+        "",
+    ]
+    assert [intent["name"] for intent in INTENTS] == ["home_affordability", "sip_optimization", "net_worth"]
+    for message in messages:
+        assert routed_intent(intent_router, message) == baseline_intent(message), message
+
+
+def test_trie_pattern_prefers_longest_keyword():
+    words = ["sip", "sips", "save", "salary", "net worth"]
+    pattern = re.compile(trie_pattern(words))
+    assert pattern.findall("sips and salary save my net worth") == ["sips", "salary", "save", "net worth"]
+
+
+def test_overlapping_and_nested_keywords_all_count():
+    router = IntentRouter([
+        {"name": "a", "keywords": ["sip", "axis"], "template": "A", "confidence": 1.0},
+        {"name": "b", "keywords": ["sips", "pension"], "template": "B", "confidence": 1.0},
+        {"name": "c", "keywords": ["tax"], "template": "C", "confidence": 1.0},
+    ])
+    assert routed_intent(router, "sips") == "a"          # "sip" is inside the longer match
+    assert routed_intent(router, "pension") == "b"
+    assert routed_intent(router, "taxis") == "a"         # "axis" overlaps the earlier "tax" match
+    assert routed_intent(router, "tax") == "c"
+    assert routed_intent(router, "loan") == "general"
+
+
+def test_router_agrees_with_ordered_substring_checks_on_random_keywords():
+    rng = random.Random(3)
+    table = [
+        {"name": f"i{row}", "keywords": ["".join(rng.choices("abc", k=rng.randint(1, 4))) for _ in range(3)],
+         "template": "", "confidence": 1.0}
+        for row in range(12)
+    ]
+    router = IntentRouter(table)
+    for _ in range(500):
+        message = "".join(rng.choices("abcd", k=rng.randint(0, 8)))
+        expected = next((intent["name"] for intent in table if any(word in message for word in intent["keywords"])), "general")
+        assert routed_intent(router, message) == expected, message
+
+
+def test_table_order_decides_unless_weights_say_otherwise():
+    message = "Can I afford to increase my SIP and grow my net worth?"
+    assert intent_router.classify(message) == {"intent": "home_affordability", "secondary": ["sip_optimization", "net_worth"]}
+    assert intent_router.classify("hello") == {"intent": "general", "secondary": []}
+
+    weighted = IntentRouter([
+        {"name": "home", "keywords": ["afford", "home"], "template": "", "confidence": 1.0},
+        {"name": "sip", "keywords": {"sip": 2.0, "increase": 0.5}, "template": "", "confidence": 1.0},
+        {"name": "tax", "keywords": {"tax": 2.0, "80c": 3.0}, "template": "", "confidence": 1.0},
+    ])
+    assert weighted.classify("afford to increase") == {"intent": "home", "secondary": ["sip"]}
+    assert weighted.classify("afford to increase my sips") == {"intent": "sip", "secondary": ["home"]}   # Nested "sip" scores too
+    assert weighted.classify("sip or 80c tax saving at home") == {"intent": "tax", "secondary": ["sip", "home"]}
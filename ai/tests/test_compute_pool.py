@@ -0,0 +1,109 @@
+import asyncio
+import os
+import time
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.main import app
+from app.services.compute_pool import ComputeOverloaded, ComputePool, compute_pool
+from app.services.simulation_service import run_simulation
+from app.utils.metrics import registry
+
+client = TestClient(app)
+
+SCENARIO = dict(monthly_sip=10_000, target_amount=1_000_000, months=60, expected_return=0.12,
+                volatility=0.15, simulations=2_000, seed=7)
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = ComputePool(workers=1, max_pending=1, max_pending_cost=1e9, inline_max_cost=0, min_shared_bytes=1024)
+    yield pool
+    pool.shutdown()
+
+
+def simulated_paths(kind):
+    return registry.get_sample_value("finsage_ai_simulation_paths_total", {"kind": kind}) or 0
+
+
+def test_pooled_simulation_matches_inline_and_reports_metrics(pool):
+    before = simulated_paths("plain")
+    pooled = asyncio.run(pool.run(run_simulation, *SCENARIO.values(), cost=1))
+    assert pooled == run_simulation(**SCENARIO)
+    # Paths simulated in the worker show up in this process's metrics (plus the inline run above)
+    assert simulated_paths("plain") == before + 2 * SCENARIO["simulations"]
+    assert pool.stats()["completed"] == 1 and pool.pending == 0
+
+
+def test_large_arrays_come_back_through_shared_memory(pool):
+    result = asyncio.run(pool.run(np.arange, 1_000_000, cost=1))
+    assert isinstance(result, np.ndarray) and result[-1] == 999_999
+    if os.path.isdir("/dev/shm"):
+        assert not [name for name in os.listdir("/dev/shm") if name.startswith("psm_")]
+
+
+def test_admission_rejects_beyond_pending_limit(pool):
+    async def burst():
+        first = asyncio.ensure_future(pool.run(time.sleep, 0.5, cost=1))
+        await asyncio.sleep(0)
+        with pytest.raises(ComputeOverloaded) as overloaded:
+            await pool.run(time.sleep, 0.5, cost=1)
+        await first
+        return overloaded.value
+
+    assert asyncio.run(burst()).retry_after >= 1
+    assert pool.stats()["rejected"] == 1
+
+
+def test_overloaded_routes_answer_429_with_retry_after(monkeypatch):
+    monkeypatch.setattr(compute_pool, "workers", 1)
+    monkeypatch.setattr(compute_pool, "pending", compute_pool.max_pending)
+    response = client.post("/simulate/goal", json={
+        "monthlySIP": 10_000, "targetAmount": 1_000_000, "timeHorizon": 240, "simulations": 50_000,
+    })
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+    # Cheap requests still run inline
+    response = client.post("/simulate/goal", json={
+        "monthlySIP": 10_000, "targetAmount": 1_000_000, "timeHorizon": 12, "simulations": 100,
+    })
+    assert response.status_code == 200
+
+
+def test_streamed_simulations_hold_their_cost_until_the_stream_ends(monkeypatch):
+    monkeypatch.setattr(compute_pool, "workers", 1)
+    request = {"monthlySIP": 10_000, "targetAmount": 1_000_000, "timeHorizon": 120, "simulations": 20_000}
+
+    monkeypatch.setattr(compute_pool, "pending", compute_pool.max_pending)
+    response = client.post("/simulate/goal?stream=ndjson", json=request)
+    assert response.status_code == 429 and int(response.headers["Retry-After"]) >= 1
+    monkeypatch.setattr(compute_pool, "pending", 0)
+
+    held = []
+    estimates = main.adaptive_estimates
+
+    def observed(request):
+        for estimate in estimates(request):
+            held.append((compute_pool.pending, compute_pool.pending_cost))
+            yield estimate
+
+    monkeypatch.setattr(main, "adaptive_estimates", observed)
+    response = client.post("/simulate/goal?stream=sse", json=request)
+    assert response.status_code == 200 and "event: result" in response.text
+    assert held and set(held) == {(1, 20_000 * 120)}
+    assert compute_pool.pending == 0 and compute_pool.pending_cost == 0
+
+
+def test_reservation_is_released_once():
+    pool = ComputePool(workers=1, max_pending=1, max_pending_cost=1e9, inline_max_cost=0, min_shared_bytes=1024)
+    release = pool.reserve(10)
+    with pytest.raises(ComputeOverloaded):
+        pool.reserve(10)
+    release()
+    release()
+    assert pool.pending == 0 and pool.pending_cost == 0
+    pool.reserve(10)()
@@ -0,0 +1,121 @@
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.export_service import ReportJobs, render_report_pdf
+from app.routers import export
+
+client = TestClient(app)
+
+REPORT = {
+    "title": "Quarterly review",
+    "userName": "Test User",
+    "summary": {"Net worth": "₹6.5L", "Monthly SIP": "₹12,000"},
+    "charts": [{"title": "Corpus", "xKey": "month", "yKey": "value",
+                "data": [{"month": m, "value": 12000 * m * 1.01 ** m} for m in range(1, 61)]}],
+}
+
+
+@pytest.fixture
+def jobs(tmp_path, monkeypatch):
+    jobs = ReportJobs(cache_dir=str(tmp_path), max_bytes=10 * 1024 * 1024, workers=1, max_pending=4)
+    monkeypatch.setattr(export, "report_jobs", jobs)
+    yield jobs
+    jobs.shutdown()
+
+
+def wait_until_done(job_id, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = client.get(f"/export/jobs/{job_id}").json()
+        if status["status"] != "pending":
+            return status
+        time.sleep(0.1)
+    raise AssertionError("report did not finish")
+
+
+def test_pdf_report_is_rendered_in_background_and_downloadable(jobs):
+    submitted = client.post("/export/pdf", json=REPORT)
+    assert submitted.status_code == 202
+    job_id = submitted.json()["jobId"]
+
+    status = wait_until_done(job_id)
+    assert status["status"] == "done"
+    download = client.get(status["downloadUrl"])
+    assert download.status_code == 200
+    assert download.content.startswith(b"%PDF")
+
+
+def test_identical_reports_share_one_job(jobs):
+    first = client.post("/export/pdf", json=REPORT).json()
+    second = client.post("/export/pdf", json=REPORT).json()
+    assert first["jobId"] == second["jobId"]
+    assert len(jobs._jobs) == 1
+    wait_until_done(first["jobId"])
+
+
+def test_unknown_job_is_404(jobs):
+    assert client.get("/export/jobs/does-not-exist").status_code == 404
+
+
+def test_disk_cache_is_trimmed_to_budget(jobs, tmp_path):
+    for i in range(3):
+        (tmp_path / f"old{i}.pdf").write_bytes(b"x" * 4 * 1024 * 1024)
+        time.sleep(0.01)
+    jobs._trim_cache()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["old1.pdf", "old2.pdf"]
+
+
+def test_failed_render_leaves_no_partial_file(tmp_path):
+    with pytest.raises(KeyError):
+        render_report_pdf({"title": "Broken", "charts": [{"title": "c", "xKey": "x", "yKey": "y", "data": [{}]}]},
+                          str(tmp_path / "report.pdf"))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_report_is_resubmitted_once_when_a_worker_dies(jobs):
+    pool = jobs._get_pool()
+    pool.submit(os._exit, 1)   # Kills the worker → the pool is broken
+    with pytest.raises(BrokenProcessPool):
+        pool.submit(int).result(timeout=30)
+
+    submitted = client.post("/export/pdf", json={**REPORT, "title": "After a crash"}).json()
+    assert wait_until_done(submitted["jobId"])["status"] == "done"
+    assert jobs._pool is not pool
+
+
+def test_report_in_flight_is_rendered_again_when_its_worker_dies(jobs):
+    submitted = client.post("/export/pdf", json={**REPORT, "title": "Killed mid-render"}).json()
+    pool = jobs._pool
+    while not pool._processes:
+        time.sleep(0.01)
+    for process in list(pool._processes.values()):
+        process.kill()
+
+    assert wait_until_done(submitted["jobId"])["status"] == "done"
+    assert jobs._jobs[submitted["jobId"]]["retried"]
+
+
+def test_report_deleted_from_the_cache_is_rendered_again(jobs):
+    job_id = client.post("/export/pdf", json={**REPORT, "title": "Deleted"}).json()["jobId"]
+    assert wait_until_done(job_id)["status"] == "done"
+    os.remove(jobs.path(job_id))   # Trimmed by another worker, or cleaned out of the temp directory
+
+    assert client.get(f"/export/jobs/{job_id}").status_code == 404
+    again = client.post("/export/pdf", json={**REPORT, "title": "Deleted"}).json()
+    assert again["jobId"] == job_id and again["status"] == "pending"
+    assert client.get(wait_until_done(job_id)["downloadUrl"]).status_code == 200
+
+
+def test_failed_jobs_expire(jobs):
+    broken = {**REPORT, "charts": [{"title": "c", "xKey": "x", "yKey": "y", "data": [{}]}]}
+    job_id = client.post("/export/pdf", json=broken).json()["jobId"]
+    assert wait_until_done(job_id)["status"] == "failed"
+
+    jobs.failed_ttl = 0
+    assert client.get(f"/export/jobs/{job_id}").status_code == 404
+    assert jobs._jobs == {}
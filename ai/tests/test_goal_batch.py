@@ -0,0 +1,67 @@
+import csv
+
+import pyarrow.parquet as pq
+import pytest
+
+from app.main import GoalAnalysisRequest, goal_analysis
+from app.services.goal_batch import main, recompute_file
+
+GOALS = [
+    ("007", 1_000_000, 5, 10_000, 0.12),
+    ("008", 500_000, 10, 8_000, 0.0),
+    ("009", 2_000_000, 3.5, 1_000, 0.08),
+    ("010", 100_000, 1, 50_000, ""),        # Blank return → the API default
+]
+
+
+@pytest.fixture
+def goals_csv(tmp_path):
+    path = tmp_path / "goals.csv"
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["goalId", "goalAmount", "years", "monthlySIP", "expectedReturnPA"])
+        writer.writerows(GOALS)
+    return path
+
+
+def expected(goal, expected_return=None):
+    _, goal_amount, years, monthly_sip, annual_return = goal
+    if expected_return is None:
+        expected_return = annual_return if annual_return != "" else 0.12
+    return goal_analysis(GoalAnalysisRequest(
+        goalAmount=goal_amount, years=years, monthlySIP=monthly_sip, expectedReturnPA=expected_return,
+    ))
+
+
+def test_csv_results_match_analyze_goal(goals_csv, tmp_path):
+    assert recompute_file(str(goals_csv), str(tmp_path / "results.csv"), chunk_rows=3) == len(GOALS)
+    with open(tmp_path / "results.csv", newline="") as f:
+        rows = list(csv.DictReader(f))
+
+    assert [row["goalId"] for row in rows] == ["007", "008", "009", "010"]
+    for goal, row in zip(GOALS, rows):
+        analysis = expected(goal)
+        for column in ("projectedCorpus", "gapToGoal", "successProbability"):
+            assert float(row[column]) == pytest.approx(analysis[column], rel=1e-12)
+        assert row["recommendedAction"] == analysis["recommendedAction"]
+
+
+def test_parquet_with_workers_and_return_override(goals_csv, tmp_path):
+    main([str(goals_csv), str(tmp_path / "results.parquet"), "--expected-return", "0.11", "--workers", "1", "--chunk-rows", "2"])
+    table = pq.read_table(tmp_path / "results.parquet").to_pydict()
+
+    assert "expectedReturnPA" not in table and table["goalId"] == ["007", "008", "009", "010"]
+    for i, goal in enumerate(GOALS):
+        analysis = expected(goal, expected_return=0.11)
+        assert table["projectedCorpus"][i] == pytest.approx(analysis["projectedCorpus"], rel=1e-12)
+        assert table["successProbability"][i] == pytest.approx(analysis["successProbability"], rel=1e-12)
+
+
+def test_invalid_rows_give_nulls_not_errors(tmp_path):
+    source = tmp_path / "goals.csv"
+    source.write_text("goalAmount,years,monthlySIP\n0,1,0\n1000,,100\n")
+    recompute_file(str(source), str(tmp_path / "results.parquet"))
+    table = pq.read_table(tmp_path / "results.parquet").to_pydict()
+    assert table["successProbability"] == [None, None]
+    assert table["projectedCorpus"] == [0.0, None]
+    assert table["recommendedAction"] == ["maintain_sip", None]
@@ -0,0 +1,55 @@
+import os
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.utils.metrics import MetricsMiddleware, SlowRequestProfiler
+
+client = TestClient(app)
+
+
+def test_metrics_endpoint_reports_routes_by_template():
+    client.post("/analyze/goal", json={"goalAmount": 1_000_000, "years": 5, "monthlySIP": 10_000})
+    client.get("/export/jobs/does-not-exist")
+    client.post("/simulate/goal", json={"monthlySIP": 10_000, "targetAmount": 1_000_000, "timeHorizon": 12, "simulations": 500})
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    assert 'route="/analyze/goal",status="200"' in text
+    assert 'route="/export/jobs/{job_id}",status="404"' in text
+    assert "does-not-exist" not in text
+    assert 'finsage_ai_simulation_paths_total{kind="plain"}' in text
+    assert "finsage_ai_result_cache_hit_ratio" in text
+
+
+def test_profiler_dumps_folded_stacks_for_slow_requests(tmp_path):
+    def busy_wait(seconds):
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            pass
+
+    slow_app = FastAPI()
+
+    @slow_app.get("/slow")
+    async def slow():
+        busy_wait(0.1)
+        return {}
+
+    @slow_app.get("/fast")
+    async def fast():
+        return {}
+
+    profiler = SlowRequestProfiler(threshold=0.05, directory=str(tmp_path), interval=0.002)
+    slow_app.add_middleware(MetricsMiddleware, profiler=profiler)
+    with TestClient(slow_app) as slow_client:
+        slow_client.get("/fast")
+        slow_client.get("/slow")
+
+    (profile,) = os.listdir(tmp_path)
+    assert "slow" in profile and profile.endswith(".folded")
+    lines = (tmp_path / profile).read_text().splitlines()
+    assert any("busy_wait" in line for line in lines)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.optimization_service import annuity_factor_paths, required_sip
+from app.utils.monte_carlo import simulate_final_values
+
+client = TestClient(app)
+
+
+def test_annuity_factors_match_simulation_engine_distribution():
+    factors, _ = annuity_factor_paths(60, 0.12, 0.15, 20000, seed=1)
+    simulated = simulate_final_values(1.0, 60, 0.12, 0.15, simulations=20000, seed=2)
+    assert np.mean(factors) == pytest.approx(np.mean(simulated), rel=0.01)
+    assert np.percentile(factors, 10) == pytest.approx(np.percentile(simulated, 10), rel=0.02)
+
+
+def test_required_sip_is_the_minimum_on_the_sample():
+    factors, _ = annuity_factor_paths(60, 0.12, 0.15, 5000, seed=3)
+    sip = required_sip(factors, 5_000_000, 0.85)
+    assert np.mean(sip * factors >= 5_000_000) >= 0.85
+    assert np.mean(sip * 0.999 * factors >= 5_000_000) < 0.85
+
+
+def test_zero_volatility_matches_deterministic_corpus():
+    monthly_return = 0.12 / 12
+    annuity = ((1 + monthly_return) ** 60 - 1) / monthly_return * (1 + monthly_return)
+    result = client.post("/optimize/sip", json={"targetAmount": 5_000_000, "timeHorizon": 60, "volatility": 0}).json()
+    assert result["requiredSIP"] == pytest.approx(5_000_000 / annuity)
+
+
+def test_optimize_sip_endpoint_returns_probability_curve():
+    payload = {"targetAmount": 5_000_000, "timeHorizon": 60, "successProbability": 0.85, "seed": 1}
+    result = client.post("/optimize/sip", json=payload).json()
+    assert result["feasible"]
+    assert result["successProbability"] >= 0.85
+    curve = result["probabilityCurve"]
+    sips = [point["monthlySIP"] for point in curve]
+    probabilities = [point["successProbability"] for point in curve]
+    assert sips == sorted(sips) and probabilities == sorted(probabilities)
+    assert result["requiredSIP"] in sips
+
+
+def test_optimize_sip_finds_minimum_horizon_for_given_sip():
+    payload = {"targetAmount": 5_000_000, "timeHorizon": 60, "successProbability": 0.85, "seed": 1, "monthlySIP": 60000}
+    result = client.post("/optimize/sip", json=payload).json()
+    horizon = result["minimumHorizon"]
+    assert 60 < horizon < 120
+    assert result["horizonCurve"][-1]["months"] == horizon
+    assert result["horizonCurve"][-1]["successProbability"] >= 0.85
+    assert all(point["successProbability"] < 0.85 for point in result["horizonCurve"][:-1])
+
+
+def test_unreachable_horizon_is_reported():
+    payload = {"targetAmount": 5e9, "timeHorizon": 60, "monthlySIP": 1000, "maxHorizon": 120}
+    result = client.post("/optimize/sip", json=payload).json()
+    assert result["minimumHorizon"] is None
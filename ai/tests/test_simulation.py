@@ -0,0 +1,209 @@
+import base64
+import json
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.utils.monte_carlo import make_rng, monthly_parameters, simulate_final_values, simulated_paths
+
+client = TestClient(app)
+
+
+def scalar_final_values(monthly_sip, months, expected_return, volatility, simulations, seed):
+    """Reference implementation: the original month-by-month recurrence."""
+    monthly_return, monthly_volatility = monthly_parameters(expected_return, volatility)
+    shocks = make_rng(seed).standard_normal((simulations, months))
+    final_values = []
+    for path in shocks:
+        portfolio_value = 0.0
+        for shock in path:
+            portfolio_value += monthly_sip
+            portfolio_value *= 1 + monthly_return + monthly_volatility * shock
+        final_values.append(max(0, portfolio_value))
+    return np.array(final_values)
+
+
+def test_vectorized_engine_matches_scalar_recurrence():
+    expected = scalar_final_values(12000, 60, 0.12, 0.15, 200, seed=7)
+    actual = simulate_final_values(12000, 60, 0.12, 0.15, simulations=200, seed=7)
+    np.testing.assert_allclose(actual, expected, rtol=1e-10)
+
+
+def test_chunking_does_not_change_results():
+    full = simulate_final_values(5000, 480, 0.1, 0.2, simulations=300, seed=3)
+    by_paths = simulate_final_values(5000, 480, 0.1, 0.2, simulations=300, seed=3, chunk_elements=1000)
+    by_months = simulate_final_values(5000, 480, 0.1, 0.2, simulations=300, seed=3, chunk_elements=100)
+    np.testing.assert_allclose(by_paths, full, rtol=1e-10)
+    np.testing.assert_allclose(by_months, full, rtol=1e-10)
+
+
+def test_zero_volatility_is_deterministic_sip_corpus():
+    monthly_return = 0.12 / 12
+    expected = 10000 * ((1 + monthly_return) ** 120 - 1) / monthly_return * (1 + monthly_return)
+    values = simulate_final_values(10000, 120, 0.12, 0.0, simulations=10, seed=1)
+    np.testing.assert_allclose(values, expected)
+
+
+def test_simulate_goal_endpoint_is_reproducible_with_seed():
+    payload = {"monthlySIP": 12000, "targetAmount": 5000000, "timeHorizon": 60, "simulations": 5000, "seed": 42}
+    first = client.post("/simulate/goal", json=payload).json()
+    second = client.post("/simulate/goal", json=payload).json()
+    assert first == second
+    assert len(first["scenarios"]) == 100
+    assert first["p10"] <= first["median"] <= first["p90"]
+    assert 0 <= first["success_probability"] <= 1
+
+
+def test_simulate_goal_rejects_out_of_range_path_count():
+    payload = {"monthlySIP": 12000, "targetAmount": 5000000, "timeHorizon": 60, "simulations": 0}
+    assert client.post("/simulate/goal", json=payload).status_code == 422
+
+
+def test_adaptive_simulation_stops_early_for_easy_goals():
+    payload = {"monthlySIP": 50000, "targetAmount": 100000, "timeHorizon": 60, "ciWidth": 0.05, "seed": 1}
+    result = client.post("/simulate/goal", json=payload).json()
+    assert result["converged"] and result["done"]
+    assert result["simulations"] < 2000
+    assert result["success_probability"] == 1.0
+
+
+def test_adaptive_simulation_meets_target_interval_width():
+    payload = {"monthlySIP": 12000, "targetAmount": 1000000, "timeHorizon": 60, "ciWidth": 0.02, "seed": 5}
+    result = client.post("/simulate/goal", json=payload).json()
+    lower, upper = result["confidence_intervals"]["success_probability"]
+    assert result["converged"]
+    assert upper - lower <= 0.02
+    assert lower <= result["success_probability"] <= upper
+
+
+def test_adaptive_simulation_respects_path_budget():
+    payload = {"monthlySIP": 12000, "targetAmount": 1000000, "timeHorizon": 60, "ciWidth": 0.001, "maxSimulations": 3000}
+    result = client.post("/simulate/goal", json=payload).json()
+    assert not result["converged"]
+    assert result["simulations"] == 3000
+
+
+def test_simulate_goal_streams_ndjson_batches():
+    payload = {"monthlySIP": 12000, "targetAmount": 1000000, "timeHorizon": 60, "ciWidth": 0.02, "seed": 5}
+    with client.stream("POST", "/simulate/goal", params={"stream": "ndjson"}, json=payload) as response:
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in response.iter_lines() if line]
+    assert len(events) > 1
+    assert [event["done"] for event in events] == [False] * (len(events) - 1) + [True]
+    assert events[-1] == client.post("/simulate/goal", json=payload).json()
+
+
+def test_simulate_goal_streams_server_sent_events():
+    payload = {"monthlySIP": 12000, "targetAmount": 1000000, "timeHorizon": 60, "simulations": 1000, "seed": 5}
+    response = client.post("/simulate/goal", params={"stream": "sse"}, json=payload)
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.count("event: progress") >= 1
+    assert response.text.count("event: result") == 1
+
+
+def test_antithetic_paths_mirror_each_other_at_zero_drift():
+    values = simulate_final_values(1000, 1, 0.0, 0.2, simulations=10, seed=2, sampling="antithetic")
+    np.testing.assert_allclose(values[:5] + values[5:], 2 * 1000)
+
+
+def test_sobol_rounds_up_to_power_of_two_replicates():
+    assert simulated_paths(1000, "sobol") == 8 * 128
+    assert simulated_paths(1001, "antithetic") == 1002
+    assert len(simulate_final_values(1000, 12, 0.12, 0.15, simulations=1000, seed=1, sampling="sobol")) == 1024
+
+
+def test_unknown_sampling_strategy_is_rejected():
+    with pytest.raises(ValueError):
+        simulate_final_values(1000, 12, 0.12, 0.15, sampling="importance")
+
+
+@pytest.mark.parametrize("sampling", ["antithetic", "control_variate", "sobol"])
+def test_variance_reduction_beats_plain_monte_carlo(sampling):
+    payload = {"monthlySIP": 12000, "targetAmount": 1000000, "timeHorizon": 60, "simulations": 4096, "seed": 3}
+    plain = client.post("/simulate/goal", json=payload).json()
+    reduced = client.post("/simulate/goal", json={**payload, "sampling": sampling}).json()
+    assert plain["sampling"] == "plain" and reduced["sampling"] == sampling
+    for metric in ("mean", "success_probability"):
+        assert reduced["standard_error"][metric] < plain["standard_error"][metric]
+        assert abs(reduced[metric] - plain[metric]) < 4 * plain["standard_error"][metric]
+
+
+def test_control_variate_mean_matches_closed_form_corpus():
+    payload = {"monthlySIP": 12000, "targetAmount": 1000000, "timeHorizon": 60, "sampling": "control_variate", "seed": 3}
+    result = client.post("/simulate/goal", json=payload).json()
+    monthly_return = 0.12 / 12
+    expected = 12000 * ((1 + monthly_return) ** 60 - 1) / monthly_return * (1 + monthly_return)
+    assert result["mean"] == pytest.approx(expected, rel=1e-6)
+
+
+def test_adaptive_mode_rejects_non_plain_sampling():
+    payload = {"monthlySIP": 12000, "targetAmount": 1000000, "timeHorizon": 60, "ciWidth": 0.02, "sampling": "sobol"}
+    assert client.post("/simulate/goal", json=payload).status_code == 400
+
+
+def test_batch_scenarios_share_random_numbers():
+    base = {"targetAmount": 1000000, "timeHorizon": 60, "simulations": 2000}
+    payload = {"seed": 11, "scenarios": [{**base, "monthlySIP": 12000}, {**base, "monthlySIP": 18000}]}
+    result = client.post("/simulate/goal/batch", json=payload).json()
+    low, high = result["results"]
+    assert result["shared_shock_groups"] == 1
+    # Same shocks, so the corpus scales exactly with the SIP path by path
+    np.testing.assert_allclose(np.array(high["scenarios"]), 1.5 * np.array(low["scenarios"]))
+    assert high["success_probability"] >= low["success_probability"]
+
+
+def test_batch_results_do_not_depend_on_other_groups():
+    scenario = {"monthlySIP": 12000, "targetAmount": 1000000, "timeHorizon": 60, "simulations": 500}
+    other = {"monthlySIP": 8000, "targetAmount": 2000000, "timeHorizon": 120, "volatility": 0.2, "simulations": 500}
+    alone = client.post("/simulate/goal/batch", json={"seed": 4, "scenarios": [scenario]}).json()
+    mixed = client.post("/simulate/goal/batch", json={"seed": 4, "scenarios": [other, scenario]}).json()
+    assert mixed["shared_shock_groups"] == 2
+    assert mixed["results"][1] == alone["results"][0]
+
+
+def test_batch_matches_single_engine_distribution():
+    scenario = {"monthlySIP": 12000, "targetAmount": 1000000, "timeHorizon": 60, "expectedReturn": 0.1, "simulations": 20000}
+    batch = client.post("/simulate/goal/batch", json={"seed": 1, "scenarios": [scenario]}).json()["results"][0]
+    single = client.post("/simulate/goal", json={**scenario, "seed": 1}).json()
+    assert batch["mean"] == pytest.approx(single["mean"], rel=0.01)
+    assert batch["success_probability"] == pytest.approx(single["success_probability"], abs=0.02)
+
+
+def test_zero_volatility_uses_closed_form_without_paths():
+    payload = {"monthlySIP": 10000, "targetAmount": 2000000, "timeHorizon": 120, "volatility": 0}
+    result = client.post("/simulate/goal", json=payload).json()
+    monthly_return = 0.12 / 12
+    expected = 10000 * ((1 + monthly_return) ** 120 - 1) / monthly_return * (1 + monthly_return)
+    assert result["method"] == "closed_form" and result["simulations"] == 0
+    assert result["mean"] == pytest.approx(expected)
+    assert result["p10"] == result["p90"] == result["median"]
+    assert result["success_probability"] == 1.0
+
+
+def test_mean_and_median_only_use_lognormal_approximation():
+    payload = {"monthlySIP": 12000, "targetAmount": 1000000, "timeHorizon": 120, "seed": 2}
+    approximate = client.post("/simulate/goal", json={**payload, "outputs": ["mean", "median"]}).json()
+    simulated = client.post("/simulate/goal", json={**payload, "simulations": 50000}).json()
+    assert set(approximate) == {"mean", "median", "method"}
+    assert approximate["method"] == "lognormal"
+    assert approximate["mean"] == pytest.approx(simulated["mean"], rel=0.01)
+    assert approximate["median"] == pytest.approx(simulated["median"], rel=0.02)
+
+
+def test_outputs_filter_monte_carlo_response():
+    payload = {"monthlySIP": 12000, "targetAmount": 1000000, "timeHorizon": 60, "outputs": ["p10", "success_probability"]}
+    result = client.post("/simulate/goal", json=payload).json()
+    assert set(result) == {"p10", "success_probability", "method"}
+    assert result["method"] == "monte_carlo"
+
+
+def test_float32_encoding_packs_scenarios():
+    payload = {"monthlySIP": 12000, "targetAmount": 5000000, "timeHorizon": 60, "seed": 42}
+    plain = client.post("/simulate/goal", json=payload).json()
+    packed = client.post("/simulate/goal?encoding=float32", json=payload).json()
+    assert packed["scenarios_encoding"] == "float32-base64"
+    decoded = np.frombuffer(base64.b64decode(packed["scenarios"]), dtype="<f4")
+    np.testing.assert_allclose(decoded, plain["scenarios"], rtol=1e-6)
+    assert "scenarios_encoding" not in client.post("/simulate/goal", json=payload).json()
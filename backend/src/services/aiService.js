@@ -30,12 +30,47 @@ class AIService {
     return await this.makeRequest('/simulate/goal', simulationData, 20000) // Longer timeout for simulation
   }
 
+  async simulateGoalBatch(scenarios, seed) {
+    return await this.makeRequest('/simulate/goal/batch', { scenarios, seed }, 20000)
+  }
+
   async optimizeSIP(sipData) {
     return await this.makeRequest('/optimize/sip', sipData)
   }
 
+  // Queues the report and returns { jobId, status } right away; poll getReportStatus until status is 'done'
   async generateReport(reportData) {
-    return await this.makeRequest('/export/pdf', reportData, 30000) // Long timeout for report generation
+    return await this.makeRequest('/export/pdf', reportData)
+  }
+
+  async getReportStatus(jobId) {
+    try {
+      const response = await axios.get(`${this.baseURL}/export/jobs/${jobId}`, { timeout: this.timeout })
+      return response.data
+    } catch (error) {
+      logger.error(`AI Service report status failed for ${jobId}:`, error.message)
+      throw new Error(`AI service unavailable: ${error.message}`)
+    }
+  }
+
+  async downloadReport(jobId) {
+    try {
+      const response = await axios.get(`${this.baseURL}/export/jobs/${jobId}/download`, {
+        timeout: this.timeout,
+        responseType: 'stream'
+      })
+      return response.data
+    } catch (error) {
+      const status = error.response && error.response.status
+      // Unknown or expired reports are the client's 404/410, not a server error
+      if (status === 404 || status === 410) {
+        const notFound = new Error(status === 404 ? 'Report not found' : 'Report has expired')
+        notFound.statusCode = status
+        throw notFound
+      }
+      logger.error(`AI Service report download failed for ${jobId}:`, error.message)
+      throw new Error(`AI service unavailable: ${error.message}`)
+    }
   }
 
   // Health check for AI service
@@ -0,0 +1,17 @@
+"""
+Prometheus glue shared by the FinSage Python services (the AI Engine in ai/
+and the AI service in ai-service/). Metric types, registries and the text
+exposition format come from prometheus_client; this package adds what it
+lacks:
+
+- MetricsMiddleware: per-route latency and in-flight requests for an ASGI app
+- CallbackCollector: metrics read at scrape time from a service's stats()
+- SlowRequestProfiler: folded stacks of the event loop for slow requests
+
+Each service declares its own registry and metrics in its utils/metrics.py.
+"""
+from finsage_metrics.collectors import CallbackCollector
+from finsage_metrics.middleware import MetricsMiddleware
+from finsage_metrics.profiler import SlowRequestProfiler
+
+__all__ = ["CallbackCollector", "MetricsMiddleware", "SlowRequestProfiler"]
@@ -0,0 +1,42 @@
+from typing import Callable, Dict, Iterator, Sequence, Tuple
+
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, Metric
+from prometheus_client.registry import Collector
+
+FAMILIES = {"counter": CounterMetricFamily, "gauge": GaugeMetricFamily}
+
+
+class CallbackCollector(Collector):
+    """
+    A metric computed on every scrape from a callback returning
+    {label values tuple: value}, e.g. from a service's existing stats() dict,
+    so the hot path keeps its plain counters and pays nothing for metrics.
+    A failing callback (a service that is not built yet) reports no samples
+    instead of breaking the scrape.
+    """
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], Dict[Tuple, float]],
+                 labels: Sequence[str] = (), kind: str = "gauge"):
+        if kind not in FAMILIES:
+            raise ValueError(f"kind must be one of {', '.join(FAMILIES)}, got {kind!r}")
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self.labels = list(labels)
+        self.kind = kind
+
+    def _family(self) -> Metric:
+        return FAMILIES[self.kind](self.name, self.documentation, labels=self.labels)
+
+    def describe(self) -> Iterator[Metric]:
+        yield self._family()   # Name only → duplicate registrations are refused without calling back
+
+    def collect(self) -> Iterator[Metric]:
+        try:
+            values = self.callback()
+        except Exception:
+            return
+        family = self._family()
+        for key, value in values.items():
+            family.add_metric([str(part) for part in key], value)
+        yield family
@@ -0,0 +1,53 @@
+import time
+from typing import Optional
+
+from prometheus_client import Gauge, Histogram
+
+from finsage_metrics.profiler import SlowRequestProfiler
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording per-route request latency and in-flight requests.
+    Routes are labelled by their path template (/export/jobs/{job_id}), never
+    the raw path, so label cardinality stays bounded; unmatched paths share one
+    label. Latency covers the whole response, including streamed bodies.
+
+    Subclass it with `latency` (a Histogram labelled method, route and status)
+    and `in_flight` (a Gauge) set to the service's own metrics.
+    """
+
+    latency: Histogram
+    in_flight: Gauge
+
+    def __init__(self, app, profiler: Optional[SlowRequestProfiler] = None):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        method = scope["method"]
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        token = self.profiler.start() if self.profiler is not None else None
+        self.in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            seconds = time.perf_counter() - start
+            self.in_flight.dec()
+            route = scope.get("route")
+            route = getattr(route, "path", None) or "unmatched"
+            self.latency.labels(method=method, route=route, status=status).observe(seconds)
+            if token is not None:
+                self.profiler.stop(token, route, seconds)
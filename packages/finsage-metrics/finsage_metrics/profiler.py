@@ -0,0 +1,78 @@
+import collections
+import itertools
+import os
+import re
+import sys
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+
+class SlowRequestProfiler:
+    """
+    Sampling profiler for slow requests. While any request is in flight, a
+    background thread records the event-loop thread's Python stack every
+    `interval` seconds; when a request finishes after more than `threshold`
+    seconds, the stacks sampled during it are written to `directory` in the
+    folded format read by flamegraph.pl and speedscope. Samples are of the
+    whole loop thread, so a profile also shows requests that overlapped it.
+    """
+
+    def __init__(self, threshold: float, directory: str, interval: float = 0.005):
+        self.threshold = threshold
+        self.directory = directory
+        self.interval = interval
+        self._active: Dict[int, Tuple[int, collections.Counter]] = {}   # request token -> (thread id, folded stack counts)
+        self._tokens = itertools.count()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> int:
+        token = next(self._tokens)
+        with self._lock:
+            self._active[token] = (threading.get_ident(), collections.Counter())
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="slow-request-profiler", daemon=True)
+                self._thread.start()
+        if not self._wake.is_set():
+            self._wake.set()
+        return token
+
+    def stop(self, token: int, route: str, seconds: float) -> Optional[str]:
+        with self._lock:
+            _, stacks = self._active.pop(token)
+        if seconds < self.threshold or not stacks:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+        path = os.path.join(self.directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{slug}-{int(seconds * 1000)}ms.folded")
+        with open(path, "w") as file:
+            for stack, count in stacks.most_common():
+                file.write(f"{stack} {count}\n")
+        return path
+
+    @staticmethod
+    def _fold(frame) -> str:
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")   # One frame per function
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def _run(self) -> None:
+        while True:
+            self._wake.clear()      # Cleared before the check → a start() in between still wakes us
+            if not self._active:
+                self._wake.wait()
+            time.sleep(self.interval)
+            frames = sys._current_frames()
+            with self._lock:
+                folded: Dict[int, str] = {}
+                for thread_id, stacks in self._active.values():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        if thread_id not in folded:
+                            folded[thread_id] = self._fold(frame)
+                        stacks[folded[thread_id]] += 1
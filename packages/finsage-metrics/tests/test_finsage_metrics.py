@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+from prometheus_client import CollectorRegistry, Gauge, Histogram, generate_latest
+
+from finsage_metrics import CallbackCollector, MetricsMiddleware
+
+
+def test_callback_collectors_read_at_scrape_time_and_fail_quietly():
+    registry = CollectorRegistry()
+    state = {"hits": 3}
+    registry.register(CallbackCollector("cache_lookups_total", "Lookups", lambda: {("hit",): state["hits"]},
+                                        labels=("outcome",), kind="counter"))
+    registry.register(CallbackCollector("broken", "Fails on scrape", lambda: 1 / 0))
+    state["hits"] = 5
+    text = generate_latest(registry).decode()
+    assert '# TYPE cache_lookups_total counter\ncache_lookups_total{outcome="hit"} 5.0' in text
+    assert "broken" not in text
+    with pytest.raises(ValueError):
+        registry.register(CallbackCollector("broken", "Registered twice", dict))
+    with pytest.raises(ValueError):
+        CallbackCollector("summary", "Unsupported kind", dict, kind="summary")
+
+
+def test_middleware_labels_routes_by_template():
+    registry = CollectorRegistry()
+
+    class Middleware(MetricsMiddleware):
+        latency = Histogram("latency_seconds", "", ("method", "route", "status"), registry=registry)
+        in_flight = Gauge("in_flight", "", registry=registry)
+
+    class Route:
+        path = "/users/{user_id}"
+
+    async def app(scope, receive, send):
+        scope["route"] = Route
+        await send({"type": "http.response.start", "status": 404, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def send(message):
+        pass
+
+    asyncio.run(Middleware(app)({"type": "http", "method": "GET", "path": "/users/42"}, None, send))
+    labels = {"method": "GET", "route": "/users/{user_id}", "status": "404"}
+    assert registry.get_sample_value("latency_seconds_count", labels) == 1
+    assert registry.get_sample_value("in_flight") == 0